@@ -0,0 +1,240 @@
+"""평가 분석 (과목별 점수 분포, 월별 평균 추이, 학생 순위, 기수별 비교)
+
+전체 평가를 GROUP BY 쿼리 두 번으로 집계하고, 작아진 결과를 파이썬에서 합친다.
+- (과목, 평가일, 점수)별 건수 → 과목별 분포/평균/중앙값, 월별 평균 추이, 전체 요약
+- (학생, 과목)별 건수/합계 → 전체 순위, 과목별 순위, 학번 앞자리(기수)별 평균
+두 쿼리 모두 같은 순서의 커버링 인덱스(migrations 0004)를 따라 읽으므로 테이블 조회나
+임시 정렬이 없다. 점수는 -5 ~ +5 정수라 평가가 수십만 건이어도 파이썬으로 넘어오는 행은
+(과목 × 날짜 × 점수), (학생 × 과목) 개수 정도로 줄어든다.
+
+결과는 데이터 버전(page_cache.DataVersion)별로 캐시하여 학생/평가가 바뀔 때까지 다시 집계하지 않는다.
+"""
+import heapq
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import func, select
+
+from validation import SCORE_MAX, SCORE_MIN
+
+
+def median_from_distribution(distribution, total):
+    """{점수: 건수}에서 중앙값 계산"""
+    if not total:
+        return None
+    lower, upper = (total - 1) // 2, total // 2
+    seen = 0
+    low_value = None
+    for score in sorted(distribution):
+        seen += distribution[score]
+        if low_value is None and seen > lower:
+            low_value = score
+        if seen > upper:
+            return (low_value + score) / 2
+    return None
+
+
+def average(total, count):
+    return total / count if count else None
+
+
+def ranked(rows, key):
+    """평균이 같으면 같은 순위 (1, 2, 2, 4 ...)"""
+    result = []
+    previous = None
+    for position, row in enumerate(rows, 1):
+        value = round(key(row), 6)
+        rank = result[-1]['rank'] if result and value == previous else position
+        previous = value
+        result.append(dict(row, rank=rank))
+    return result
+
+
+class EvaluationAnalytics:
+    """평가 분석 결과 계산과 캐시"""
+
+    def __init__(self, db, student_model, evaluation_model, version, top=10, min_evaluations=3,
+                 cohort_digits=4, trend_months=12, cache_size=16):
+        self.db = db
+        self.student_model = student_model
+        self.evaluation_model = evaluation_model
+        self.version = version
+        self.top = top
+        self.min_evaluations = min_evaluations
+        self.cohort_digits = cohort_digits
+        self.trend_months = trend_months
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+
+    def report(self, start=None, end=None):
+        """분석 결과 (start/end: 평가일 범위, 포함)"""
+        key = (self.version.current()[0], start, end)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        result = self._compute(start, end)
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _filters(self, start, end):
+        evaluation = self.evaluation_model
+        filters = [evaluation.score.isnot(None)]
+        if start:
+            filters.append(evaluation.evaluation_date >= start)
+        if end:
+            filters.append(evaluation.evaluation_date <= end)
+        return filters
+
+    def _compute(self, start, end):
+        subjects, trend, overview = self._subject_report(start, end)
+        rankings, subject_rankings, cohorts, student_count = self._student_report(start, end)
+        overview['students'] = student_count
+        return {
+            'start': start.isoformat() if start else None,
+            'end': end.isoformat() if end else None,
+            'min_evaluations': self.min_evaluations,
+            'overview': overview,
+            'subjects': subjects,
+            'trend': trend,
+            'rankings': rankings,
+            'subject_rankings': subject_rankings,
+            'cohorts': cohorts,
+        }
+
+    def _subject_report(self, start, end):
+        evaluation = self.evaluation_model
+        # 월이 아니라 날짜 단위로 묶어야 인덱스 순서 그대로 집계된다 (월 합산은 파이썬에서).
+        # 월 문자열(YYYY-MM)은 묶은 날짜에서 잘라 가져와 행마다 날짜 객체로 변환하지 않는다.
+        rows = self.db.session.execute(
+            select(evaluation.subject, func.substr(evaluation.evaluation_date, 1, 7), evaluation.score, func.count())
+            .where(*self._filters(start, end))
+            .group_by(evaluation.subject, evaluation.evaluation_date, evaluation.score)
+        )
+
+        distributions = {}
+        monthly = {}
+        for subject, period, score, count in rows:
+            distribution = distributions.setdefault(subject, {})
+            distribution[score] = distribution.get(score, 0) + count
+            total = monthly.setdefault(period or '-', {}).setdefault(subject, [0, 0.0])
+            total[0] += count
+            total[1] += score * count
+
+        subjects = []
+        for subject in sorted(distributions):
+            distribution = distributions[subject]
+            count = sum(distribution.values())
+            score_sum = sum(score * n for score, n in distribution.items())
+            scores = sorted(set(distribution) | set(range(SCORE_MIN, SCORE_MAX + 1)))
+            subjects.append({
+                'subject': subject,
+                'count': count,
+                'average': average(score_sum, count),
+                'median': median_from_distribution(distribution, count),
+                'min': min(distribution),
+                'max': max(distribution),
+                'distribution': [
+                    {'score': score, 'count': distribution.get(score, 0),
+                     'percent': distribution.get(score, 0) * 100 / count}
+                    for score in scores
+                ],
+            })
+
+        periods = sorted(monthly)
+        if not (start or end) and self.trend_months:
+            periods = periods[-self.trend_months:]
+        trend = {
+            'subjects': [item['subject'] for item in subjects],
+            'periods': [
+                {
+                    'period': period,
+                    'count': sum(n for n, _ in monthly[period].values()),
+                    'average': average(sum(s for _, s in monthly[period].values()),
+                                       sum(n for n, _ in monthly[period].values())),
+                    'subjects': {subject: average(s, n) for subject, (n, s) in monthly[period].items()},
+                }
+                for period in periods
+            ],
+        }
+
+        total = sum(item['count'] for item in subjects)
+        overview = {
+            'evaluations': total,
+            'subjects': len(subjects),
+            'average': average(sum(item['average'] * item['count'] for item in subjects), total),
+            'first_period': min(monthly) if monthly else None,
+            'last_period': max(monthly) if monthly else None,
+        }
+        return subjects, trend, overview
+
+    def _student_report(self, start, end):
+        student, evaluation = self.student_model, self.evaluation_model
+        totals = select(
+            evaluation.student_id,
+            evaluation.subject,
+            func.count().label('count'),
+            func.sum(evaluation.score).label('score_sum')
+        ).where(*self._filters(start, end)) \
+            .group_by(evaluation.student_id, evaluation.subject).subquery()
+        rows = self.db.session.execute(
+            select(student.id, student.student_number, student.name,
+                   totals.c.subject, totals.c.count, totals.c.score_sum)
+            .join(totals, totals.c.student_id == student.id)
+        )
+
+        students = {}
+        by_subject = {}
+        for student_id, student_number, name, subject, count, score_sum in rows:
+            info = students.setdefault(student_id, {
+                'id': student_id, 'student_number': student_number, 'name': name, 'count': 0, 'sum': 0.0,
+            })
+            info['count'] += count
+            info['sum'] += score_sum
+            if count >= self.min_evaluations:
+                by_subject.setdefault(subject, []).append({
+                    'id': student_id, 'student_number': student_number, 'name': name,
+                    'count': count, 'average': score_sum / count,
+                })
+
+        eligible = [
+            {'id': s['id'], 'student_number': s['student_number'], 'name': s['name'],
+             'count': s['count'], 'average': s['sum'] / s['count']}
+            for s in students.values() if s['count'] >= self.min_evaluations
+        ]
+
+        def order(row):
+            return (row['average'], row['count'])
+
+        rankings = {
+            'top': ranked(heapq.nlargest(self.top, eligible, key=order), lambda row: row['average']),
+            'bottom': ranked(heapq.nsmallest(self.top, eligible, key=order), lambda row: row['average']),
+            'eligible': len(eligible),
+        }
+        subject_rankings = [
+            {'subject': subject,
+             'top': ranked(heapq.nlargest(self.top, candidates, key=order), lambda row: row['average'])}
+            for subject, candidates in sorted(by_subject.items())
+        ]
+
+        cohorts = []
+        if self.cohort_digits:
+            totals = {}
+            for s in students.values():
+                cohort = totals.setdefault(s['student_number'][:self.cohort_digits], [0, 0, 0.0])
+                cohort[0] += 1
+                cohort[1] += s['count']
+                cohort[2] += s['sum']
+            cohorts = [
+                {'cohort': cohort, 'students': n, 'count': count, 'average': average(score_sum, count)}
+                for cohort, (n, count, score_sum) in sorted(totals.items())
+            ]
+        return rankings, subject_rankings, cohorts, len(students)
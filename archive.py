@@ -0,0 +1,387 @@
+"""학년도별 보관 데이터베이스 (ARCHIVE_DIR/archive_<학년도>.db)
+
+지난 학년도의 평가와 더 이상 운영 DB에 평가가 남지 않는 학생을 학년도별 SQLite 파일로 옮겨
+운영 DB(management.db)를 작게 유지한다. 매일 쓰는 화면/쿼리는 현재 학년도 데이터만 읽는다.
+- 학년도는 ACADEMIC_YEAR_START_MONTH(기본 3월) 1일에 시작한다. (2024학년도 = 2024-03-01 ~ 2025-02-28)
+- 평가는 evaluation_date 기준으로 옮긴다. (평가일이 없는 평가는 옮기지 않는다)
+- 보관한 평가의 학생은 보관 파일에 학번/이름을 복사해 두고, 운영 DB에는 그대로 둔다.
+  (그 학년도 평가만 있는 재학생이나 평가가 없는 학생이 명단에서 사라지지 않도록)
+- move_students=True(archive-year --move-students)일 때만 졸업/전출처럼 떠난 학생을 함께 옮긴다.
+  이번 학년도 평가를 보관했고, 그 학년도가 끝나기 전에 등록(created_at)되었으며, 운영 DB에 남은 평가가
+  하나도 없는 학생만 옮긴다. 평가가 없는 학생은 어떤 경우에도 옮기거나 지우지 않는다.
+- 보관 파일은 필요할 때만 전용 연결에 ATTACH 해서 조회하고 끝나면 DETACH 한다.
+  (연결 풀의 다른 요청에는 보관 파일이 붙어 있지 않다)
+- WAL 모드에서는 여러 파일에 걸친 트랜잭션이 파일 단위로만 원자적이므로 보관 파일에 복사해
+  커밋한 뒤 운영 DB에서 삭제한다. 중간에 멈추면 같은 명령을 다시 실행하면 된다.
+  (보관 파일에는 id 기준으로 덮어쓰고, 복사 후 바뀐 평가는 운영 DB에서 지우지 않는다)
+- 되돌리기(restore)는 운영 DB에 다시 넣은 뒤 보관 파일 이름을 <파일>.restored로 바꾼다.
+- 보관/되돌리기로 옮긴 행은 변경 기록(change_log)에서 지워 증분 내보내기에 삭제/추가로 나오지 않게 한다.
+  (되돌릴 때 새 id로 들어갔거나 같은 학번의 다른 학생에 연결된 평가만 추가로 기록된다)
+"""
+import logging
+import os
+import re
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import (Column, Date, DateTime, Float, Index, Integer, MetaData, String, Table, Text,
+                        and_, delete, exists, func, insert, not_, or_, select, update)
+
+from change_log import OPERATION_DELETE, OPERATION_UPSERT, current_watermark, forget_changes
+from search_index import index_students, unindex_students
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = 'archive'
+ARCHIVE_FILE = re.compile(r'^archive_(\d{4})\.db$')
+# IN 목록 한 번에 담을 id 수
+LOOKUP_CHUNK = 500
+
+archive_metadata = MetaData(schema=ARCHIVE_SCHEMA)
+archive_student = Table(
+    'student', archive_metadata,
+    Column('id', Integer, primary_key=True),
+    Column('student_number', String(20), nullable=False),
+    Column('name', String(50), nullable=False),
+    Column('created_at', DateTime),
+    Column('last_modified', DateTime),
+    Index('ix_student_student_number', 'student_number'),
+)
+archive_evaluation = Table(
+    'evaluation', archive_metadata,
+    Column('id', Integer, primary_key=True),
+    Column('student_id', Integer, nullable=False),
+    Column('subject', String(100), nullable=False),
+    Column('score', Float),
+    Column('evaluation_date', Date),
+    Column('notes', Text),
+    Column('last_modified', DateTime),
+    Index('ix_evaluation_student_id_evaluation_date', 'student_id', 'evaluation_date'),
+)
+archive_info = Table(
+    'archive_info', archive_metadata,
+    Column('key', String(50), primary_key=True),
+    Column('value', Text),
+)
+
+
+class ArchiveError(Exception):
+    """보관/되돌리기를 할 수 없는 경우"""
+
+
+def academic_year(value, start_month=3):
+    """날짜가 속한 학년도 (3월 시작이면 2025-02-10 → 2024)"""
+    return value.year if value.month >= start_month else value.year - 1
+
+
+def academic_year_range(year, start_month=3):
+    """학년도의 [시작일, 다음 학년도 시작일)"""
+    return date(year, start_month, 1), date(year + 1, start_month, 1)
+
+
+def chunks(values, size=LOOKUP_CHUNK):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class ArchiveStore:
+    """학년도별 보관 파일 만들기, 되돌리기, ATTACH 조회"""
+
+    def __init__(self, db, student_model, evaluation_model, stats_model, change_model, directory, start_month=3):
+        self.db = db
+        self.student = student_model.__table__
+        self.evaluation = evaluation_model.__table__
+        self.stats = stats_model.__table__
+        self.change_log = change_model.__table__
+        self.directory = directory
+        self.start_month = start_month
+
+    def path(self, year):
+        return os.path.join(self.directory, f'archive_{year}.db')
+
+    def years(self):
+        """보관 파일이 있는 학년도 목록 (최근 순)"""
+        if not os.path.isdir(self.directory):
+            return []
+        years = [int(match.group(1)) for match in map(ARCHIVE_FILE.match, os.listdir(self.directory)) if match]
+        return sorted(years, reverse=True)
+
+    def exists(self, year):
+        return os.path.isfile(self.path(year))
+
+    @contextmanager
+    def attached(self, year, create=False):
+        """보관 파일을 ATTACH 한 전용 연결 (with 블록이 끝나면 DETACH)"""
+        if not create and not self.exists(year):
+            raise ArchiveError(f'{year}학년도 보관 파일이 없습니다.')
+        if create:
+            os.makedirs(self.directory, exist_ok=True)
+        connection = self.db.engine.connect()
+        try:
+            connection.exec_driver_sql(f'ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}', (self.path(year),))
+            connection.commit()
+            try:
+                if create:
+                    archive_metadata.create_all(connection)
+                    connection.commit()
+                yield connection
+            finally:
+                connection.rollback()
+                try:
+                    connection.exec_driver_sql(f'DETACH DATABASE {ARCHIVE_SCHEMA}')
+                    connection.commit()
+                except Exception:
+                    # 보관 파일이 붙은 채로 풀에 돌아가지 않도록 연결을 버린다
+                    connection.invalidate()
+                    raise
+        finally:
+            connection.close()
+
+    # 조회 (화면/CSV 내보내기)
+    def info(self, year):
+        """보관 파일 정보 (학년도, 기간(마지막 날 포함), 평가/학생 수, 보관 시각, 파일 크기)"""
+        with self.attached(year) as connection:
+            values = dict(connection.execute(select(archive_info.c.key, archive_info.c.value)).all())
+        start, end = academic_year_range(year, self.start_month)
+        return {
+            'year': year,
+            'start': start,
+            'end': end - timedelta(days=1),
+            'evaluations': int(values.get('evaluations', 0)),
+            'students': int(values.get('students', 0)),
+            'archived_at': values.get('archived_at'),
+            'size': os.path.getsize(self.path(year)),
+        }
+
+    def students(self, year, query=None, after=None, limit=50):
+        """보관된 학생 목록 (학번 순 키셋 페이지, 학생별 평가 수 포함)
+
+        반환값: ([(id, 학번, 이름, 평가 수)], 다음 커서)
+        """
+        evaluation_count = select(func.count(archive_evaluation.c.id)) \
+            .where(archive_evaluation.c.student_id == archive_student.c.id) \
+            .scalar_subquery()
+        statement = select(archive_student.c.id, archive_student.c.student_number,
+                           archive_student.c.name, evaluation_count.label('evaluation_count'))
+        if query:
+            like = f'%{query}%'
+            statement = statement.where(or_(archive_student.c.student_number.like(like),
+                                            archive_student.c.name.like(like)))
+        if after:
+            statement = statement.where(archive_student.c.student_number > after)
+        statement = statement.order_by(archive_student.c.student_number).limit(limit + 1)
+        with self.attached(year) as connection:
+            rows = connection.execute(statement).all()
+        next_cursor = rows[limit - 1].student_number if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    def student_evaluations(self, year, student_number):
+        """보관된 학생 한 명과 그 학년도 평가 목록 (없으면 (None, []))"""
+        with self.attached(year) as connection:
+            student = connection.execute(
+                select(archive_student).where(archive_student.c.student_number == student_number)
+                .order_by(archive_student.c.id.desc()).limit(1)
+            ).first()
+            if student is None:
+                return None, []
+            evaluations = connection.execute(
+                select(archive_evaluation).where(archive_evaluation.c.student_id == student.id)
+                .order_by(archive_evaluation.c.evaluation_date.desc(), archive_evaluation.c.id.desc())
+            ).all()
+        return student, evaluations
+
+    def evaluation_batches(self, year, batch_size):
+        """보관된 평가를 (학번, 이름, 과목, 점수, 평가일, 내용) 행 묶음으로 (CSV 내보내기)"""
+        statement = select(
+            archive_student.c.student_number,
+            archive_student.c.name,
+            archive_evaluation.c.subject,
+            archive_evaluation.c.score,
+            archive_evaluation.c.evaluation_date,
+            archive_evaluation.c.notes
+        ).join(archive_student, archive_student.c.id == archive_evaluation.c.student_id) \
+            .order_by(archive_student.c.student_number, archive_evaluation.c.id)
+        with self.attached(year) as connection:
+            result = connection.execute(statement.execution_options(yield_per=batch_size))
+            yield from result.partitions()
+
+    # 보관 (운영 DB → 보관 파일)
+    def archive_year(self, year, today=None, move_students=False):
+        """지난 학년도를 보관 파일로 옮기기 (반환: {'evaluations': 옮긴 평가 수, 'students': 옮긴 학생 수})
+
+        move_students가 False면 학생은 운영 DB에서 지우지 않는다.
+        """
+        start, end = academic_year_range(year, self.start_month)
+        if end > (today or date.today()):
+            raise ArchiveError(f'{year}학년도는 아직 끝나지 않았습니다. ({end} 이후에 보관할 수 있습니다)')
+        student, evaluation = self.student, self.evaluation
+        in_year = and_(evaluation.c.evaluation_date >= start, evaluation.c.evaluation_date < end)
+        # 운영 DB와 테이블 이름이 같으므로 함께 쓰는 조건에서는 별칭으로 구분
+        archived_evaluation = archive_evaluation.alias('archived_evaluation')
+
+        with self.attached(year, create=True) as connection:
+            # 1) 보관 파일에 복사 후 커밋
+            with connection.begin():
+                connection.execute(
+                    insert(archive_evaluation).prefix_with('OR REPLACE').from_select(
+                        [c.name for c in archive_evaluation.c],
+                        select(*(evaluation.c[c.name] for c in archive_evaluation.c)).where(in_year)
+                    )
+                )
+                referenced = select(archived_evaluation.c.student_id)
+                connection.execute(
+                    insert(archive_student).prefix_with('OR REPLACE').from_select(
+                        [c.name for c in archive_student.c],
+                        select(*(student.c[c.name] for c in archive_student.c))
+                        .where(student.c.id.in_(referenced))
+                    )
+                )
+                self._write_info(connection, year)
+
+            # 2) 보관 파일과 같은 평가만 운영 DB에서 삭제 (복사 후 수정된 평가는 남긴다)
+            copied = exists(select(archived_evaluation.c.id).where(
+                archived_evaluation.c.id == evaluation.c.id,
+                archived_evaluation.c.last_modified.is_not_distinct_from(evaluation.c.last_modified)
+            ))
+            with connection.begin():
+                watermark = current_watermark(connection)
+                affected = set(connection.scalars(select(evaluation.c.student_id).distinct().where(in_year, copied)))
+                moved_evaluations = connection.execute(delete(evaluation).where(in_year, copied)).rowcount
+                moved_students = []
+                if move_students:
+                    # 이번에 평가를 보관한 학생 중 삭제 후 평가가 하나도 남지 않은 학생만 지운다.
+                    # (복사 후 수정되어 남긴 평가가 있는 학생을 지우면 ON DELETE CASCADE로 그 평가까지 지워진다)
+                    has_evaluations = exists(select(evaluation.c.id).where(evaluation.c.student_id == student.c.id))
+                    for ids in chunks(sorted(affected)):
+                        moved_students.extend(connection.scalars(select(student.c.id).where(
+                            student.c.id.in_(ids), student.c.created_at < end, not_(has_evaluations)
+                        )))
+                for ids in chunks(moved_students):
+                    connection.execute(delete(self.stats).where(self.stats.c.student_id.in_(ids)))
+                    connection.execute(delete(student).where(student.c.id.in_(ids)))
+                if moved_students:
+                    unindex_students(connection, moved_students)
+                self._touch_students(connection, affected - set(moved_students))
+                # 보관 파일로 옮긴 것은 삭제가 아니므로 증분 내보내기에 남기지 않는다
+                for entity in ('evaluation', 'student'):
+                    forget_changes(connection, self.change_log, watermark, entity, OPERATION_DELETE)
+
+        logger.info('%d학년도 보관 완료: 평가 %d건, 학생 %d명 -> %s',
+                    year, moved_evaluations, len(moved_students), self.path(year))
+        return {'evaluations': moved_evaluations, 'students': len(moved_students)}
+
+    def _write_info(self, connection, year):
+        start, end = academic_year_range(year, self.start_month)
+        values = {
+            'academic_year': str(year),
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'evaluations': str(connection.scalar(select(func.count()).select_from(archive_evaluation))),
+            'students': str(connection.scalar(select(func.count()).select_from(archive_student))),
+            'archived_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        connection.execute(
+            insert(archive_info).prefix_with('OR REPLACE'),
+            [{'key': key, 'value': value} for key, value in values.items()]
+        )
+
+    def _touch_students(self, connection, student_ids):
+        """평가가 빠지거나 돌아온 학생의 최근 수정일 갱신 (화면 Last-Modified)"""
+        now = datetime.utcnow()
+        for ids in chunks(student_ids):
+            connection.execute(update(self.student).where(self.student.c.id.in_(ids)).values(last_modified=now))
+
+    # 되돌리기 (보관 파일 → 운영 DB)
+    def restore_year(self, year):
+        """보관 파일의 학생/평가를 운영 DB로 되돌리기 (반환: {'evaluations': 넣은 평가 수, 'students': 넣은 학생 수})"""
+        with self.attached(year) as connection:
+            with connection.begin():
+                watermark = current_watermark(connection)
+                student_map, restored_students = self._restore_students(connection)
+                unchanged = []
+                restored_evaluations = self._restore_evaluations(connection, student_map, unchanged)
+                self._touch_students(connection, set(student_map.values()))
+                self._forget_unchanged(connection, watermark, student_map, unchanged)
+        os.replace(self.path(year), f'{self.path(year)}.restored')
+        logger.info('%d학년도 되돌리기 완료: 평가 %d건, 학생 %d명', year, restored_evaluations, restored_students)
+        return {'evaluations': restored_evaluations, 'students': restored_students}
+
+    def _forget_unchanged(self, connection, watermark, student_map, evaluation_ids):
+        """원래 id/학생 그대로 돌아온 학생/평가(evaluation_ids)의 추가 기록 삭제
+
+        보관할 때 삭제를 기록하지 않았으므로 증분 내보내기를 받는 쪽에는 그 행이 그대로 있다.
+        새 id로 들어갔거나 다른 학생(같은 학번의 운영 DB 학생)에 연결된 행만 추가로 남긴다.
+        """
+        kept_students = [archived_id for archived_id, live_id in student_map.items() if archived_id == live_id]
+        for entity, ids in (('student', kept_students), ('evaluation', evaluation_ids)):
+            for chunk in chunks(ids):
+                forget_changes(connection, self.change_log, watermark, entity, OPERATION_UPSERT, chunk)
+
+    def _restore_students(self, connection):
+        """보관된 학생을 운영 DB 학생 id에 연결 (같은 학번이 있으면 그 학생, 없으면 새로 추가)
+
+        반환값: ({보관 파일 학생 id: 운영 DB 학생 id}, 추가한 학생 수)
+        """
+        student = self.student
+        student_map, added = {}, []
+        archived = connection.execute(select(archive_student).order_by(archive_student.c.id)).all()
+        for rows in chunks(archived):
+            live = dict(connection.execute(
+                select(student.c.student_number, student.c.id)
+                .where(student.c.student_number.in_([row.student_number for row in rows]))
+            ).all())
+            taken = set(connection.scalars(select(student.c.id).where(student.c.id.in_([row.id for row in rows]))))
+            for row in rows:
+                if row.student_number in live:
+                    student_map[row.id] = live[row.student_number]
+                    continue
+                values = row._asdict()
+                if row.id in taken:
+                    # 보관 후 같은 id를 다른 학생이 쓰고 있으면 새 id로 추가
+                    del values['id']
+                student_id = connection.execute(insert(student).values(**values)).inserted_primary_key[0]
+                student_map[row.id] = student_id
+                live[row.student_number] = student_id
+                added.append((student_id, row.student_number, row.name))
+        index_students(connection, added)
+        return student_map, len(added)
+
+    def _restore_evaluations(self, connection, student_map, unchanged):
+        """보관된 평가를 운영 DB에 추가 (이미 되돌린 평가는 건너뛴다)
+
+        원래 id와 원래 학생으로 돌아온 평가 id는 unchanged에 담는다.
+        """
+        evaluation = self.evaluation
+        restored, last_id = 0, 0
+        while True:
+            rows = connection.execute(
+                select(archive_evaluation).where(archive_evaluation.c.id > last_id)
+                .order_by(archive_evaluation.c.id).limit(LOOKUP_CHUNK)
+            ).all()
+            if not rows:
+                return restored
+            last_id = rows[-1].id
+            live = {
+                row.id: (row.student_id, row.subject, row.evaluation_date)
+                for row in connection.execute(
+                    select(evaluation.c.id, evaluation.c.student_id, evaluation.c.subject, evaluation.c.evaluation_date)
+                    .where(evaluation.c.id.in_([row.id for row in rows]))
+                )
+            }
+            same_id, new_id = [], []
+            for row in rows:
+                values = dict(row._asdict(), student_id=student_map[row.student_id])
+                existing = live.get(row.id)
+                if existing is None:
+                    same_id.append(values)
+                    if values['student_id'] == row.student_id:
+                        unchanged.append(row.id)
+                elif existing != (values['student_id'], row.subject, row.evaluation_date):
+                    del values['id']
+                    new_id.append(values)
+            # 원래 id를 먼저 넣고, id가 겹친 평가는 그 뒤에 새 id로 넣는다
+            for batch in (same_id, new_id):
+                if batch:
+                    connection.execute(insert(evaluation), batch)
+            restored += len(same_id) + len(new_id)
@@ -0,0 +1,160 @@
+"""로그인/인증 부하 줄이기
+
+- UserCache: Flask-Login user_loader가 매 요청 User를 조회하지 않도록 사용자 컬럼 값을
+  TTL/LRU로 캐시한다. User 행이 ORM으로 수정/삭제되면 즉시 무효화한다.
+  (gunicorn 다중 프로세스에서는 다른 프로세스의 변경이 최대 TTL초 늦게 반영된다)
+- PasswordHasher: 비밀번호 해시 생성/검증(scrypt/pbkdf2)을 크기가 정해진 작업 스레드에서 실행한다.
+  수업 시작 때 로그인이 몰려도 해시 계산은 최대 workers개까지만 동시에 돌고
+  나머지 요청 스레드는 일반 화면을 계속 처리한다.
+- LastLoginRecorder: last_login을 로그인마다 커밋하지 않고 모아 두었다가
+  interval초마다 한 번에 UPDATE 한다. (interval 0이면 바로 기록)
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import bindparam, event, update
+from sqlalchemy.orm import make_transient_to_detached
+from werkzeug.security import check_password_hash, generate_password_hash
+
+logger = logging.getLogger(__name__)
+
+
+class UserCache:
+    """사용자 id → 컬럼 값 캐시 (TTL + LRU)"""
+
+    def __init__(self, ttl=300, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def watch(self, user_model):
+        """User 수정/삭제 시 해당 사용자 캐시 무효화"""
+        @event.listens_for(user_model, 'after_update')
+        @event.listens_for(user_model, 'after_delete')
+        def _invalidate(mapper, connection, target):
+            self.invalidate(target.id)
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, values = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return values
+
+    def put(self, user_id, values):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    def load(self, session, user_model, user_id):
+        """세션에 연결된 User 반환 (캐시 적중 시 SQL 없이)"""
+        if self.ttl <= 0:
+            return session.get(user_model, user_id)
+        values = self.get(user_id)
+        if values is None:
+            user = session.get(user_model, user_id)
+            if user is not None:
+                self.put(user_id, {c.key: getattr(user, c.key) for c in user_model.__mapper__.column_attrs})
+            return user
+        user = user_model(**values)
+        make_transient_to_detached(user)
+        return session.merge(user, load=False)
+
+
+class PasswordHasher:
+    """비밀번호 해시 생성/검증을 전용 작업 스레드에서 실행 (workers 0이면 호출한 스레드에서)"""
+
+    def __init__(self, workers=2):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password') if workers else None
+
+    def _run(self, func, *args):
+        if self._executor is None:
+            return func(*args)
+        return self._executor.submit(func, *args).result()
+
+    def check(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def generate(self, password):
+        return self._run(generate_password_hash, password)
+
+
+class LastLoginRecorder:
+    """last_login 쓰기를 모아서 한 번에 기록
+
+    Core UPDATE는 ORM after_update 이벤트를 거치지 않으므로, user_cache를 주면
+    기록한 뒤 그 사용자들을 캐시에서 직접 지운다. (TTL 동안 이전 last_login을 보여 주지 않도록)
+    """
+
+    def __init__(self, app, db, user_model, interval=30, user_cache=None):
+        self.app = app
+        self.db = db
+        self.table = user_model.__table__
+        self.interval = interval
+        self.user_cache = user_cache
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._timer = None
+        atexit.register(self.flush)
+
+    def record(self, user_id, when=None):
+        when = when or datetime.utcnow()
+        if self.interval <= 0:
+            self._write({user_id: when}, self.db.session)
+            return
+        with self._lock:
+            self._pending[user_id] = when
+            if self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """모아 둔 last_login 기록 (반환: 기록한 사용자 수)"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None and self._timer is not threading.current_thread():
+                self._timer.cancel()
+            self._timer = None
+        if not pending:
+            return 0
+        try:
+            with self.app.app_context():
+                self._write(pending, self.db.session)
+                self.db.session.remove()
+        except Exception as e:
+            logger.warning('마지막 로그인 시각 기록 실패: %s', e)
+            return 0
+        return len(pending)
+
+    def _write(self, pending, session):
+        session.execute(
+            update(self.table).where(self.table.c.id == bindparam('user_id'))
+            .values(last_login=bindparam('when')),
+            [{'user_id': user_id, 'when': when} for user_id, when in pending.items()]
+        )
+        session.commit()
+        if self.user_cache is not None:
+            for user_id in pending:
+                self.user_cache.invalidate(user_id)
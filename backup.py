@@ -0,0 +1,241 @@
+"""온라인 백업 (SQLite 백업 API)
+
+실행 중인 management.db를 파일 복사로 백업하면 쓰기 도중의 페이지나 WAL에만 있는 변경이 빠져
+깨진 사본이 생길 수 있다. SQLite 백업 API로 BACKUP_STEP_PAGES 페이지씩 나눠 복사하고
+단계 사이에 BACKUP_STEP_SLEEP_MS만큼 쉬어, 그 사이에 평가 저장(쓰기 트랜잭션)이 끼어들 수 있게 한다.
+복사 도중 다른 연결이 원본을 바꾸면 SQLite가 처음부터 다시 복사하므로 사본은 항상 한 시점의 상태다.
+평가 저장이 쉬지 않고 이어지면 계속 다시 시작해 끝나지 않으므로, BACKUP_MAX_RESTARTS번 다시 시작하면
+남은 복사를 한 단계로 끝낸다. WAL 모드에서는 한 단계 복사도 읽기 스냅샷만 잡으므로 쓰기를 막지 않는다.
+(저널 모드가 DELETE면 그동안 쓰기가 busy_timeout 안에서 기다린다)
+
+- 사본은 임시 파일(.tmp)에 만들고 PRAGMA integrity_check를 통과하면 이름을 바꾼다.
+- BACKUP_DIR에 management-YYYYmmdd-HHMMSS.db 형식으로 최근 BACKUP_KEEP개만 보관한다.
+- BackupScheduler: BACKUP_INTERVAL_HOURS마다 백그라운드 스레드에서 백업한다.
+  마지막 백업 파일의 시각을 기준으로 다음 백업 시각을 정하므로 자주 재시작해도 백업이 몰리지 않는다.
+- 되돌리기(restore)는 백업 파일을 검사한 뒤 현재 DB를 먼저 백업해 두고,
+  백업 API로 현재 DB에 덮어쓴다. (파일 교체가 아니므로 WAL/다른 연결과 충돌하지 않는다)
+"""
+import glob
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+BACKUP_PREFIX = 'management-'
+BACKUP_SUFFIX = '.db'
+TIMESTAMP_FORMAT = '%Y%m%d-%H%M%S'
+# management-20250301-020000.db, 같은 초에 또 만들면 management-20250301-020000-1.db
+BACKUP_FILE = re.compile(r'^management-(\d{8}-\d{6})(?:-(\d+))?\.db$')
+
+
+class BackupError(Exception):
+    """백업/되돌리기를 할 수 없는 경우 (파일 없음, 검사 실패 등)"""
+
+
+class _TooManyRestarts(Exception):
+    """단계별 복사가 원본 변경으로 너무 여러 번 다시 시작됨"""
+
+
+def connect(path, timeout=30):
+    connection = sqlite3.connect(path, timeout=timeout)
+    connection.execute(f'PRAGMA busy_timeout = {int(timeout * 1000)}')
+    return connection
+
+
+def check_integrity(path):
+    """PRAGMA integrity_check 결과가 ok가 아니면 BackupError"""
+    if not os.path.isfile(path):
+        raise BackupError(f'파일이 없습니다: {path}')
+    try:
+        connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        try:
+            result = [row[0] for row in connection.execute('PRAGMA integrity_check')]
+        finally:
+            connection.close()
+    except sqlite3.DatabaseError as e:
+        raise BackupError(f'SQLite 데이터베이스가 아닙니다: {path} ({e})')
+    if result != ['ok']:
+        raise BackupError(f'무결성 검사 실패: {path} ({"; ".join(result[:5])})')
+
+
+def copy_database(source_path, target_path, pages=256, sleep=0.01, journal_mode=None, max_restarts=3):
+    """백업 API로 source → target 복사 (반환: (전체 페이지 수, 다시 시작한 횟수))
+
+    pages 페이지씩 복사하고 단계마다 sleep초 쉰다. 원본의 읽기 잠금은 한 단계 동안만 잡는다.
+    max_restarts번 넘게 다시 시작되면 남은 복사를 한 단계로 끝낸다.
+    journal_mode를 주면 복사한 뒤 target의 저널 모드를 바꾼다. (백업 파일은 DELETE로 파일 하나만 남긴다)
+    """
+    state = {'pages': 0, 'remaining': None, 'restarts': 0}
+
+    def progress(status, remaining, page_count):
+        state['pages'] = page_count
+        if state['remaining'] is not None and remaining > state['remaining']:
+            state['restarts'] += 1
+            if state['restarts'] > max_restarts:
+                raise _TooManyRestarts()
+        state['remaining'] = remaining
+
+    source = connect(source_path)
+    try:
+        target = connect(target_path)
+        try:
+            try:
+                source.backup(target, pages=pages, progress=progress, sleep=sleep)
+            except _TooManyRestarts:
+                source.backup(target, pages=-1)
+            if journal_mode:
+                target.execute(f'PRAGMA journal_mode = {journal_mode}')
+        finally:
+            target.close()
+    finally:
+        source.close()
+    return state['pages'], state['restarts']
+
+
+class BackupManager:
+    """백업 만들기, 보관 개수 정리, 검사 후 되돌리기"""
+
+    def __init__(self, database_path, directory, keep=7, pages=256, sleep=0.01, max_restarts=3):
+        self.database_path = database_path
+        self.directory = directory
+        self.keep = keep
+        self.pages = pages
+        self.sleep = sleep
+        self.max_restarts = max_restarts
+        self._lock = threading.Lock()
+
+    def backups(self):
+        """보관 중인 백업 파일 경로 (최근 순)"""
+        if not os.path.isdir(self.directory):
+            return []
+        found = []
+        for name in os.listdir(self.directory):
+            match = BACKUP_FILE.match(name)
+            if match:
+                found.append(((match.group(1), int(match.group(2) or 0)), os.path.join(self.directory, name)))
+        return [path for _, path in sorted(found, reverse=True)]
+
+    def latest_time(self):
+        """가장 최근 백업 시각 (epoch 초, 없으면 None)"""
+        backups = self.backups()
+        return os.path.getmtime(backups[0]) if backups else None
+
+    def backup(self, rotate=True):
+        """지금 상태를 새 백업 파일로 저장 (반환: 백업 파일 경로)"""
+        if not os.path.isfile(self.database_path):
+            raise BackupError(f'데이터베이스 파일이 없습니다: {self.database_path}')
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            self._remove_temporary()
+            path = self._new_path()
+            tmp_path = f'{path}.tmp'
+            started = time.perf_counter()
+            try:
+                page_count, restarts = copy_database(self.database_path, tmp_path, self.pages, self.sleep,
+                                                     journal_mode='DELETE', max_restarts=self.max_restarts)
+                check_integrity(tmp_path)
+                os.replace(tmp_path, path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            logger.info('백업 완료: %s (%d페이지, %.1fMB, %.1f초, 다시 시작 %d회)', path, page_count,
+                        os.path.getsize(path) / 1024 / 1024, time.perf_counter() - started, restarts)
+            if rotate:
+                self.rotate()
+            return path
+
+    def _new_path(self):
+        stamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+        # 같은 초에 또 백업하면 그 초의 가장 큰 번호 다음 번호를 붙인다 (이름 순서 = 만든 순서)
+        numbers = [
+            int(match.group(2) or 0) for match in map(BACKUP_FILE.match, map(os.path.basename, self.backups()))
+            if match.group(1) == stamp
+        ]
+        suffix = f'-{max(numbers) + 1}' if numbers else ''
+        return os.path.join(self.directory, f'{BACKUP_PREFIX}{stamp}{suffix}{BACKUP_SUFFIX}')
+
+    def _remove_temporary(self):
+        """중간에 멈춘 백업의 임시 파일 정리"""
+        for path in glob.glob(os.path.join(self.directory, f'{BACKUP_PREFIX}*{BACKUP_SUFFIX}.tmp')):
+            os.remove(path)
+
+    def rotate(self):
+        """최근 keep개만 남기고 삭제 (반환: 삭제한 파일 수)"""
+        old = self.backups()[self.keep:] if self.keep > 0 else []
+        for path in old:
+            os.remove(path)
+            logger.info('오래된 백업 삭제: %s', path)
+        return len(old)
+
+    def resolve(self, name):
+        """백업 파일 이름(또는 경로) → 경로 ('latest'면 가장 최근 백업)"""
+        if name == 'latest':
+            backups = self.backups()
+            if not backups:
+                raise BackupError('백업 파일이 없습니다.')
+            return backups[0]
+        if os.path.isfile(name):
+            return name
+        return os.path.join(self.directory, name)
+
+    def restore(self, name):
+        """백업 파일을 검사한 뒤 현재 DB에 덮어쓰기
+
+        덮어쓰기 전 현재 DB를 백업해 두고, 덮어쓴 뒤 다시 무결성을 검사한다.
+        (되돌릴 백업이 정리되지 않도록 보관 개수 정리는 덮어쓴 뒤에 한다)
+        반환값: (되돌린 백업 파일, 덮어쓰기 전에 만든 백업 파일)
+        """
+        path = self.resolve(name)
+        check_integrity(path)
+        before = self.backup(rotate=False) if os.path.isfile(self.database_path) else None
+        with self._lock:
+            copy_database(path, self.database_path, pages=-1, sleep=0)
+            check_integrity(self.database_path)
+            self.rotate()
+        logger.info('백업 되돌리기 완료: %s (이전 상태: %s)', path, before)
+        return path, before
+
+
+class BackupScheduler:
+    """interval초마다 백그라운드 스레드에서 백업 (마지막 백업 시각 기준)"""
+
+    def __init__(self, manager, interval, start_delay=60):
+        self.manager = manager
+        self.interval = interval
+        self.start_delay = start_delay
+        self._stop = threading.Event()
+        self._thread = None
+
+    def next_delay(self, now=None):
+        """다음 백업까지 남은 초 (지났으면 시작 지연만큼)"""
+        now = time.time() if now is None else now
+        latest = self.manager.latest_time()
+        if latest is None:
+            return self.start_delay
+        return max(latest + self.interval - now, self.start_delay)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='backup-scheduler', daemon=True)
+        self._thread.start()
+        logger.info('백업 예약: %.1f시간마다, %s', self.interval / 3600, self.manager.directory)
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.next_delay()):
+            try:
+                self.manager.backup()
+            except Exception as e:
+                logger.error('예약 백업 실패: %s', e)
+                # 실패하면 한 주기를 기다리지 않고 조금 뒤 다시 시도
+                if self._stop.wait(min(self.interval, 600)):
+                    return
@@ -42,10 +42,17 @@ for file in templates/*.html; do
     fi
 done
 
+# 정적 파일 준비: 오프라인에서도 동작하도록 Bootstrap을 내장하고 gzip 변형을 미리 만든다
+echo "📦 정적 파일을 준비합니다..."
+if ! FLASK_APP=management_app flask fetch-static-vendor; then
+    echo "⚠️  Bootstrap 내려받기 실패: static/vendor가 없으면 실행 시 CDN을 사용합니다."
+fi
+FLASK_APP=management_app flask compress-static
+
 # 빌드 실행
 echo "🔨 macOS용 실행 파일을 빌드합니다..."
 echo "   - Universal Binary (Intel + Apple Silicon) 지원"
-echo "   - 템플릿 파일 포함"
+echo "   - 템플릿/정적 파일 포함"
 echo "   - 숨겨진 의존성 포함"
 
 # Universal Binary 빌드 시도
@@ -53,6 +60,8 @@ echo "🔄 Universal Binary 빌드를 시도합니다..."
 if pyinstaller \
     --onefile \
     --add-data "templates:templates" \
+    --add-data "migrations:migrations" \
+    --add-data "static:static" \
     --hidden-import=mmap \
     --hidden-import=multiprocessing \
     --hidden-import=_csv \
@@ -60,8 +69,13 @@ if pyinstaller \
     --hidden-import=flask \
     --hidden-import=flask_sqlalchemy \
     --hidden-import=flask_wtf \
+    --hidden-import=flask_migrate \
+    --hidden-import=alembic \
     --hidden-import=jinja2 \
     --hidden-import=jinja2.ext \
+    --hidden-import=waitress \
+    --hidden-import=gunicorn.workers.sync \
+    --hidden-import=gunicorn.workers.gthread \
             --name "student_management_mac" \
         --target-architecture universal2 \
         --clean \
@@ -73,6 +87,8 @@ else
     pyinstaller \
         --onefile \
         --add-data "templates:templates" \
+        --add-data "migrations:migrations" \
+        --add-data "static:static" \
         --hidden-import=mmap \
         --hidden-import=multiprocessing \
         --hidden-import=_csv \
@@ -80,8 +96,13 @@ else
         --hidden-import=flask \
         --hidden-import=flask_sqlalchemy \
         --hidden-import=flask_wtf \
+        --hidden-import=flask_migrate \
+        --hidden-import=alembic \
         --hidden-import=jinja2 \
         --hidden-import=jinja2.ext \
+        --hidden-import=waitress \
+        --hidden-import=gunicorn.workers.sync \
+        --hidden-import=gunicorn.workers.gthread \
         --name "student_management_mac" \
         --clean \
         --exclude-module=tkinter \
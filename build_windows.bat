@@ -22,9 +22,18 @@ REM 의존성 설치
 echo 의존성을 설치합니다...
 pip install -r requirements.txt
 
+REM 정적 파일 준비: 오프라인에서도 동작하도록 Bootstrap을 내장하고 gzip 변형을 미리 만든다
+echo 정적 파일을 준비합니다...
+set FLASK_APP=management_app
+flask fetch-static-vendor
+if errorlevel 1 (
+    echo Bootstrap 내려받기 실패: static\vendor가 없으면 실행 시 CDN을 사용합니다.
+)
+flask compress-static
+
 REM 빌드 실행
 echo Windows용 실행 파일을 빌드합니다...
-pyinstaller --onefile --add-data "templates;templates" --hidden-import=mmap --hidden-import=multiprocessing --hidden-import=_csv --name "student_management" management_app.py
+pyinstaller --onefile --add-data "templates;templates" --add-data "migrations;migrations" --add-data "static;static" --hidden-import=flask_migrate --hidden-import=alembic --hidden-import=mmap --hidden-import=multiprocessing --hidden-import=_csv --hidden-import=waitress --name "student_management" management_app.py
 
 REM 빌드 결과 확인
 if exist "dist\student_management.exe" (
@@ -0,0 +1,99 @@
+"""변경 기록과 증분 내보내기 (워터마크)
+
+학생/평가 행의 추가, 수정, 삭제를 SQLite 트리거로 change_log 테이블에 남긴다.
+ORM 이벤트 대신 트리거를 쓰는 이유: CSV 일괄 등록 같은 Core INSERT, 외래 키 CASCADE 삭제처럼
+ORM을 거치지 않는 변경도 같은 트랜잭션에서 빠짐없이 기록해야 하기 때문이다.
+
+change_log.id(AUTOINCREMENT)가 워터마크다. SQLite는 쓰기 트랜잭션이 하나씩 커밋되므로
+id 순서가 곧 커밋 순서이고, 삭제된 id는 다시 쓰이지 않는다.
+- 전체 내보내기 응답의 워터마크를 저장해 두고
+- 다음에는 since=<워터마크>로 그 뒤에 바뀐 평가만 받은 뒤 응답의 새 워터마크를 저장한다.
+"""
+from sqlalchemy import DDL, event, func, select, text
+
+CHANGE_TABLE = 'change_log'
+OPERATION_UPSERT = 'upsert'
+OPERATION_DELETE = 'delete'
+
+# (테이블, UPDATE OF 대상 컬럼): 통계용 컬럼(last_modified 등)만 바뀐 UPDATE는 기록하지 않는다
+TRACKED_TABLES = {
+    'student': ('student_number', 'name'),
+    'evaluation': ('student_id', 'subject', 'score', 'evaluation_date', 'notes'),
+}
+
+
+def trigger_statements():
+    """변경 기록 트리거 생성 SQL 목록"""
+    statements = []
+    for table, columns in TRACKED_TABLES.items():
+        for event_name, row, operation in (
+            ('INSERT', 'NEW', OPERATION_UPSERT),
+            (f'UPDATE OF {", ".join(columns)}', 'NEW', OPERATION_UPSERT),
+            ('DELETE', 'OLD', OPERATION_DELETE),
+        ):
+            name = f'{CHANGE_TABLE}_{table}_{event_name.split()[0].lower()}'
+            statements.append(
+                f'CREATE TRIGGER IF NOT EXISTS {name} AFTER {event_name} ON {table} BEGIN '
+                f'INSERT INTO {CHANGE_TABLE} (entity, entity_id, operation, changed_at) '
+                f"VALUES ('{table}', {row}.id, '{operation}', CURRENT_TIMESTAMP); END"
+            )
+    return statements
+
+
+def register_change_triggers(metadata):
+    """create_all()로 테이블을 만들 때 트리거도 함께 생성 (마이그레이션은 0005에서 생성)"""
+    for statement in trigger_statements():
+        event.listen(metadata, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+
+
+def current_watermark(connection):
+    """지금까지 기록된 마지막 변경 번호 (기록이 없으면 0)"""
+    row = connection.execute(
+        text('SELECT seq FROM sqlite_sequence WHERE name = :name'), {'name': CHANGE_TABLE}
+    ).first()
+    return row[0] if row else 0
+
+
+def oldest_available(connection, change_table):
+    """보관 중인 가장 오래된 변경 번호 (정리되어 비어 있으면 다음 번호)"""
+    oldest = connection.execute(select(func.min(change_table.c.id))).scalar()
+    return oldest if oldest is not None else current_watermark(connection) + 1
+
+
+def changed_rows(connection, change_table, since, limit):
+    """since 이후 변경된 (entity, entity_id)와 다음 워터마크
+
+    반환값: ({entity: {id, ...}}, 다음 워터마크, 남은 변경이 더 있는지)
+    같은 행이 여러 번 바뀌어도 한 번만 담는다. (내보낼 때 현재 상태로 판단)
+    """
+    rows = connection.execute(
+        select(change_table.c.id, change_table.c.entity, change_table.c.entity_id)
+        .where(change_table.c.id > since)
+        .order_by(change_table.c.id)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changed = {table: set() for table in TRACKED_TABLES}
+    for _, entity, entity_id in rows:
+        changed.setdefault(entity, set()).add(entity_id)
+    next_watermark = rows[-1].id if rows else since
+    return changed, next_watermark, has_more
+
+
+def forget_changes(connection, change_table, since, entity, operation, ids=None):
+    """since 이후 기록된 entity의 operation 기록 삭제 (ids를 주면 그 행만, 반환: 삭제한 행 수)
+
+    학년도 보관/되돌리기처럼 행이 운영 DB와 보관 파일 사이를 옮겨 다닐 뿐인 변경을
+    증분 내보내기에 삭제/추가로 내보내지 않기 위해 쓴다. since는 같은 쓰기 트랜잭션 안에서
+    current_watermark()로 읽어야 한다. (쓰기는 하나씩 커밋되므로 그 뒤 기록은 이 트랜잭션의 것뿐이다)
+    """
+    condition = (change_table.c.id > since) & (change_table.c.entity == entity) & (change_table.c.operation == operation)
+    if ids is not None:
+        condition &= change_table.c.entity_id.in_(ids)
+    return connection.execute(change_table.delete().where(condition)).rowcount
+
+
+def prune_change_log(connection, change_table, before):
+    """before(datetime) 이전 변경 기록 삭제 (반환: 삭제한 행 수)"""
+    return connection.execute(change_table.delete().where(change_table.c.changed_at < before)).rowcount
@@ -1,5 +1,6 @@
 import os
 import sys
+import tempfile
 
 class Config:
     """기본 설정 클래스"""
@@ -17,14 +18,31 @@ class Config:
         current_dir = os.path.dirname(os.path.abspath(__file__))
     
     # 데이터베이스 파일을 실행 파일과 같은 디렉토리에 생성
+    # (클래스 정의 시점에는 파일 시스템을 건드리지 않는다. 디렉토리는 create_app()에서 만든다)
     db_path = os.path.join(current_dir, 'management.db')
     
-    # 데이터베이스 디렉토리가 존재하지 않으면 생성
-    db_dir = os.path.dirname(db_path)
-    if not os.path.exists(db_dir):
-        os.makedirs(db_dir, exist_ok=True)
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or f'sqlite:///{db_path}'
     
-    SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+    # SQLite 연결 설정 (storage.py): 모든 연결에 적용할 PRAGMA
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -20000,            # 약 20MB
+        'mmap_size': 256 * 1024 * 1024,  # 256MB
+        'foreign_keys': 'ON',            # 학생 삭제 시 평가/통계 ON DELETE CASCADE
+    }
+    # 쓰기 트랜잭션을 프로세스 안에서 하나씩 실행
+    SQLITE_SERIALIZE_WRITES = True
+    WRITE_LOCK_TIMEOUT = 30
+    
+    # 스레드 서버용 연결 풀
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': 10,
+        'pool_timeout': 30,
+        'connect_args': {'timeout': 30},
+    }
     
     # 요청 제한 설정 (Flask-Limiter 제거로 인해 비활성화)
     # RATELIMIT_STORAGE_URI = os.environ.get("RATELIMIT_STORAGE_URI", "memory://")
@@ -32,9 +50,97 @@ class Config:
     # 파일 업로드 설정
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
     
-    # 로깅 설정
+    # 학생 목록 페이지 크기 (키셋 페이지네이션)
+    STUDENTS_PER_PAGE = int(os.environ.get('STUDENTS_PER_PAGE', 50))
+    
+    # 학생 상세 화면의 평가 기록 페이지 크기 (평가일 역순 키셋 페이지네이션)
+    EVALUATIONS_PER_PAGE = int(os.environ.get('EVALUATIONS_PER_PAGE', 20))
+    
+    # JSON API: 한 요청에 보낼 수 있는 평가 수, 목록 조회 기본/최대 개수 (커서 페이지네이션)
+    API_BATCH_MAX = int(os.environ.get('API_BATCH_MAX', 500))
+    API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', 100))
+    API_PAGE_SIZE_MAX = int(os.environ.get('API_PAGE_SIZE_MAX', 1000))
+    
+    # CSV 내보내기: 한 번에 읽어 전송할 행 수, gzip 압축 허용 여부
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+    EXPORT_GZIP = os.environ.get('EXPORT_GZIP', '1') == '1'
+    
+    # 증분 내보내기 (change_log.py): 한 번에 내보낼 최대 변경 수, 변경 기록 보관 기간(일, flask prune-change-log)
+    CHANGE_EXPORT_MAX = int(os.environ.get('CHANGE_EXPORT_MAX', 100000))
+    CHANGE_LOG_RETENTION_DAYS = int(os.environ.get('CHANGE_LOG_RETENTION_DAYS', 90))
+    
+    # 온라인 백업 (backup.py): 백업 디렉토리, 예약 백업 간격(시간, 0이면 사용 안 함), 보관 개수,
+    # 한 단계에 복사할 페이지 수와 단계 사이 쉬는 시간(ms), 원본 변경으로 다시 시작할 최대 횟수
+    # (넘으면 남은 복사를 한 번에 끝낸다), 서버 시작 후 첫 백업까지 최소 대기(초)
+    BACKUP_DIR = os.environ.get('BACKUP_DIR', os.path.join(current_dir, 'backups'))
+    BACKUP_INTERVAL_HOURS = float(os.environ.get('BACKUP_INTERVAL_HOURS', 24))
+    BACKUP_KEEP = int(os.environ.get('BACKUP_KEEP', 7))
+    BACKUP_STEP_PAGES = int(os.environ.get('BACKUP_STEP_PAGES', 256))
+    BACKUP_STEP_SLEEP_MS = int(os.environ.get('BACKUP_STEP_SLEEP_MS', 10))
+    BACKUP_MAX_RESTARTS = int(os.environ.get('BACKUP_MAX_RESTARTS', 3))
+    BACKUP_START_DELAY = int(os.environ.get('BACKUP_START_DELAY', 60))
+    
+    # 학년도 보관 (archive.py): 학년도 시작 월, 보관 파일(archive_<학년도>.db) 디렉토리
+    ACADEMIC_YEAR_START_MONTH = int(os.environ.get('ACADEMIC_YEAR_START_MONTH', 3))
+    ARCHIVE_DIR = os.environ.get('ARCHIVE_DIR', os.path.join(current_dir, 'archive'))
+    
+    # CSV 가져오기: 한 트랜잭션에서 처리할 행 수
+    IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 1000))
+    
+    # 백그라운드 작업: 작업 스레드 수, 대기열 크기, 결과 파일 디렉토리
+    # 업로드가 JOB_IMPORT_THRESHOLD 바이트를 넘으면 가져오기를 백그라운드 작업으로 처리
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+    JOB_QUEUE_SIZE = int(os.environ.get('JOB_QUEUE_SIZE', 16))
+    JOB_IMPORT_THRESHOLD = int(os.environ.get('JOB_IMPORT_THRESHOLD', 256 * 1024))
+    JOB_DIR = os.path.join(current_dir, 'jobs')
+    
+    # 서버 설정 (serve.py): waitress | gunicorn | development
+    SERVER = os.environ.get('SERVER', 'waitress')
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 16))
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', 2))  # gunicorn 프로세스 수
+    SERVER_GRACEFUL_TIMEOUT = int(os.environ.get('SERVER_GRACEFUL_TIMEOUT', 10))
+    
+    # 읽기 화면 캐시 (page_cache.py): 학생 목록/학생 상세, 최대 항목 수와 전체 크기
+    PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', '1') == '1'
+    PAGE_CACHE_MAX_ENTRIES = int(os.environ.get('PAGE_CACHE_MAX_ENTRIES', 512))
+    PAGE_CACHE_MAX_BYTES = int(os.environ.get('PAGE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    
+    # 평가 분석 (analytics.py): 순위 인원, 순위에 넣을 최소 평가 수, 기수로 묶을 학번 앞자리 수(0이면 사용 안 함),
+    # 기간을 정하지 않았을 때 보여줄 최근 개월 수, 캐시할 결과 수
+    ANALYTICS_TOP_N = int(os.environ.get('ANALYTICS_TOP_N', 10))
+    ANALYTICS_MIN_EVALUATIONS = int(os.environ.get('ANALYTICS_MIN_EVALUATIONS', 3))
+    ANALYTICS_COHORT_DIGITS = int(os.environ.get('ANALYTICS_COHORT_DIGITS', 4))
+    ANALYTICS_TREND_MONTHS = int(os.environ.get('ANALYTICS_TREND_MONTHS', 12))
+    ANALYTICS_CACHE_SIZE = int(os.environ.get('ANALYTICS_CACHE_SIZE', 16))
+    
+    # 인증 (auth.py): 사용자 캐시 TTL(초, 0이면 사용 안 함)/크기, 비밀번호 해시 스레드 수,
+    # last_login 모아 쓰기 간격(초, 0이면 로그인 시 바로 기록)
+    AUTH_USER_CACHE_TTL = int(os.environ.get('AUTH_USER_CACHE_TTL', 300))
+    AUTH_USER_CACHE_SIZE = int(os.environ.get('AUTH_USER_CACHE_SIZE', 1024))
+    AUTH_HASH_WORKERS = int(os.environ.get('AUTH_HASH_WORKERS', 2))
+    AUTH_LAST_LOGIN_INTERVAL = int(os.environ.get('AUTH_LAST_LOGIN_INTERVAL', 30))
+    
+    # 성능 계측 (metrics.py): 느린 요청/쿼리 기준(ms), Server-Timing 헤더, /metrics 집계
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+    SERVER_TIMING = os.environ.get('SERVER_TIMING', '1') == '1'
+    SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 500))
+    SLOW_QUERY_MS = int(os.environ.get('SLOW_QUERY_MS', 100))
+    
+    # 템플릿 바이트코드 캐시 디렉토리 (빈 값이면 사용 안 함)
+    # 포터블 빌드는 실행할 때마다 템플릿을 임시 폴더에 새로 풀기 때문에 실행 파일 옆에 둔다
+    JINJA_CACHE_DIR = os.environ.get('JINJA_CACHE_DIR', os.path.join(current_dir, '.jinja_cache'))
+    
+    # 로깅 설정 (logging_config.py): 요청 스레드는 대기열에 넣기만 하고 별도 스레드가 기록
+    # - 파일은 LOG_MAX_BYTES마다(LOG_ROTATE_WHEN을 지정하면 그 주기마다, 예: midnight) 회전, LOG_BACKUP_COUNT개 보관
+    # - LOG_JSON=1이면 JSON 한 줄 형식, LOG_LEVELS="sqlalchemy.engine=INFO,werkzeug=WARNING"로 로거별 레벨
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
-    LOG_FILE = 'management.log'
+    LOG_FILE = os.path.join(current_dir, os.environ.get('LOG_FILE', 'management.log'))
+    LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 5))
+    LOG_ROTATE_WHEN = os.environ.get('LOG_ROTATE_WHEN', '')
+    LOG_JSON = os.environ.get('LOG_JSON', '0') == '1'
+    LOG_LEVELS = os.environ.get('LOG_LEVELS', '')
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
 
 class DevelopmentConfig(Config):
     """개발 환경 설정"""
@@ -53,6 +159,12 @@ class TestingConfig(Config):
     WTF_CSRF_ENABLED = False
     # RATELIMIT_ENABLED = False  # Flask-Limiter 제거로 인해 비활성화
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # 인메모리 DB는 연결 하나(StaticPool)를 공유하므로 풀 설정을 쓰지 않는다
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    # 인메모리 DB는 연결 하나를 공유하므로 작업을 요청 스레드에서 바로 실행
+    JOB_WORKERS = 0
+    JOB_DIR = os.path.join(tempfile.gettempdir(), 'management_test_jobs')
+    AUTH_LAST_LOGIN_INTERVAL = 0
 
 # 설정 매핑
 config = {
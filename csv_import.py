@@ -0,0 +1,162 @@
+"""CSV 일괄 가져오기
+
+업로드 파일을 한 줄씩 읽으면서 chunk_size 행 단위로 중복을 한 번에 조회(IN)하고
+executemany 방식으로 삽입한 뒤 chunk마다 커밋한다. 파일 전체를 메모리에 올리지 않는다.
+평가 가져오기는 평가 내보내기와 같은 형식을 읽고, 학번은 미리 읽어 둔 {학번: 학생 id}로 바꾼다.
+"""
+import csv
+import io
+from itertools import islice
+
+from sqlalchemy import insert, select
+
+from search_index import index_students
+from validation import ValidationError, parse_evaluation
+
+STUDENT_HEADERS = (['student_number', 'name'], ['학번', '이름'])
+# 평가 내보내기(EXPORT_HEADER)와 같은 열 순서, 오류 보고서처럼 뒤에 열이 더 있어도 앞 6열만 읽는다
+EVALUATION_HEADER = ['student_number', 'name', 'subject', 'score', 'evaluation_date', 'notes']
+EVALUATION_HEADERS = (EVALUATION_HEADER, ['학번', '이름', '과목', '점수', '평가일', '평가 내용'])
+
+
+def iter_csv_rows(stream, encoding='utf-8-sig'):
+    """바이너리 스트림을 CSV 행 단위로 읽는다"""
+    text_stream = io.TextIOWrapper(stream, encoding=encoding, newline='')
+    try:
+        yield from csv.reader(text_stream)
+    finally:
+        # 업로드 스트림은 호출한 쪽에서 닫도록 분리만 한다
+        text_stream.detach()
+
+
+def chunked(iterable, size):
+    """iterable을 size 개씩 묶어 리스트로 반환"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def is_header(row, headers):
+    return [h.strip().lower() for h in row] in headers
+
+
+def import_students_csv(db, student_model, rows, chunk_size=1000, progress=None):
+    """학생 CSV 행을 일괄 등록
+
+    progress가 주어지면 chunk를 처리할 때마다 지금까지 읽은 행 수로 호출한다.
+    반환값: {'lines': 읽은 행 수, 'total': 처리 대상 수, 'added': 추가 수, 'skipped': 건너뛴 수}
+    """
+    result = {'lines': 0, 'total': 0, 'added': 0, 'skipped': 0}
+    table = student_model.__table__
+    seen = set()
+
+    for chunk in chunked(rows, chunk_size):
+        if result['lines'] == 0 and is_header(chunk[0], STUDENT_HEADERS):
+            result['lines'] += 1
+            chunk = chunk[1:]
+        result['lines'] += len(chunk)
+
+        candidates = {}
+        for row in chunk:
+            result['total'] += 1
+            if len(row) < 2:
+                result['skipped'] += 1
+                continue
+            student_number = str(row[0]).strip()
+            name = str(row[1]).strip()
+            # 파일 안에서 중복된 학번은 처음 한 건만 등록
+            if not student_number or not name or student_number in seen:
+                result['skipped'] += 1
+                continue
+            seen.add(student_number)
+            candidates[student_number] = name
+
+        if not candidates:
+            if progress:
+                progress(result['lines'])
+            continue
+
+        existing = set(db.session.scalars(
+            select(table.c.student_number).where(table.c.student_number.in_(list(candidates)))
+        ))
+        new_rows = [
+            {'student_number': student_number, 'name': name}
+            for student_number, name in candidates.items()
+            if student_number not in existing
+        ]
+        result['skipped'] += len(existing)
+
+        if new_rows:
+            db.session.execute(insert(table), new_rows)
+            # Core insert는 매퍼 이벤트를 거치지 않으므로 검색 색인을 직접 갱신
+            inserted = db.session.execute(
+                select(table.c.id, table.c.student_number, table.c.name)
+                .where(table.c.student_number.in_([r['student_number'] for r in new_rows]))
+            ).all()
+            index_students(db.session.connection(), inserted)
+            db.session.commit()
+            result['added'] += len(new_rows)
+
+        if progress:
+            progress(result['lines'])
+
+    return result
+
+
+def parse_evaluation_row(row, student_ids):
+    """평가 CSV 한 행 → Evaluation 삽입 값 (잘못된 행은 ValidationError)"""
+    if len(row) < 5:
+        raise ValidationError('열이 부족합니다. (학번, 이름, 과목, 점수, 평가일, 평가 내용)')
+    student_number = row[0].strip()
+    if student_number not in student_ids:
+        raise ValidationError(f'존재하지 않는 학번입니다: {student_number}', 'student_number')
+    values = parse_evaluation(row[2], row[3].strip(), row[4].strip(), row[5] if len(row) > 5 else None)
+    values['student_id'] = student_ids[student_number]
+    return values
+
+
+def import_evaluations_csv(db, evaluation_model, rows, student_ids, chunk_size=1000, progress=None,
+                           before_commit=None, on_error=None):
+    """평가 CSV 행을 일괄 등록
+
+    student_ids: {학번: 학생 id} (행마다 조회하지 않도록 한 번 읽어 둔 것)
+    chunk_size 행마다 검증을 통과한 행만 한 번의 executemany로 삽입하고, before_commit(삽입한 값 목록)으로
+    학생 통계 등을 같은 트랜잭션에서 갱신한 뒤 커밋한다. 잘못된 행은 건너뛰고 on_error(줄 번호, 행, 메시지)로 알린다.
+    반환값: {'lines': 읽은 행 수, 'total': 처리 대상 수, 'added': 추가 수, 'failed': 오류 수}
+    """
+    result = {'lines': 0, 'total': 0, 'added': 0, 'failed': 0}
+    table = evaluation_model.__table__
+
+    for chunk in chunked(rows, chunk_size):
+        if result['lines'] == 0 and is_header(chunk[0][:len(EVALUATION_HEADER)], EVALUATION_HEADERS):
+            result['lines'] += 1
+            chunk = chunk[1:]
+        first_line = result['lines'] + 1
+        result['lines'] += len(chunk)
+
+        values = []
+        for line, row in enumerate(chunk, start=first_line):
+            if not any(cell.strip() for cell in row):
+                continue
+            result['total'] += 1
+            try:
+                values.append(parse_evaluation_row(row, student_ids))
+            except ValidationError as e:
+                result['failed'] += 1
+                if on_error:
+                    on_error(line, row, e.message)
+
+        if values:
+            db.session.execute(insert(table), values)
+            if before_commit:
+                before_commit(values)
+            db.session.commit()
+            result['added'] += len(values)
+
+        if progress:
+            progress(result['lines'])
+
+    return result
@@ -0,0 +1,171 @@
+"""백그라운드 작업 실행기
+
+대용량 CSV 가져오기/내보내기를 요청 스레드 밖에서 실행한다.
+작업 상태(대기/실행/완료/실패), 진행률, 결과 메시지는 Job 테이블에 저장하므로
+상태 확인 요청은 어느 스레드에서든 데이터베이스만 조회하면 된다.
+
+JOB_WORKERS = 0 이면 작업을 제출한 스레드에서 바로 실행한다. (테스트용)
+
+대기열은 메모리에만 있으므로 재시작 전에 대기/실행 중이던 작업은 다시 실행되지 않는다.
+앱 초기화 때 recover_interrupted()로 그런 작업을 실패로 표시하고 남은 업로드 파일을 지운다.
+"""
+import glob
+import logging
+import os
+import queue
+import threading
+import uuid
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# 업로드 파일 이름 (작업이 끝나면 작업 함수가 지운다)
+UPLOAD_PREFIX = 'upload_'
+INTERRUPTED_MESSAGE = '서버가 다시 시작되어 작업이 중단되었습니다. 다시 실행해주세요.'
+
+
+class JobQueueFull(Exception):
+    """작업 대기열이 가득 찬 경우"""
+
+
+class JobProgress:
+    """작업 함수에 전달되는 진행률 보고 객체"""
+
+    def __init__(self, runner, job_id):
+        self.runner = runner
+        self.job_id = job_id
+
+    @property
+    def result_path(self):
+        """작업 결과 파일 경로 (작업 디렉토리 안)"""
+        return os.path.join(self.runner.job_dir, f'{self.job_id}.csv')
+
+    def __call__(self, progress, total=None):
+        self.runner.update(self.job_id, progress=progress, total=total)
+
+
+class JobRunner:
+    """스레드 풀 + 제한된 대기열 기반 작업 실행기"""
+
+    def __init__(self, app=None, db=None, job_model=None):
+        self._queue = None
+        self._threads = []
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, db, job_model)
+
+    def init_app(self, app, db, job_model):
+        self.app = app
+        self.db = db
+        self.job_model = job_model
+        self.workers = app.config.get('JOB_WORKERS', 2)
+        self.job_dir = app.config['JOB_DIR']
+        self._queue = queue.Queue(maxsize=app.config.get('JOB_QUEUE_SIZE', 16))
+        app.extensions['job_runner'] = self
+
+    def ensure_job_dir(self):
+        os.makedirs(self.job_dir, exist_ok=True)
+        return self.job_dir
+
+    def upload_path(self):
+        """작업에 넘길 업로드 파일의 새 경로"""
+        return os.path.join(self.ensure_job_dir(), f'{UPLOAD_PREFIX}{uuid.uuid4().hex}.csv')
+
+    def recover_interrupted(self):
+        """이전 프로세스가 끝내지 못한 작업을 실패로 표시 (반환: 실패로 바꾼 작업 수)
+
+        재시작(SIGHUP 재실행, restore-db, 비정상 종료)으로 메모리 대기열이 사라진 작업은
+        상태 화면이 계속 기다리지 않도록 끝내고, 그 작업들의 업로드 파일을 지운다.
+        이 프로세스가 작업을 받기 전(앱 초기화)에만 호출한다.
+        """
+        job = self.job_model
+        count = self.db.session.query(job).filter(job.status.in_((QUEUED, RUNNING))).update(
+            {'status': FAILED, 'message': INTERRUPTED_MESSAGE, 'finished_at': datetime.utcnow()},
+            synchronize_session=False
+        )
+        self.db.session.commit()
+        removed = 0
+        for path in glob.glob(os.path.join(self.job_dir, f'{UPLOAD_PREFIX}*.csv')):
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError as e:
+                logger.warning('업로드 파일 삭제 실패: %s - %s', path, e)
+        if count or removed:
+            logger.warning('중단된 작업 정리: 작업 %d개 실패 처리, 업로드 파일 %d개 삭제', count, removed)
+        return count
+
+    def submit(self, kind, func, *args, user_id=None, **kwargs):
+        """작업 등록 후 작업 id 반환
+
+        func(progress, *args, **kwargs)는 {'message': ..., 'result_path': ...} 형태의 dict를 반환한다.
+        """
+        self.ensure_job_dir()
+        job = self.job_model(id=uuid.uuid4().hex, kind=kind, status=QUEUED, progress=0, user_id=user_id)
+        self.db.session.add(job)
+        self.db.session.commit()
+        job_id = job.id
+
+        if self.workers <= 0:
+            self._run(job_id, func, args, kwargs)
+            return job_id
+
+        try:
+            self._queue.put_nowait((job_id, func, args, kwargs))
+        except queue.Full:
+            job.status = FAILED
+            job.message = '작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.'
+            job.finished_at = datetime.utcnow()
+            self.db.session.commit()
+            raise JobQueueFull(job.message)
+
+        self._start_workers()
+        logger.info('작업 등록: %s (%s)', kind, job_id)
+        return job_id
+
+    def update(self, job_id, **values):
+        """작업 상태 갱신 (즉시 커밋)"""
+        values = {key: value for key, value in values.items() if value is not None}
+        if values:
+            self.db.session.query(self.job_model).filter_by(id=job_id).update(values)
+            self.db.session.commit()
+
+    def _start_workers(self):
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._worker, name=f'job-worker-{len(self._threads)}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker(self):
+        while True:
+            job_id, func, args, kwargs = self._queue.get()
+            try:
+                with self.app.app_context():
+                    self._run(job_id, func, args, kwargs)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job_id, func, args, kwargs):
+        self.update(job_id, status=RUNNING, started_at=datetime.utcnow())
+        try:
+            outcome = func(JobProgress(self, job_id), *args, **kwargs) or {}
+        except Exception as e:
+            self.db.session.rollback()
+            logger.error('작업 실패: %s - %s', job_id, e)
+            self.update(job_id, status=FAILED, message=str(e), finished_at=datetime.utcnow())
+            return
+        self.update(
+            job_id,
+            status=DONE,
+            message=outcome.get('message'),
+            result_path=outcome.get('result_path'),
+            finished_at=datetime.utcnow()
+        )
+        logger.info('작업 완료: %s', job_id)
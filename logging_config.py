@@ -0,0 +1,162 @@
+"""로깅 설정 (대기열 기반, 회전, JSON 출력, 로거별 레벨)
+
+요청 스레드는 로그 레코드를 메모리 대기열에 넣기만 하고, 별도 스레드(QueueListener)가
+서식을 입히고 파일/콘솔에 쓴다. 디스크가 느려도 요청 처리 시간에 더해지지 않는다.
+- 대기열이 가득 차면(LOG_QUEUE_SIZE) 기다리지 않고 버리고, 버린 수를 세어 나중에 경고로 남긴다.
+- 파일은 크기(LOG_MAX_BYTES) 또는 시각(LOG_ROTATE_WHEN, 예: midnight) 기준으로 회전하며
+  LOG_BACKUP_COUNT개까지 보관한다.
+- LOG_JSON=1이면 한 줄에 JSON 하나로 기록한다. (extra=로 넘긴 값도 함께 기록)
+- LOG_LEVELS="sqlalchemy.engine=INFO,werkzeug=WARNING"처럼 로거별 레벨을 지정한다.
+- 요청 경로의 로그는 logger.info('... %s', value)처럼 인자로 넘긴다. 레벨이 꺼져 있으면
+  문자열을 만들지 않는다.
+
+gunicorn이 fork 하면 기록 스레드는 자식에 복사되지 않으므로 after_fork()로 다시 시작한다.
+프로세스가 끝날 때는 대기열에 남은 로그를 모두 쓴 뒤 핸들러를 직접 연결해
+종료 중에 남기는 로그(last_login 기록 등)도 잃지 않는다.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+from datetime import datetime
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# LogRecord 기본 속성 (이 밖의 속성은 extra=로 넘긴 값)
+RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 한 줄 JSON으로"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).astimezone().isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """대기열이 가득 차면 기다리지 않고 버린다
+
+    버린 수(dropped)는 대기열에 다시 자리가 나면 경고 레코드 하나로 알린다.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.reported = 0
+
+    def prepare(self, record):
+        # 인자(ORM 객체 등)는 요청 스레드에서 문자열로 합쳐 두고,
+        # 시각/서식 입히기와 쓰기는 기록 스레드에 맡긴다.
+        # 같은 레코드를 받는 다른 핸들러가 args/exc_info를 쓸 수 있으므로 복사본을 바꾼다 (QueueHandler와 같음)
+        record = copy.copy(record)
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped != self.reported:
+            dropped, self.reported = self.dropped - self.reported, self.dropped
+            try:
+                self.queue.put_nowait(logging.LogRecord(
+                    __name__, logging.WARNING, __file__, 0,
+                    f'로그 대기열이 가득 차 {dropped}건을 버렸습니다', None, None))
+            except queue.Full:
+                pass
+
+
+class LoggingPipeline:
+    """QueueHandler(요청 스레드) → 대기열 → QueueListener(기록 스레드) → 파일/콘솔"""
+
+    def __init__(self, handlers, queue_size=10000, logger=None):
+        self.handlers = handlers
+        self.logger = logger or logging.getLogger()
+        self.queue_size = queue_size
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        self.listener = None
+
+    def start(self):
+        if self.handler not in self.logger.handlers:
+            self.logger.addHandler(self.handler)
+        self.listener = logging.handlers.QueueListener(self.handler.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def after_fork(self):
+        """fork 된 자식 프로세스에서 새 대기열과 기록 스레드로 다시 시작"""
+        self.handler.queue = queue.Queue(maxsize=self.queue_size)
+        self.start()
+
+    def stop(self):
+        """남은 로그를 모두 쓰고, 이후 로그는 핸들러로 바로 쓴다"""
+        if self.listener is None:
+            return
+        self.listener.stop()
+        self.listener = None
+        self.logger.removeHandler(self.handler)
+        for handler in self.handlers:
+            self.logger.addHandler(handler)
+
+
+def parse_logger_levels(value):
+    """'sqlalchemy.engine=INFO,werkzeug=WARNING' → {'sqlalchemy.engine': 'INFO', ...}"""
+    levels = {}
+    for item in (value or '').split(','):
+        name, sep, level = item.partition('=')
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def file_handler(path, max_bytes=10 * 1024 * 1024, backup_count=5, when=None):
+    """크기 또는 시각 기준 회전 파일 핸들러 (파일은 첫 기록 시 연다)"""
+    if when:
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=when, backupCount=backup_count, encoding='utf-8', delay=True)
+    return logging.handlers.RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+
+
+def configure_logging(level='INFO', log_file=None, max_bytes=10 * 1024 * 1024, backup_count=5, when=None,
+                      json_output=False, logger_levels=None, queue_size=10000, console=True):
+    """루트 로거에 대기열 핸들러를 연결하고 기록 스레드 시작 (반환: LoggingPipeline)"""
+    formatter = JsonFormatter() if json_output else logging.Formatter(TEXT_FORMAT)
+    handlers = []
+    if log_file:
+        handlers.append(file_handler(log_file, max_bytes, backup_count, when))
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    pipeline = LoggingPipeline(handlers, queue_size=queue_size)
+    logging.getLogger().setLevel(level.upper() if isinstance(level, str) else level)
+    for name, logger_level in (logger_levels or {}).items():
+        logging.getLogger(name).setLevel(logger_level)
+    pipeline.start()
+    atexit.register(pipeline.stop)
+    return pipeline
@@ -1,64 +1,87 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, make_response
-from sqlalchemy import or_
+from flask import Flask, render_template, request, redirect, url_for, flash, make_response, Response, stream_with_context, jsonify, send_file, abort, g
+from sqlalchemy import or_, func, case, tuple_, event, update, select, delete
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+import click
 import csv
 import io
+from functools import wraps
 import os
+import zlib
 import sys
 import logging
+import threading
 from flask_wtf import CSRFProtect
+from flask_wtf.csrf import CSRFError
+from jinja2 import FileSystemBytecodeCache
 from werkzeug.security import generate_password_hash, check_password_hash
 # Flask-Limiter 제거 (포터블 버전에서 불필요한 복잡성 제거)
 # from flask_limiter import Limiter
 # from flask_limiter.util import get_remote_address
 
-# 로깅 설정
+# 로깅 설정 (create_app()에서 호출): 요청 스레드는 대기열에 넣기만 하고 기록 스레드가 파일/콘솔에 쓴다
+logging_pipeline = None
+
 def setup_logging():
-    """로깅 설정 초기화"""
-    log_level = getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper())
-    log_file_name = os.environ.get('LOG_FILE', 'management.log')
-    
-    # 로그 파일 경로 설정 (실행 파일과 같은 디렉토리)
-    if getattr(sys, 'frozen', False):
-        # PyInstaller로 빌드된 경우
-        current_dir = os.path.dirname(sys.executable)
-    else:
-        # 일반 Python 실행의 경우
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    log_file = os.path.join(current_dir, log_file_name)
-    
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
+    """로깅 설정 초기화 (이미 설정되어 있으면 그대로 둔다)"""
+    global logging_pipeline
+    if logging_pipeline is not None or logging.getLogger().handlers:
+        return logging_pipeline
+    logging_pipeline = configure_logging(
+        level=app.config['LOG_LEVEL'],
+        log_file=app.config['LOG_FILE'],
+        max_bytes=app.config['LOG_MAX_BYTES'],
+        backup_count=app.config['LOG_BACKUP_COUNT'],
+        when=app.config['LOG_ROTATE_WHEN'] or None,
+        json_output=app.config['LOG_JSON'],
+        logger_levels=parse_logger_levels(app.config['LOG_LEVELS']),
+        queue_size=app.config['LOG_QUEUE_SIZE']
     )
-    return logging.getLogger(__name__)
+    return logging_pipeline
 
-logger = setup_logging()
+logger = logging.getLogger(__name__)
 
 # 설정 가져오기
 from config import config
+from logging_config import configure_logging, parse_logger_levels
+from search_index import register_search_index, rebuild_search_index, ensure_search_index, search_available, match_student_ids, build_match_query, unindex_students
+from csv_import import import_students_csv, import_evaluations_csv, iter_csv_rows
+from jobs import JobRunner, JobQueueFull
+from storage import init_storage, is_memory_database
+from schema import init_migrations, upgrade_database
+from metrics import RequestMetrics
+from auth import UserCache, PasswordHasher, LastLoginRecorder
+from page_cache import DataVersion, PageCache, track_changes
+from validation import ValidationError, parse_evaluation, parse_date
+from analytics import EvaluationAnalytics
+from change_log import register_change_triggers, current_watermark, oldest_available, changed_rows, prune_change_log
+from static_assets import StaticAssets, compress_static, fetch_vendor_assets
+from archive import ArchiveStore, ArchiveError, academic_year, chunks
+from backup import BackupManager, BackupScheduler, BackupError
+from serve import serve
 
-# 템플릿 경로 설정: PyInstaller(onefile) 환경에서도 동작하도록 처리
+# 템플릿/정적 파일 경로 설정: PyInstaller(onefile) 환경에서도 동작하도록 처리
 if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
     base_path = sys._MEIPASS  # PyInstaller 임시 해제 경로
 else:
     base_path = os.path.dirname(os.path.abspath(__file__))
 
-app = Flask(__name__, template_folder=os.path.join(base_path, 'templates'))
+app = Flask(__name__, template_folder=os.path.join(base_path, 'templates'), static_folder=os.path.join(base_path, 'static'))
 
 # 환경 설정 적용
 config_name = os.environ.get('FLASK_ENV', 'default')
 app.config.from_object(config[config_name])
 
 db = SQLAlchemy(app)
+init_storage(app, db)
+# 스키마는 migrations/ 의 Alembic 리비전으로 관리 (flask db upgrade)
+migrate = init_migrations(app, db, os.path.join(base_path, 'migrations'))
+# 요청별 처리 시간/SQL 수 계측 (Server-Timing 헤더, /metrics)
+request_metrics = RequestMetrics(app, db)
 csrf = CSRFProtect(app)
+# 정적 파일: 내용 해시 주소 + 장기 캐시, gzip 변형 (템플릿에서 asset_url())
+static_assets = StaticAssets(app)
 
 # Flask-Login 초기화
 login_manager = LoginManager()
@@ -75,9 +98,13 @@ login_manager.login_message_category = 'warning'
 #     storage_uri=app.config['RATELIMIT_STORAGE_URI'],
 # )
 
+# 인증 부하 줄이기: 사용자 캐시, 비밀번호 해시 전용 스레드
+user_cache = UserCache(ttl=app.config['AUTH_USER_CACHE_TTL'], maxsize=app.config['AUTH_USER_CACHE_SIZE'])
+password_hasher = PasswordHasher(workers=app.config['AUTH_HASH_WORKERS'])
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return user_cache.load(db.session, User, int(user_id))
 
 @app.context_processor
 def inject_csrf_token():
@@ -100,6 +127,11 @@ class User(UserMixin, db.Model):
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
 
+# User 수정/삭제 시 캐시 무효화, last_login은 모아서 기록
+user_cache.watch(User)
+last_login_recorder = LastLoginRecorder(app, db, User, interval=app.config['AUTH_LAST_LOGIN_INTERVAL'],
+                                        user_cache=user_cache)
+
 class Student(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     student_number = db.Column(db.String(20), unique=True, nullable=False)
@@ -107,15 +139,461 @@ class Student(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_modified = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    evaluations = db.relationship('Evaluation', backref='student', lazy=True, cascade='all, delete-orphan')
+    # 학생을 지우면 평가/통계는 DB의 ON DELETE CASCADE가 지운다 (passive_deletes: 읽어 오지 않음)
+    evaluations = db.relationship('Evaluation', backref='student', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
+    stats = db.relationship('StudentStats', uselist=False, lazy=True, cascade='all, delete-orphan', passive_deletes=True)
 
 class Evaluation(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id', ondelete='CASCADE'), nullable=False)
     subject = db.Column(db.String(100), nullable=False)
     score = db.Column(db.Float)
     evaluation_date = db.Column(db.Date)
     notes = db.Column(db.Text)
+    last_modified = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # 인덱스 변경 시 migrations/versions에 리비전을 함께 추가할 것
+    __table_args__ = (
+        db.Index('ix_evaluation_student_id_evaluation_date', 'student_id', 'evaluation_date'),
+        db.Index('ix_evaluation_evaluation_date', 'evaluation_date'),
+        # 평가 분석(analytics.py) 집계용 커버링 인덱스
+        db.Index('ix_evaluation_subject_evaluation_date_score', 'subject', 'evaluation_date', 'score'),
+        db.Index('ix_evaluation_student_id_subject', 'student_id', 'subject', 'evaluation_date', 'score'),
+    )
+
+# 학생 검색 색인(FTS5): 학생 추가/수정/삭제 시 같은 트랜잭션에서 갱신
+register_search_index(db, Student)
+
+class ChangeLog(db.Model):
+    """학생/평가 변경 기록 (change_log.py 트리거가 기록, id가 증분 내보내기 워터마크)"""
+    __tablename__ = 'change_log'
+    __table_args__ = {'sqlite_autoincrement': True}
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.String(10), nullable=False)
+    changed_at = db.Column(db.DateTime, nullable=False, server_default=func.current_timestamp())
+
+register_change_triggers(db.metadata)
+
+class StudentStats(db.Model):
+    """학생별 평가 통계 (평가 추가/수정/삭제와 같은 트랜잭션에서 증분 갱신)"""
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id', ondelete='CASCADE'), primary_key=True)
+    evaluation_count = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Float, nullable=False, default=0)
+    score_min = db.Column(db.Float)
+    score_max = db.Column(db.Float)
+    last_evaluation_date = db.Column(db.Date)
+    subject_counts = db.Column(db.JSON, nullable=False, default=dict)
+
+    @property
+    def average_score(self):
+        if not self.evaluation_count:
+            return 0
+        return self.score_sum / self.evaluation_count
+
+    def add(self, subject, score, evaluation_date):
+        """평가 한 건 반영"""
+        self.add_many([(subject, score, evaluation_date)])
+
+    def add_many(self, evaluations):
+        """평가 여러 건 반영 ((과목, 점수, 평가일) 목록, 각 속성은 한 번씩만 바꾼다)"""
+        scores = [score for _, score, _ in evaluations if score is not None]
+        dates = [evaluation_date for _, _, evaluation_date in evaluations if evaluation_date is not None]
+        self.evaluation_count = (self.evaluation_count or 0) + len(evaluations)
+        if scores:
+            self.score_sum = (self.score_sum or 0) + sum(scores)
+            self.score_min = min(scores) if self.score_min is None else min(self.score_min, *scores)
+            self.score_max = max(scores) if self.score_max is None else max(self.score_max, *scores)
+        if dates and (self.last_evaluation_date is None or max(dates) > self.last_evaluation_date):
+            self.last_evaluation_date = max(dates)
+        counts = dict(self.subject_counts or {})
+        for subject, _, _ in evaluations:
+            counts[subject] = counts.get(subject, 0) + 1
+        self.subject_counts = counts
+
+    def remove(self, subject, score, evaluation_date):
+        """평가 한 건 제거
+
+        최소/최대 점수나 최근 평가일에 해당하는 평가가 빠지면 해당 학생의
+        평가만 다시 집계한다. (호출 전에 삭제/수정이 flush 되어 있어야 함)
+        """
+        self.evaluation_count = max((self.evaluation_count or 0) - 1, 0)
+        if score is not None:
+            self.score_sum = (self.score_sum or 0) - score
+        counts = dict(self.subject_counts or {})
+        if counts.get(subject, 0) > 1:
+            counts[subject] -= 1
+        else:
+            counts.pop(subject, None)
+        self.subject_counts = counts
+
+        if (score is not None and score in (self.score_min, self.score_max)) or \
+                (evaluation_date is not None and evaluation_date == self.last_evaluation_date):
+            self.refresh_extremes()
+
+    def refresh_extremes(self):
+        """최소/최대 점수와 최근 평가일을 Evaluation에서 다시 계산"""
+        self.score_min, self.score_max, self.last_evaluation_date = db.session.query(
+            func.min(Evaluation.score),
+            func.max(Evaluation.score),
+            func.max(Evaluation.evaluation_date)
+        ).filter(Evaluation.student_id == self.student_id).one()
+
+class Job(db.Model):
+    """백그라운드 작업 (대용량 CSV 가져오기/내보내기)"""
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    progress = db.Column(db.Integer, default=0)
+    total = db.Column(db.Integer)
+    message = db.Column(db.Text)
+    result_path = db.Column(db.String(500))
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': self.progress,
+            'total': self.total,
+            'message': self.message,
+            'download_url': url_for('job_download', job_id=self.id) if self.result_path and self.status == 'done' else None,
+        }
+
+job_runner = JobRunner(app, db, Job)
+
+# 읽기 화면 캐시: 학생/평가 데이터가 커밋되면 버전이 바뀌어 캐시와 ETag가 무효화된다
+with app.app_context():
+    _db_url = db.engine.url
+    _version_file = None if _db_url.get_backend_name() != 'sqlite' or is_memory_database(_db_url) \
+        else f'{_db_url.database}.version'
+data_version = DataVersion(_version_file)
+
+# 온라인 백업 (SQLite 파일 DB일 때만): flask backup-db, 예약 백업은 create_app()에서 시작
+backup_manager = None if _version_file is None else BackupManager(
+    _db_url.database,
+    directory=app.config['BACKUP_DIR'],
+    keep=app.config['BACKUP_KEEP'],
+    pages=app.config['BACKUP_STEP_PAGES'],
+    sleep=app.config['BACKUP_STEP_SLEEP_MS'] / 1000,
+    max_restarts=app.config['BACKUP_MAX_RESTARTS']
+)
+backup_scheduler = None
+page_cache = PageCache(
+    data_version,
+    max_entries=app.config['PAGE_CACHE_MAX_ENTRIES'],
+    max_bytes=app.config['PAGE_CACHE_MAX_BYTES'],
+    csrf_time_limit=app.config.get('WTF_CSRF_TIME_LIMIT', 3600),
+    enabled=app.config['PAGE_CACHE_ENABLED']
+)
+track_changes(db.session, ['student', 'evaluation', 'student_stats'], data_version)
+
+# 평가 분석 결과도 같은 데이터 버전으로 캐시
+evaluation_analytics = EvaluationAnalytics(
+    db, Student, Evaluation, data_version,
+    top=app.config['ANALYTICS_TOP_N'],
+    min_evaluations=app.config['ANALYTICS_MIN_EVALUATIONS'],
+    cohort_digits=app.config['ANALYTICS_COHORT_DIGITS'],
+    trend_months=app.config['ANALYTICS_TREND_MONTHS'],
+    cache_size=app.config['ANALYTICS_CACHE_SIZE']
+)
+
+# 지난 학년도 보관 파일 (필요할 때만 ATTACH 해서 조회)
+archive_store = ArchiveStore(
+    db, Student, Evaluation, StudentStats, ChangeLog,
+    directory=app.config['ARCHIVE_DIR'],
+    start_month=app.config['ACADEMIC_YEAR_START_MONTH']
+)
+
+@event.listens_for(db.session, 'after_flush')
+def touch_student_last_modified(session, flush_context):
+    """평가가 추가/수정/삭제되면 학생의 최근 수정일(Last-Modified)도 갱신"""
+    student_ids = {
+        obj.student_id
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+        if isinstance(obj, Evaluation) and (obj not in session.dirty or session.is_modified(obj))
+    }
+    if student_ids:
+        session.connection().execute(
+            update(Student.__table__)
+            .where(Student.__table__.c.id.in_(student_ids))
+            .values(last_modified=datetime.utcnow())
+        )
+
+def get_student_stats(student_id):
+    """학생 통계 레코드 조회 (없으면 생성하여 세션에 추가)"""
+    stats = db.session.get(StudentStats, student_id)
+    if stats is None:
+        stats = StudentStats(student_id=student_id, evaluation_count=0, score_sum=0, subject_counts={})
+        db.session.add(stats)
+    return stats
+
+def add_to_student_stats(rows):
+    """새 평가 (학생 id, 평가 값) 목록을 학생 통계에 반영 (관련 통계를 한 번에 읽고, 없는 학생은 새로 만든다)
+
+    평가를 flush 해서 쓰기 잠금을 잡은 뒤에 호출한다. (통계를 읽고 커밋할 때까지 다른 저장이 끼어들지 않는다)
+    반환값: 관련 학생 id 집합
+    """
+    by_student = {}
+    for student_id, values in rows:
+        by_student.setdefault(student_id, []).append((values['subject'], values['score'], values['evaluation_date']))
+    stats_by_student = {}
+    for ids in chunks(by_student):
+        stats_by_student.update(
+            (stats.student_id, stats) for stats in StudentStats.query.filter(StudentStats.student_id.in_(ids))
+        )
+    for student_id, evaluations in by_student.items():
+        stats = stats_by_student.get(student_id)
+        if stats is None:
+            stats = StudentStats(student_id=student_id, evaluation_count=0, score_sum=0, subject_counts={})
+            db.session.add(stats)
+        stats.add_many(evaluations)
+    return set(by_student)
+
+def rebuild_student_stats():
+    """Evaluation 테이블로부터 전체 학생 통계를 다시 계산"""
+    StudentStats.query.delete()
+
+    subject_counts = {}
+    subject_rows = db.session.query(
+        Evaluation.student_id, Evaluation.subject, func.count(Evaluation.id)
+    ).group_by(Evaluation.student_id, Evaluation.subject)
+    for student_id, subject, count in subject_rows:
+        subject_counts.setdefault(student_id, {})[subject] = count
+
+    rows = db.session.query(
+        Evaluation.student_id,
+        func.count(Evaluation.id),
+        func.coalesce(func.sum(Evaluation.score), 0),
+        func.min(Evaluation.score),
+        func.max(Evaluation.score),
+        func.max(Evaluation.evaluation_date)
+    ).group_by(Evaluation.student_id).all()
+    db.session.bulk_insert_mappings(StudentStats, [
+        {
+            'student_id': student_id,
+            'evaluation_count': count,
+            'score_sum': score_sum,
+            'score_min': score_min,
+            'score_max': score_max,
+            'last_evaluation_date': last_date,
+            'subject_counts': subject_counts.get(student_id, {}),
+        }
+        for student_id, count, score_sum, score_min, score_max, last_date in rows
+    ])
+    db.session.commit()
+    return len(rows)
+
+# 학번 접두사 범위 조회의 상한 (접두사 + 가장 큰 코드 포인트, LIKE 대신 학번 인덱스 범위 검색)
+PREFIX_END = '\U0010ffff'
+
+def read_student_numbers(stream):
+    """학번 목록 CSV의 첫 번째 열 (헤더 '학번'/'student_number'와 빈 줄은 건너뜀, 중복 제거)"""
+    numbers = {}
+    for row in iter_csv_rows(stream):
+        value = row[0].strip() if row else ''
+        if value and value.lower() not in ('학번', 'student_number'):
+            numbers[value] = None
+    return list(numbers)
+
+def select_student_ids(student_ids=(), prefix=None, student_numbers=()):
+    """일괄 삭제 대상 학생 id (선택한 id, 학번 접두사, 학번 목록 중 하나라도 해당하면 포함)"""
+    found = set()
+    for ids in chunks(student_ids):
+        found.update(db.session.scalars(select(Student.id).where(Student.id.in_(ids))))
+    if prefix:
+        found.update(db.session.scalars(select(Student.id).where(
+            Student.student_number >= prefix, Student.student_number < prefix + PREFIX_END
+        )))
+    for numbers in chunks(student_numbers):
+        found.update(db.session.scalars(select(Student.id).where(Student.student_number.in_(numbers))))
+    return sorted(found)
+
+def count_evaluations(student_ids):
+    """학생들의 평가 수 (ix_evaluation_student_id_evaluation_date 인덱스로 집계)"""
+    return sum(
+        db.session.scalar(select(func.count(Evaluation.id)).where(Evaluation.student_id.in_(ids)))
+        for ids in chunks(student_ids)
+    )
+
+def delete_students(student_ids):
+    """학생 일괄 삭제 (한 트랜잭션, 반환: (삭제한 학생 수, 함께 삭제된 평가 수))
+
+    학생만 id 묶음 단위 DELETE로 지우고 평가/통계는 외래 키의 ON DELETE CASCADE가 지운다.
+    ORM으로 평가를 읽어 한 건씩 지우지 않는다. 변경 기록(change_log)은 트리거가 CASCADE 삭제도 기록한다.
+    """
+    if not student_ids:
+        return 0, 0
+    student = Student.__table__
+    deleted_evaluations = count_evaluations(student_ids)
+    deleted_students = 0
+    for ids in chunks(student_ids):
+        deleted_students += db.session.execute(delete(student).where(student.c.id.in_(ids))).rowcount
+    unindex_students(db.session.connection(), student_ids)
+    db.session.commit()
+    logger.info('학생 일괄 삭제: 학생 %d명, 평가 %d건', deleted_students, deleted_evaluations)
+    return deleted_students, deleted_evaluations
+
+def prepare_cli():
+    """CLI 명령 공통 준비: 로깅 설정, 스키마 업그레이드"""
+    setup_logging()
+    upgrade_database(db)
+
+@app.cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """학생별 평가 통계 재계산"""
+    prepare_cli()
+    count = rebuild_student_stats()
+    logger.info('학생 통계 재계산 완료: %d명', count)
+    print(f'학생 통계 재계산 완료: {count}명')
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """학생 검색 색인 재구성"""
+    prepare_cli()
+    count = rebuild_search_index(db.session.connection(), Student.__table__)
+    db.session.commit()
+    logger.info('학생 검색 색인 재구성 완료: %d명', count)
+    print(f'학생 검색 색인 재구성 완료: {count}명')
+
+@app.cli.command('prune-change-log')
+@click.option('--days', type=int, default=None, help='보관 기간(일), 기본 CHANGE_LOG_RETENTION_DAYS')
+def prune_change_log_command(days):
+    """보관 기간이 지난 변경 기록 삭제"""
+    prepare_cli()
+    days = app.config['CHANGE_LOG_RETENTION_DAYS'] if days is None else days
+    count = prune_change_log(db.session.connection(), ChangeLog.__table__, datetime.utcnow() - timedelta(days=days))
+    db.session.commit()
+    logger.info('변경 기록 정리 완료: %d건 (%d일 이전)', count, days)
+    print(f'변경 기록 정리 완료: {count}건 ({days}일 이전)')
+
+@app.cli.command('delete-students')
+@click.option('--prefix', help='이 학번으로 시작하는 학생 (예: 2019)')
+@click.option('--csv', 'csv_path', type=click.Path(exists=True, dir_okay=False), help='학번 목록 CSV (첫 번째 열)')
+@click.option('--yes', is_flag=True, help='확인 없이 진행')
+def delete_students_command(prefix, csv_path, yes):
+    """학생과 평가를 한 번에 삭제 (졸업생 정리 등)"""
+    if not prefix and not csv_path:
+        raise click.UsageError('--prefix 또는 --csv를 지정하세요.')
+    prepare_cli()
+    student_numbers = []
+    if csv_path:
+        with open(csv_path, 'rb') as f:
+            student_numbers = read_student_numbers(f)
+    student_ids = select_student_ids(prefix=prefix, student_numbers=student_numbers)
+    if not student_ids:
+        raise click.ClickException('삭제할 학생이 없습니다.')
+    if not yes:
+        click.confirm(f'학생 {len(student_ids)}명과 평가 {count_evaluations(student_ids)}건을 삭제합니다. 계속할까요?', abort=True)
+    students, evaluations = delete_students(student_ids)
+    print(f'학생 일괄 삭제 완료: 학생 {students}명, 평가 {evaluations}건')
+
+@app.cli.command('archive-year')
+@click.argument('year', type=int)
+@click.option('--move-students', is_flag=True,
+              help='평가를 보관한 뒤 운영 DB에 평가가 하나도 남지 않은 학생(졸업/전출)도 옮기기')
+@click.option('--vacuum', is_flag=True, help='옮긴 뒤 VACUUM으로 운영 DB 파일 크기 줄이기')
+def archive_year_command(year, move_students, vacuum):
+    """지난 학년도의 평가를 보관 파일로 옮기기 (--move-students: 떠난 학생도 함께)"""
+    prepare_cli()
+    try:
+        result = archive_store.archive_year(year, move_students=move_students)
+    except ArchiveError as e:
+        raise click.ClickException(str(e))
+    rebuild_student_stats()
+    data_version.bump()
+    if vacuum:
+        with db.engine.connect() as connection:
+            connection.exec_driver_sql('VACUUM')
+    print(f"{year}학년도 보관 완료: 평가 {result['evaluations']}건, 학생 {result['students']}명 -> {archive_store.path(year)}")
+
+@app.cli.command('restore-year')
+@click.argument('year', type=int)
+def restore_year_command(year):
+    """보관 파일의 학년도를 운영 DB로 되돌리기"""
+    prepare_cli()
+    try:
+        result = archive_store.restore_year(year)
+    except ArchiveError as e:
+        raise click.ClickException(str(e))
+    rebuild_student_stats()
+    data_version.bump()
+    print(f"{year}학년도 되돌리기 완료: 평가 {result['evaluations']}건, 학생 {result['students']}명")
+
+@app.cli.command('list-archives')
+def list_archives_command():
+    """보관된 학년도 목록"""
+    prepare_cli()
+    for year in archive_store.years():
+        info = archive_store.info(year)
+        print(f"{year}학년도 ({info['start']} ~ {info['end']}): 평가 {info['evaluations']}건, "
+              f"학생 {info['students']}명, {info['size'] // 1024}KB, 보관 {info['archived_at']}")
+
+def require_backup_manager():
+    if backup_manager is None:
+        raise click.ClickException('SQLite 파일 데이터베이스만 백업할 수 있습니다.')
+    return backup_manager
+
+@app.cli.command('backup-db')
+def backup_db_command():
+    """실행 중에도 안전한 온라인 백업 (BACKUP_DIR, 최근 BACKUP_KEEP개 보관)"""
+    setup_logging()
+    try:
+        path = require_backup_manager().backup()
+    except BackupError as e:
+        raise click.ClickException(str(e))
+    print(f'백업 완료: {path}')
+
+@app.cli.command('list-backups')
+def list_backups_command():
+    """보관 중인 백업 목록 (최근 순)"""
+    for path in require_backup_manager().backups():
+        modified = datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y-%m-%d %H:%M:%S')
+        print(f'{os.path.basename(path)}  {os.path.getsize(path) // 1024}KB  {modified}')
+
+@app.cli.command('restore-db')
+@click.argument('name')
+@click.option('--yes', is_flag=True, help='확인 없이 진행')
+def restore_db_command(name, yes):
+    """백업 파일로 되돌리기 (NAME: 백업 파일 이름/경로 또는 latest)
+
+    백업 파일의 무결성을 검사하고, 현재 DB를 먼저 백업한 뒤 덮어쓴다.
+    """
+    setup_logging()
+    manager = require_backup_manager()
+    try:
+        path = manager.resolve(name)
+        if not yes:
+            click.confirm(f'{path}의 내용으로 {manager.database_path}를 덮어씁니다. 계속할까요?', abort=True)
+        restored, before = manager.restore(path)
+    except BackupError as e:
+        raise click.ClickException(str(e))
+    # 백업 시점의 스키마가 예전 리비전이면 최신으로 업그레이드
+    db.engine.dispose()
+    upgrade_database(db)
+    data_version.bump()
+    print(f'되돌리기 완료: {restored}')
+    if before:
+        print(f'덮어쓰기 전 상태: {before}')
+
+@app.cli.command('fetch-static-vendor')
+@click.option('--force', is_flag=True, help='이미 있는 파일도 다시 내려받기')
+def fetch_static_vendor_command(force):
+    """Bootstrap/Bootstrap Icons를 static/vendor에 내려받기 (빌드 전 한 번, 인터넷 필요)"""
+    setup_logging()
+    count = fetch_vendor_assets(app.static_folder, force=force)
+    print(f'정적 파일 내려받기 완료: {count}개')
+
+@app.cli.command('compress-static')
+def compress_static_command():
+    """정적 파일의 gzip 변형(.gz) 생성 (빌드 전에 실행)"""
+    count = compress_static(app.static_folder)
+    print(f'정적 파일 압축 완료: {count}개')
 
 @app.template_filter('format_date')
 def format_date_filter(value, format='%Y-%m-%d'):
@@ -137,10 +615,9 @@ def login():
             return render_template('login.html')
         
         user = User.query.filter_by(username=username).first()
-        if user and user.check_password(password):
+        if user and password_hasher.check(user.password_hash, password):
             login_user(user, remember=True)
-            user.last_login = datetime.utcnow()
-            db.session.commit()
+            last_login_recorder.record(user.id)
             
             next_page = request.args.get('next')
             if not next_page or not next_page.startswith('/'):
@@ -186,8 +663,7 @@ def register():
             flash('이미 존재하는 이메일입니다.', 'error')
             return render_template('register.html')
         
-        user = User(username=username, email=email)
-        user.set_password(password)
+        user = User(username=username, email=email, password_hash=password_hasher.generate(password))
         db.session.add(user)
         db.session.commit()
         
@@ -196,21 +672,167 @@ def register():
     
     return render_template('register.html')
 
+def student_search_filter(query):
+    """학생 검색 조건
+
+    FTS5 검색 색인이 있으면 자모/초성 접두사 검색(ㅎㄱㄷ -> 홍길동)을 사용하고,
+    없으면 학번 또는 이름 부분 일치(LIKE)로 대체한다.
+    """
+    if build_match_query(query) and search_available(db.session.connection()):
+        return Student.id.in_(match_student_ids(query))
+    like = f"%{query}%"
+    return or_(
+        Student.student_number.like(like),
+        Student.name.like(like)
+    )
+
+def student_list_stats(search_filter=None):
+    """학생 목록 통계를 단일 집계 쿼리로 계산
+
+    평가 행을 읽지 않고 학생별 통계 레코드(StudentStats)만 합산한다.
+    """
+    evaluation_count = func.coalesce(StudentStats.evaluation_count, 0)
+    stats_query = db.session.query(
+        func.count(Student.id),
+        func.coalesce(func.sum(case((evaluation_count > 0, 1), else_=0)), 0),
+        func.coalesce(func.sum(evaluation_count), 0),
+        func.coalesce(func.max(evaluation_count), 0)
+    ).select_from(Student).outerjoin(StudentStats, StudentStats.student_id == Student.id)
+    if search_filter is not None:
+        stats_query = stats_query.filter(search_filter)
+
+    total_students, evaluated_students, total_evaluations, max_evaluations = stats_query.one()
+    return {
+        'total_students': total_students,
+        'evaluated_students': evaluated_students,
+        'total_evaluations': total_evaluations,
+        'max_evaluations': max_evaluations,
+    }
+
+def student_page(search_filter=None, after=None, before=None, per_page=50):
+    """학번 기준 키셋(커서) 페이지네이션
+
+    한 페이지의 학생과 학생별 평가 수를 한 번의 쿼리로 가져온다.
+    반환값: (학생 목록, 학생별 평가 수 dict, 이전 커서, 다음 커서)
+    """
+    page_query = db.session.query(
+        Student, func.coalesce(StudentStats.evaluation_count, 0)
+    ).outerjoin(StudentStats, StudentStats.student_id == Student.id)
+    if search_filter is not None:
+        page_query = page_query.filter(search_filter)
+
+    if before:
+        # 이전 페이지: 역순으로 가져온 뒤 다시 뒤집는다
+        rows = page_query.filter(Student.student_number < before) \
+            .order_by(Student.student_number.desc()).limit(per_page + 1).all()
+        has_more_before = len(rows) > per_page
+        rows = list(reversed(rows[:per_page]))
+        has_more_after = True
+    else:
+        if after:
+            page_query = page_query.filter(Student.student_number > after)
+        rows = page_query.order_by(Student.student_number).limit(per_page + 1).all()
+        has_more_after = len(rows) > per_page
+        rows = rows[:per_page]
+        has_more_before = bool(after)
+
+    students = [student for student, _ in rows]
+    evaluation_counts = {student.id: count for student, count in rows}
+    prev_cursor = students[0].student_number if students and has_more_before else None
+    next_cursor = students[-1].student_number if students and has_more_after else None
+    return students, evaluation_counts, prev_cursor, next_cursor
+
+def format_history_cursor(evaluation):
+    """평가 기록 커서: '평가일_평가 id'"""
+    return f'{evaluation.evaluation_date.isoformat()}_{evaluation.id}'
+
+def parse_history_cursor(value):
+    """'YYYY-MM-DD_<평가 id>' → (평가일, 평가 id), 형식이 틀리면 None"""
+    if not value:
+        return None
+    evaluation_date, _, evaluation_id = value.partition('_')
+    try:
+        return parse_date(evaluation_date), int(evaluation_id)
+    except (ValidationError, ValueError):
+        return None
+
+def evaluation_history_page(student_id, subject=None, start=None, end=None, after=None, before=None, per_page=20):
+    """학생 평가 기록의 (평가일, id) 역순 키셋 페이지네이션
+
+    ix_evaluation_student_id_evaluation_date(과목으로 거르면 ix_evaluation_student_id_subject) 인덱스를
+    순서대로 읽으므로 평가가 많은 학생도 한 페이지 분량만 읽는다.
+    (평가일은 입력 경로 모두에서 필수 값이라 커서에 그대로 쓴다)
+    반환값: (평가 목록, 이전 커서, 다음 커서)
+    """
+    history_query = Evaluation.query.filter(Evaluation.student_id == student_id)
+    if subject:
+        history_query = history_query.filter(Evaluation.subject == subject)
+    if start:
+        history_query = history_query.filter(Evaluation.evaluation_date >= start)
+    if end:
+        history_query = history_query.filter(Evaluation.evaluation_date <= end)
+
+    position = tuple_(Evaluation.evaluation_date, Evaluation.id)
+    if before:
+        # 이전 페이지: 정순으로 가져온 뒤 다시 뒤집는다
+        rows = history_query.filter(position > before) \
+            .order_by(Evaluation.evaluation_date, Evaluation.id).limit(per_page + 1).all()
+        has_more_before = len(rows) > per_page
+        rows = list(reversed(rows[:per_page]))
+        has_more_after = True
+    else:
+        if after:
+            history_query = history_query.filter(position < after)
+        rows = history_query.order_by(Evaluation.evaluation_date.desc(), Evaluation.id.desc()) \
+            .limit(per_page + 1).all()
+        has_more_after = len(rows) > per_page
+        rows = rows[:per_page]
+        has_more_before = bool(after)
+
+    prev_cursor = format_history_cursor(rows[0]) if rows and has_more_before else None
+    next_cursor = format_history_cursor(rows[-1]) if rows and has_more_after else None
+    return rows, prev_cursor, next_cursor
+
+def recent_evaluations(student_id, limit=5):
+    """최근 평가 limit건 (평가일 역순)"""
+    return Evaluation.query.filter(Evaluation.student_id == student_id) \
+        .order_by(Evaluation.evaluation_date.desc(), Evaluation.id.desc()).limit(limit).all()
+
+def subject_summary(student_id):
+    """과목별 평가 수/평균 점수/최근 평가일 (ix_evaluation_student_id_subject 커버링 인덱스로 집계)"""
+    return db.session.query(
+        Evaluation.subject.label('subject'),
+        func.count(Evaluation.id).label('count'),
+        func.avg(Evaluation.score).label('average'),
+        func.max(Evaluation.evaluation_date).label('last_date')
+    ).filter(Evaluation.student_id == student_id) \
+        .group_by(Evaluation.subject).order_by(Evaluation.subject).all()
+
 @app.route('/')
 @login_required
+@page_cache.cached
 def index():
     query = request.args.get('q', '').strip()
-    students_query = Student.query
-    if query:
-        like = f"%{query}%"
-        students_query = students_query.filter(
-            or_(
-                Student.student_number.like(like),
-                Student.name.like(like)
-            )
-        )
-    students = students_query.order_by(Student.student_number).all()
-    return render_template('index.html', students=students, q=query)
+    after = request.args.get('after', '').strip() or None
+    before = request.args.get('before', '').strip() or None
+    search_filter = student_search_filter(query) if query else None
+
+    students, evaluation_counts, prev_cursor, next_cursor = student_page(
+        search_filter,
+        after=after,
+        before=before,
+        per_page=app.config['STUDENTS_PER_PAGE']
+    )
+    stats = student_list_stats(search_filter)
+    return render_template(
+        'index.html',
+        students=students,
+        evaluation_counts=evaluation_counts,
+        stats=stats,
+        prev_cursor=prev_cursor,
+        next_cursor=next_cursor,
+        q=query
+    )
 
 @app.route('/student/new', methods=['GET', 'POST'])
 @login_required
@@ -219,7 +841,7 @@ def add_student():
         student_number = request.form.get('student_number')
         name = request.form.get('name')
         
-        logger.info(f'학생 추가 시도: {student_number} - {name}')
+        logger.info('학생 추가 시도: %s - %s', student_number, name)
         
         if not student_number or not name:
             logger.warning('학생 추가 실패: 필수 필드 누락')
@@ -228,23 +850,47 @@ def add_student():
             
         existing_student = Student.query.filter_by(student_number=student_number).first()
         if existing_student:
-            logger.warning(f'학생 추가 실패: 중복 학번 {student_number}')
+            logger.warning('학생 추가 실패: 중복 학번 %s', student_number)
             flash('이미 존재하는 학번입니다.', 'error')
             return redirect(url_for('add_student'))
 
         new_student = Student(student_number=student_number, name=name)
         db.session.add(new_student)
         db.session.commit()
-        logger.info(f'학생 추가 성공: {student_number} - {name}')
+        logger.info('학생 추가 성공: %s - %s', student_number, name)
         flash('학생이 성공적으로 추가되었습니다.', 'success')
         return redirect(url_for('index'))
     return render_template('add_student.html')
 
 @app.route('/student/<int:student_id>')
 @login_required
+@page_cache.cached
 def view_student(student_id):
     student = Student.query.get_or_404(student_id)
-    return render_template('view_student.html', student=student)
+    g.last_modified = student.last_modified
+    subject = request.args.get('subject', '').strip() or None
+    start, end, error = request_date_range()
+    evaluations, prev_cursor, next_cursor = evaluation_history_page(
+        student.id,
+        subject=subject,
+        start=start,
+        end=end,
+        after=parse_history_cursor(request.args.get('after')),
+        before=parse_history_cursor(request.args.get('before')),
+        per_page=app.config['EVALUATIONS_PER_PAGE']
+    )
+    return render_template(
+        'view_student.html',
+        student=student,
+        stats=student.stats,
+        evaluations=evaluations,
+        recent=recent_evaluations(student.id),
+        subjects=subject_summary(student.id),
+        prev_cursor=prev_cursor,
+        next_cursor=next_cursor,
+        filters={'subject': subject, 'start': start, 'end': end},
+        error=error
+    )
 
 @app.route('/student/<int:student_id>/edit', methods=['GET', 'POST'])
 @login_required
@@ -279,54 +925,80 @@ def edit_student(student_id):
 @login_required
 def delete_student(student_id):
     student = Student.query.get_or_404(student_id)
+    # 평가와 학생 통계(StudentStats)는 ON DELETE CASCADE로 같은 문장에서 함께 삭제된다
     db.session.delete(student)
     db.session.commit()
     flash('학생이 성공적으로 삭제되었습니다.', 'success')
     return redirect(url_for('index'))
 
+@app.route('/students/bulk-delete', methods=['GET', 'POST'])
+@login_required
+def bulk_delete_students():
+    """학생 일괄 삭제: 목록에서 선택, 학번 접두사, 학번 목록 CSV → 확인 화면 → 삭제"""
+    if request.method == 'GET':
+        return render_template('bulk_delete_students.html', preview=None)
+
+    if request.form.get('confirm') == '1':
+        # 확인 화면에서 보여 준 학생만 삭제 (그 사이 추가된 학생은 제외)
+        targets = [int(value) for value in request.form.get('targets', '').split() if value.isdigit()]
+        student_ids = select_student_ids(targets)
+        if not student_ids:
+            # 확인 화면을 두 번 제출했거나 그 사이 다른 사람이 지운 경우
+            flash('삭제할 학생이 없습니다. (이미 삭제되었을 수 있습니다)', 'info')
+            return redirect(url_for('index'))
+        students, evaluations = delete_students(student_ids)
+        flash(f'학생 {students}명과 평가 {evaluations}건을 삭제했습니다.', 'success')
+        return redirect(url_for('index'))
+
+    prefix = request.form.get('prefix', '').strip() or None
+    selected_ids = request.form.getlist('student_id', type=int)
+    file = request.files.get('file')
+    if file and file.filename:
+        student_numbers = read_student_numbers(file.stream)
+    else:
+        student_numbers = [value for value in request.form.get('student_numbers', '').split() if value]
+    if not prefix and not selected_ids and not student_numbers:
+        flash('삭제할 학생을 선택하거나 학번 접두사/학번 목록 CSV를 입력해주세요.', 'error')
+        return redirect(url_for('bulk_delete_students'))
+
+    student_ids = select_student_ids(selected_ids, prefix, student_numbers)
+    if not student_ids:
+        flash('조건에 맞는 학생이 없습니다.', 'error')
+        return redirect(url_for('bulk_delete_students'))
+
+    found_numbers = set()
+    for numbers in chunks(student_numbers):
+        found_numbers.update(db.session.scalars(
+            select(Student.student_number).where(Student.student_number.in_(numbers))
+        ))
+    return render_template('bulk_delete_students.html', preview={
+        'students': len(student_ids),
+        'evaluations': count_evaluations(student_ids),
+        'sample': Student.query.filter(Student.id.in_(student_ids[:20])).order_by(Student.student_number).all(),
+        'missing': [number for number in student_numbers if number not in found_numbers],
+        'prefix': prefix,
+        'targets': ' '.join(map(str, student_ids)),
+    })
+
 @app.route('/student/<int:student_id>/evaluation/new', methods=['GET', 'POST'])
 @login_required
 def add_evaluation(student_id):
     student = Student.query.get_or_404(student_id)
     if request.method == 'POST':
-        subject = request.form.get('subject')
-        score = request.form.get('score')
-        evaluation_date_str = request.form.get('evaluation_date')
-        notes = request.form.get('notes')
-
-        if not subject or not evaluation_date_str:
-            flash('과목과 평가일을 입력해주세요.', 'error')
-            return render_template('add_evaluation.html', student=student, today=date.today())
-
-        # 점수가 선택되지 않은 경우 0점으로 처리
-        if not score:
-            score = 0
-        else:
-            try:
-                score = int(score)
-            except ValueError:
-                flash('점수 형식이 올바르지 않습니다.', 'error')
-                return render_template('add_evaluation.html', student=student, today=date.today())
-
         try:
-            evaluation_date = datetime.strptime(evaluation_date_str, '%Y-%m-%d').date()
-        except ValueError:
-            flash('날짜 형식이 올바르지 않습니다.', 'error')
-            return render_template('add_evaluation.html', student=student, today=date.today())
-
-        # 점수 범위 검증 (-5 ~ +5)
-        if score < -5 or score > 5:
-            flash('점수는 -5에서 5 사이여야 합니다.', 'error')
+            values = parse_evaluation(
+                request.form.get('subject'),
+                request.form.get('score'),
+                request.form.get('evaluation_date'),
+                request.form.get('notes')
+            )
+        except ValidationError as e:
+            flash(e.message, 'error')
             return render_template('add_evaluation.html', student=student, today=date.today())
 
-        new_evaluation = Evaluation(
-            subject=subject,
-            score=score,
-            evaluation_date=evaluation_date,
-            notes=notes,
-            student_id=student_id
-        )
+        new_evaluation = Evaluation(student_id=student_id, **values)
         db.session.add(new_evaluation)
+        get_student_stats(student_id).add(values['subject'], values['score'], values['evaluation_date'])
         db.session.commit()
         flash('평가가 성공적으로 추가되었습니다.', 'success')
         return redirect(url_for('view_student', student_id=student_id))
@@ -339,42 +1011,27 @@ def edit_evaluation(evaluation_id):
     student = evaluation.student
     
     if request.method == 'POST':
-        subject = request.form.get('subject')
-        score = request.form.get('score')
-        evaluation_date_str = request.form.get('evaluation_date')
-        notes = request.form.get('notes')
-
-        if not subject or not evaluation_date_str:
-            flash('과목과 평가일을 입력해주세요.', 'error')
-            return render_template('edit_evaluation.html', evaluation=evaluation, student=student, today=date.today())
-
-        # 점수가 선택되지 않은 경우 0점으로 처리
-        if not score:
-            score = 0
-        else:
-            try:
-                score = int(score)
-            except ValueError:
-                flash('점수 형식이 올바르지 않습니다.', 'error')
-                return render_template('edit_evaluation.html', evaluation=evaluation, student=student, today=date.today())
-
         try:
-            evaluation_date = datetime.strptime(evaluation_date_str, '%Y-%m-%d').date()
-        except ValueError:
-            flash('날짜 형식이 올바르지 않습니다.', 'error')
+            values = parse_evaluation(
+                request.form.get('subject'),
+                request.form.get('score'),
+                request.form.get('evaluation_date'),
+                request.form.get('notes')
+            )
+        except ValidationError as e:
+            flash(e.message, 'error')
             return render_template('edit_evaluation.html', evaluation=evaluation, student=student, today=date.today())
 
-        # 점수 범위 검증 (-5 ~ +5)
-        if score < -5 or score > 5:
-            flash('점수는 -5에서 5 사이여야 합니다.', 'error')
-            return render_template('edit_evaluation.html', evaluation=evaluation, student=student, today=date.today())
+        old_values = (evaluation.subject, evaluation.score, evaluation.evaluation_date)
 
         # 평가 정보 업데이트
-        evaluation.subject = subject
-        evaluation.score = score
-        evaluation.evaluation_date = evaluation_date
-        evaluation.notes = notes
+        for key, value in values.items():
+            setattr(evaluation, key, value)
+        db.session.flush()
 
+        stats = get_student_stats(student.id)
+        stats.remove(*old_values)
+        stats.add(values['subject'], values['score'], values['evaluation_date'])
         db.session.commit()
         flash('평가가 성공적으로 수정되었습니다.', 'success')
         return redirect(url_for('view_student', student_id=student.id))
@@ -387,10 +1044,64 @@ def delete_evaluation(evaluation_id):
     evaluation = Evaluation.query.get_or_404(evaluation_id)
     student_id = evaluation.student_id
     db.session.delete(evaluation)
+    db.session.flush()
+    get_student_stats(student_id).remove(evaluation.subject, evaluation.score, evaluation.evaluation_date)
     db.session.commit()
     flash('평가가 성공적으로 삭제되었습니다.', 'success')
     return redirect(url_for('view_student', student_id=student_id))
 
+def request_date_range():
+    """기간 쿼리 파라미터 start, end → (시작일, 종료일, 오류 메시지)"""
+    try:
+        start = parse_date(request.args['start']) if request.args.get('start') else None
+        end = parse_date(request.args['end']) if request.args.get('end') else None
+    except ValidationError as e:
+        return None, None, e.message
+    if start and end and start > end:
+        return None, None, '시작일이 종료일보다 늦습니다.'
+    return start, end, None
+
+@app.route('/analytics')
+@login_required
+@page_cache.cached
+def analytics():
+    start, end, error = request_date_range()
+    return render_template('analytics.html', report=evaluation_analytics.report(start, end), error=error)
+
+# 지난 학년도 보관 파일 조회 (요청마다 전용 연결에 ATTACH)
+@app.route('/archives')
+@login_required
+def archives():
+    return render_template(
+        'archives.html',
+        archives=[archive_store.info(year) for year in archive_store.years()],
+        current_year=academic_year(date.today(), app.config['ACADEMIC_YEAR_START_MONTH'])
+    )
+
+@app.route('/archives/<int:year>')
+@login_required
+def view_archive(year):
+    if not archive_store.exists(year):
+        abort(404)
+    query = request.args.get('q', '').strip()
+    after = request.args.get('after', '').strip() or None
+    students, next_cursor = archive_store.students(year, query=query, after=after,
+                                                   limit=app.config['STUDENTS_PER_PAGE'])
+    return render_template('archive_students.html', info=archive_store.info(year), students=students,
+                           next_cursor=next_cursor, q=query, after=after)
+
+@app.route('/archives/<int:year>/students/<student_number>')
+@login_required
+def view_archived_student(year, student_number):
+    if not archive_store.exists(year):
+        abort(404)
+    student, evaluations = archive_store.student_evaluations(year, student_number)
+    if student is None:
+        abort(404)
+    live_student = Student.query.filter_by(student_number=student_number).first()
+    return render_template('archive_student.html', year=year, student=student, evaluations=evaluations,
+                           live_student=live_student)
+
 # 학생 CSV 일괄 등록
 @app.route('/students/import', methods=['GET', 'POST'])
 @login_required
@@ -401,118 +1112,595 @@ def import_students():
             flash('CSV 파일을 선택해주세요.', 'error')
             return redirect(url_for('import_students'))
 
-        try:
-            content = file.read().decode('utf-8-sig')
-            reader = csv.reader(io.StringIO(content))
+        # 큰 파일은 백그라운드 작업으로 처리하고 진행 상황 페이지로 이동
+        if (request.content_length or 0) > app.config['JOB_IMPORT_THRESHOLD']:
+            upload_path = job_runner.upload_path()
+            file.save(upload_path)
+            try:
+                job_id = job_runner.submit('import_students', run_student_import_job, upload_path, user_id=current_user.id)
+            except JobQueueFull as e:
+                os.remove(upload_path)
+                flash(str(e), 'error')
+                return redirect(url_for('import_students'))
+            return redirect(url_for('job_status', job_id=job_id))
 
-            rows = list(reader)
-            if not rows:
+        try:
+            result = import_students_csv(
+                db, Student,
+                iter_csv_rows(file.stream),
+                chunk_size=app.config['IMPORT_CHUNK_SIZE']
+            )
+            if not result['lines']:
                 flash('CSV 파일이 비어 있습니다.', 'error')
                 return redirect(url_for('import_students'))
 
-            start_index = 0
-            header = [h.strip().lower() for h in rows[0]] if rows else []
-            if header and (header == ['student_number', 'name'] or header == ['학번', '이름']):
-                start_index = 1
-
-            total_count = 0
-            added_count = 0
-            skipped_count = 0
-
-            for row in rows[start_index:]:
-                total_count += 1
-                if len(row) < 2:
-                    skipped_count += 1
-                    continue
-                student_number = str(row[0]).strip()
-                name = str(row[1]).strip()
-                if not student_number or not name:
-                    skipped_count += 1
-                    continue
-                existing = Student.query.filter_by(student_number=student_number).first()
-                if existing:
-                    skipped_count += 1
-                    continue
-                db.session.add(Student(student_number=student_number, name=name))
-                added_count += 1
-
-            db.session.commit()
-            flash(f'CSV 처리 완료: 총 {total_count}건, 추가 {added_count}건, 건너뜀 {skipped_count}건', 'success')
+            logger.info('학생 CSV 가져오기: 총 %d건, 추가 %d건, 건너뜀 %d건', result['total'], result['added'], result['skipped'])
+            flash(f"CSV 처리 완료: 총 {result['total']}건, 추가 {result['added']}건, 건너뜀 {result['skipped']}건", 'success')
             return redirect(url_for('index'))
         except UnicodeDecodeError:
+            db.session.rollback()
             flash('파일 인코딩을 확인해주세요. UTF-8 형식을 권장합니다.', 'error')
             return redirect(url_for('import_students'))
         except Exception as e:
+            db.session.rollback()
             flash(f'가져오기 중 오류가 발생했습니다: {str(e)}', 'error')
             return redirect(url_for('import_students'))
 
     return render_template('import_students.html')
 
+@app.route('/evaluations/import', methods=['GET', 'POST'])
+@login_required
+def import_evaluations():
+    """평가 CSV 가져오기 (평가 내보내기와 같은 형식, 오류 보고서를 남기도록 항상 백그라운드 작업으로 처리)"""
+    if request.method == 'POST':
+        file = request.files.get('file')
+        if not file or file.filename == '':
+            flash('CSV 파일을 선택해주세요.', 'error')
+            return redirect(url_for('import_evaluations'))
+        upload_path = job_runner.upload_path()
+        file.save(upload_path)
+        try:
+            job_id = job_runner.submit('import_evaluations', run_evaluation_import_job, upload_path, user_id=current_user.id)
+        except JobQueueFull as e:
+            os.remove(upload_path)
+            flash(str(e), 'error')
+            return redirect(url_for('import_evaluations'))
+        return redirect(url_for('job_status', job_id=job_id))
+    return render_template('import_evaluations.html')
+
+
+EXPORT_HEADER = ['student_number', 'name', 'subject', 'score', 'evaluation_date', 'notes']
+
+def evaluation_export_query(student_id=None):
+    """평가 CSV 내보내기용 단일 JOIN 쿼리 (ORM 객체 대신 컬럼 튜플)"""
+    query = db.session.query(
+        Student.student_number,
+        Student.name,
+        Evaluation.subject,
+        Evaluation.score,
+        Evaluation.evaluation_date,
+        Evaluation.notes
+    ).join(Evaluation, Evaluation.student_id == Student.id)
+    if student_id is not None:
+        query = query.filter(Evaluation.student_id == student_id)
+    return query.order_by(Student.student_number, Evaluation.id)
+
+def evaluation_export_batches(query, batch_size):
+    """yield_per로 커서 하나를 열어 두고 batch_size 행씩 읽는다"""
+    result = db.session.execute(query.statement.execution_options(yield_per=batch_size))
+    yield from result.partitions()
+
+def evaluation_export_keyset_batches(batch_size):
+    """(학번, 평가 id) 키셋으로 batch_size 행씩 나눠 조회
+
+    배치마다 쿼리가 끝나므로 배치 사이에 커밋(진행률 기록)을 해도 안전하다.
+    """
+    last = None
+    while True:
+        query = evaluation_export_query().add_columns(Evaluation.id)
+        if last is not None:
+            query = query.filter(tuple_(Student.student_number, Evaluation.id) > last)
+        rows = query.limit(batch_size).all()
+        if not rows:
+            return
+        last = (rows[-1].student_number, rows[-1].id)
+        yield [row[:len(EXPORT_HEADER)] for row in rows]
+
+def format_export_row(student_number, name, subject, score, evaluation_date, notes):
+    return (
+        student_number,
+        name,
+        subject or '',
+        score if score is not None else '',
+        evaluation_date.strftime('%Y-%m-%d') if evaluation_date else '',
+        notes or ''
+    )
+
+def iter_csv(header, batches):
+    """행 묶음을 CSV 바이트 조각으로 변환 (묶음 하나당 조각 하나)"""
+    buffer = io.StringIO(newline='')
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(header)
+
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+
+    remaining = buffer.getvalue()
+    if remaining:
+        yield remaining.encode('utf-8')
+
+def iter_evaluation_csv(batches):
+    return iter_csv(EXPORT_HEADER, ((format_export_row(*row) for row in rows) for rows in batches))
+
+def gzip_stream(chunks, level=6):
+    """바이트 조각을 gzip으로 즉시 압축하며 전달"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def csv_response(chunks, filename, extra_headers=None):
+    """CSV 스트리밍 응답 (클라이언트가 gzip을 허용하면 즉시 압축)"""
+    headers = {
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'Vary': 'Accept-Encoding',
+    }
+    headers.update(extra_headers or {})
+    if app.config['EXPORT_GZIP'] and 'gzip' in request.headers.get('Accept-Encoding', ''):
+        chunks = gzip_stream(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(
+        stream_with_context(chunks),
+        content_type='text/csv; charset=utf-8',
+        headers=headers
+    )
+
+def csv_stream_response(query, filename, extra_headers=None):
+    chunks = iter_evaluation_csv(evaluation_export_batches(query, app.config['EXPORT_BATCH_SIZE']))
+    return csv_response(chunks, filename, extra_headers)
+
+# 증분 내보내기: since(워터마크) 이후 바뀐 평가만 현재 상태로 내보낸다
+CHANGE_EXPORT_HEADER = ['change', 'evaluation_id'] + EXPORT_HEADER + ['last_modified']
+# IN 목록 한 번에 담을 id 수: 목록이 테이블에 비해 너무 크면 SQLite가 기본 키 조회 대신 전체 읽기를 고른다
+CHANGE_LOOKUP_CHUNK = 500
+
+def evaluations_of_students(student_ids, chunk_size=CHANGE_LOOKUP_CHUNK):
+    """학생 정보(학번/이름)가 바뀌면 그 학생의 평가 행도 다시 내보낸다"""
+    student_ids = list(student_ids)
+    evaluation_ids = set()
+    for start in range(0, len(student_ids), chunk_size):
+        evaluation_ids.update(
+            evaluation_id for evaluation_id, in db.session.query(Evaluation.id)
+            .filter(Evaluation.student_id.in_(student_ids[start:start + chunk_size]))
+        )
+    return evaluation_ids
+
+def evaluation_change_batches(evaluation_ids, batch_size):
+    """바뀐 평가를 id 순으로 batch_size개씩 조회 (지금 없는 평가는 삭제로 표시)"""
+    evaluation_ids = sorted(evaluation_ids)
+    for start in range(0, len(evaluation_ids), batch_size):
+        chunk = evaluation_ids[start:start + batch_size]
+        # IN 목록으로 조인하면 학생 테이블 전체를 읽는 계획이 나오므로 평가/학생을 각각 기본 키로 조회
+        rows = {
+            row.id: row for row in db.session.query(
+                Evaluation.id,
+                Evaluation.student_id,
+                Evaluation.subject,
+                Evaluation.score,
+                Evaluation.evaluation_date,
+                Evaluation.notes,
+                Evaluation.last_modified
+            ).filter(Evaluation.id.in_(chunk))
+        }
+        students = {
+            student_id: (student_number, name) for student_id, student_number, name in db.session.query(
+                Student.id, Student.student_number, Student.name
+            ).filter(Student.id.in_({row.student_id for row in rows.values()}))
+        }
+        batch = []
+        for evaluation_id in chunk:
+            row = rows.get(evaluation_id)
+            if row is None:
+                batch.append(('delete', evaluation_id) + ('',) * (len(EXPORT_HEADER) + 1))
+            else:
+                batch.append(
+                    ('upsert', evaluation_id) +
+                    format_export_row(*students[row.student_id], row.subject, row.score, row.evaluation_date, row.notes) +
+                    (row.last_modified.strftime('%Y-%m-%d %H:%M:%S') if row.last_modified else '',)
+                )
+        yield batch
+
+def parse_watermark(value):
+    try:
+        watermark = int(value)
+    except (TypeError, ValueError):
+        return None
+    return watermark if watermark >= 0 else None
+
+def export_evaluation_changes(since):
+    connection = db.session.connection()
+    if since < oldest_available(connection, ChangeLog.__table__) - 1:
+        return Response('변경 기록이 정리되어 이 워터마크부터는 내보낼 수 없습니다. 전체 내보내기로 다시 동기화하세요.',
+                        410, mimetype='text/plain')
+    changed, watermark, has_more = changed_rows(connection, ChangeLog.__table__, since, app.config['CHANGE_EXPORT_MAX'])
+    evaluation_ids = changed['evaluation'] | evaluations_of_students(changed['student'])
+    chunks = iter_csv(CHANGE_EXPORT_HEADER, evaluation_change_batches(evaluation_ids, min(app.config['EXPORT_BATCH_SIZE'], CHANGE_LOOKUP_CHUNK)))
+    logger.info('평가 증분 내보내기: 워터마크 %d -> %d, 평가 %d건', since, watermark, len(evaluation_ids))
+    return csv_response(chunks, f'evaluations_changes_{since}_{watermark}.csv', {
+        'X-Watermark': str(watermark),
+        'X-Has-More': '1' if has_more else '0',
+    })
 
 # 특정 학생 평가 CSV 내보내기
 @app.route('/student/<int:student_id>/evaluations/export')
 @login_required
 def export_student_evaluations(student_id):
     student = Student.query.get_or_404(student_id)
-    output = io.StringIO(newline='')
-    writer = csv.writer(output)
-    writer.writerow(['student_number', 'name', 'subject', 'score', 'evaluation_date', 'notes'])
-    for ev in student.evaluations:
-        writer.writerow([
-            student.student_number,
-            student.name,
-            ev.subject or '',
-            ev.score if ev.score is not None else '',
-            ev.evaluation_date.strftime('%Y-%m-%d') if ev.evaluation_date else '',
-            ev.notes or ''
-        ])
-
-    csv_data = '\ufeff' + output.getvalue()
-    response = make_response(csv_data)
-    response.headers['Content-Type'] = 'text/csv; charset=utf-8'
     filename = f"evaluations_{student.student_number}.csv"
-    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
-    return response
+    return csv_stream_response(evaluation_export_query(student.id), filename)
 
 
-# 전체 평가 CSV 내보내기
+# 전체 평가 CSV 내보내기 (since=<워터마크>이면 그 뒤 변경분만, year=<학년도>이면 보관 파일에서)
 @app.route('/evaluations/export')
 @login_required
 def export_all_evaluations():
-    output = io.StringIO(newline='')
-    writer = csv.writer(output)
-    writer.writerow(['student_number', 'name', 'subject', 'score', 'evaluation_date', 'notes'])
-
-    students = Student.query.order_by(Student.student_number).all()
-    for student in students:
-        for ev in student.evaluations:
-            writer.writerow([
-                student.student_number,
-                student.name,
-                ev.subject or '',
-                ev.score if ev.score is not None else '',
-                ev.evaluation_date.strftime('%Y-%m-%d') if ev.evaluation_date else '',
-                ev.notes or ''
-            ])
-
-    csv_data = '\ufeff' + output.getvalue()
-    response = make_response(csv_data)
-    response.headers['Content-Type'] = 'text/csv; charset=utf-8'
-    response.headers['Content-Disposition'] = 'attachment; filename="evaluations_all.csv"'
-    return response
+    if 'year' in request.args:
+        year = request.args.get('year', type=int)
+        if year is None or not archive_store.exists(year):
+            abort(404)
+        chunks = iter_evaluation_csv(archive_store.evaluation_batches(year, app.config['EXPORT_BATCH_SIZE']))
+        return csv_response(chunks, f'evaluations_{year}.csv')
+    if 'since' in request.args:
+        since = parse_watermark(request.args['since'])
+        if since is None:
+            return Response('since는 0 이상의 정수(워터마크)여야 합니다.', 400, mimetype='text/plain')
+        return export_evaluation_changes(since)
+    # 워터마크를 먼저 읽는다. 그 사이 바뀐 평가는 다음 증분에 다시 담기지만 upsert/delete는 반복 적용해도 결과가 같다
+    watermark = current_watermark(db.session.connection())
+    return csv_stream_response(evaluation_export_query(), 'evaluations_all.csv', {'X-Watermark': str(watermark)})
+
+# 백그라운드 작업 함수
+def run_student_import_job(progress, upload_path):
+    """업로드된 학생 CSV 파일 가져오기"""
+    try:
+        with open(upload_path, 'rb') as f:
+            result = import_students_csv(
+                db, Student,
+                iter_csv_rows(f),
+                chunk_size=app.config['IMPORT_CHUNK_SIZE'],
+                progress=progress
+            )
+    finally:
+        os.remove(upload_path)
+    if not result['lines']:
+        raise ValueError('CSV 파일이 비어 있습니다.')
+    logger.info('학생 CSV 가져오기: 총 %d건, 추가 %d건, 건너뜀 %d건', result['total'], result['added'], result['skipped'])
+    return {'message': f"CSV 처리 완료: 총 {result['total']}건, 추가 {result['added']}건, 건너뜀 {result['skipped']}건"}
+
+# 평가 가져오기 오류 보고서: 원래 행 + 줄 번호/오류 (고친 뒤 그대로 다시 가져올 수 있다)
+IMPORT_ERROR_HEADER = EXPORT_HEADER + ['line', 'error']
+
+def apply_imported_evaluations(values):
+    """가져온 평가(Core INSERT)를 학생 통계와 학생 최근 수정일에 반영 (chunk 커밋 전, 같은 트랜잭션)"""
+    student_ids = add_to_student_stats((row['student_id'], row) for row in values)
+    now = datetime.utcnow()
+    for ids in chunks(student_ids):
+        db.session.execute(update(Student.__table__).where(Student.__table__.c.id.in_(ids)).values(last_modified=now))
+
+def run_evaluation_import_job(progress, upload_path):
+    """업로드된 평가 CSV 파일 가져오기 (잘못된 행은 오류 보고서 파일로)"""
+    # 학번 → 학생 id는 한 번만 읽어 두고 행마다 조회하지 않는다
+    student_ids = dict(db.session.execute(select(Student.student_number, Student.id)).all())
+    columns = len(EXPORT_HEADER)
+    try:
+        with open(progress.result_path, 'w', encoding='utf-8-sig', newline='') as report:
+            writer = csv.writer(report)
+            writer.writerow(IMPORT_ERROR_HEADER)
+
+            def on_error(line, row, message):
+                writer.writerow((list(row[:columns]) + [''] * columns)[:columns] + [line, message])
+
+            with open(upload_path, 'rb') as f:
+                result = import_evaluations_csv(
+                    db, Evaluation,
+                    iter_csv_rows(f),
+                    student_ids,
+                    chunk_size=app.config['IMPORT_CHUNK_SIZE'],
+                    progress=progress,
+                    before_commit=apply_imported_evaluations,
+                    on_error=on_error
+                )
+    except UnicodeDecodeError:
+        os.remove(progress.result_path)
+        raise ValueError('파일 인코딩을 확인해주세요. UTF-8 형식을 권장합니다. (앞부분은 이미 저장되었을 수 있습니다)')
+    finally:
+        os.remove(upload_path)
+    if not result['failed']:
+        os.remove(progress.result_path)
+    if not result['lines']:
+        raise ValueError('CSV 파일이 비어 있습니다.')
+    logger.info('평가 CSV 가져오기: 총 %d건, 추가 %d건, 오류 %d건', result['total'], result['added'], result['failed'])
+    message = f"평가 CSV 가져오기 완료: 총 {result['total']}건, 추가 {result['added']}건, 오류 {result['failed']}건"
+    if result['failed']:
+        message += ' (오류 보고서를 내려받아 고친 뒤 그 파일을 다시 가져오면 됩니다)'
+    return {'message': message, 'result_path': progress.result_path if result['failed'] else None}
+
+def run_evaluation_export_job(progress):
+    """전체 평가 CSV 파일 생성"""
+    total = Evaluation.query.count()
+    progress(0, total=total)
+
+    def counted(batches):
+        written = 0
+        for batch in batches:
+            yield batch
+            # 이전 묶음을 파일에 쓴 뒤 진행률 기록
+            written += len(batch)
+            progress(written)
+
+    batches = counted(evaluation_export_keyset_batches(app.config['EXPORT_BATCH_SIZE']))
+    with open(progress.result_path, 'wb') as f:
+        for chunk in iter_evaluation_csv(batches):
+            f.write(chunk)
+    return {'message': f'전체 평가 {total}건 내보내기 완료', 'result_path': progress.result_path}
+
+# 전체 평가 CSV 내보내기 (백그라운드 작업)
+@app.route('/evaluations/export/job', methods=['POST'])
+@login_required
+def export_all_evaluations_job():
+    try:
+        job_id = job_runner.submit('export_evaluations', run_evaluation_export_job, user_id=current_user.id)
+    except JobQueueFull as e:
+        flash(str(e), 'error')
+        return redirect(request.referrer or url_for('index'))
+    return redirect(url_for('job_status', job_id=job_id))
+
+def get_job_or_404(job_id):
+    """작업 조회 (본인 또는 관리자만)"""
+    job = db.session.get(Job, job_id)
+    if job is None:
+        abort(404)
+    if job.user_id != current_user.id and not current_user.is_admin:
+        abort(404)
+    return job
+
+@app.route('/jobs/<job_id>')
+@login_required
+def job_status(job_id):
+    job = get_job_or_404(job_id)
+    return render_template('job_status.html', job=job)
+
+@app.route('/jobs/<job_id>/status')
+@login_required
+def job_status_json(job_id):
+    job = get_job_or_404(job_id)
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/download')
+@login_required
+def job_download(job_id):
+    job = get_job_or_404(job_id)
+    if job.status != 'done' or not job.result_path or not os.path.exists(job.result_path):
+        abort(404)
+    return send_file(
+        job.result_path,
+        mimetype='text/csv',
+        as_attachment=True,
+        download_name='evaluation_import_errors.csv' if job.kind == 'import_evaluations' else 'evaluations_all.csv'
+    )
+
+# JSON API
+# 로그인 세션으로 인증하고, 쓰기 요청은 CSRF 토큰을 X-CSRFToken 헤더로 보낸다. (GET /api/csrf-token)
+def api_error(message, status, **extra):
+    return jsonify(error=message, **extra), status
+
+def api_login_required(view):
+    """로그인 화면으로 이동하는 대신 401 JSON 응답"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return api_error('로그인이 필요합니다.', 401)
+        return view(*args, **kwargs)
+    return wrapper
+
+def api_page_size():
+    limit = request.args.get('limit', type=int) or app.config['API_PAGE_SIZE']
+    return max(1, min(limit, app.config['API_PAGE_SIZE_MAX']))
+
+def student_to_dict(student, evaluation_count):
+    return {
+        'id': student.id,
+        'student_number': student.student_number,
+        'name': student.name,
+        'evaluation_count': evaluation_count,
+        'last_modified': student.last_modified.isoformat() if student.last_modified else None,
+    }
+
+def evaluation_to_dict(evaluation):
+    return {
+        'id': evaluation.id,
+        'student_id': evaluation.student_id,
+        'subject': evaluation.subject,
+        'score': evaluation.score,
+        'evaluation_date': evaluation.evaluation_date.isoformat() if evaluation.evaluation_date else None,
+        'notes': evaluation.notes,
+        'last_modified': evaluation.last_modified.isoformat() if evaluation.last_modified else None,
+    }
+
+@app.route('/api/csrf-token')
+@api_login_required
+def api_csrf_token():
+    from flask_wtf.csrf import generate_csrf
+    return jsonify(csrf_token=generate_csrf())
+
+@app.route('/api/students')
+@api_login_required
+def api_students():
+    """학생 목록 (학번 순, after=<학번> 커서)"""
+    query = request.args.get('q', '').strip()
+    after = request.args.get('after', '').strip() or None
+    search_filter = student_search_filter(query) if query else None
+    students, evaluation_counts, _, next_cursor = student_page(search_filter, after=after, per_page=api_page_size())
+    return jsonify(
+        students=[student_to_dict(student, evaluation_counts[student.id]) for student in students],
+        next_cursor=next_cursor
+    )
+
+@app.route('/api/evaluations')
+@api_login_required
+def api_evaluations():
+    """평가 목록 (id 순, after=<평가 id> 커서, student_id로 거르기)"""
+    limit = api_page_size()
+    # 첫 페이지도 id 범위 조건으로 읽어 기본 키 범위 검색이 되도록 한다
+    evaluation_query = Evaluation.query.filter(Evaluation.id > request.args.get('after', 0, type=int))
+    student_id = request.args.get('student_id', type=int)
+    if student_id is not None:
+        evaluation_query = evaluation_query.filter(Evaluation.student_id == student_id)
+    evaluations = evaluation_query.order_by(Evaluation.id).limit(limit + 1).all()
+    next_cursor = evaluations[limit - 1].id if len(evaluations) > limit else None
+    return jsonify(
+        evaluations=[evaluation_to_dict(evaluation) for evaluation in evaluations[:limit]],
+        next_cursor=next_cursor
+    )
+
+@app.route('/api/analytics')
+@api_login_required
+def api_analytics():
+    """평가 분석 결과 (start/end: 평가일 범위)"""
+    start, end, error = request_date_range()
+    if error:
+        return api_error(error, 400)
+    return jsonify(evaluation_analytics.report(start, end))
+
+@app.route('/api/changes')
+@api_login_required
+def api_changes():
+    """since(워터마크) 이후 학생/평가 변경 기록 (삭제 포함)"""
+    since = parse_watermark(request.args.get('since', 0))
+    if since is None:
+        return api_error('since는 0 이상의 정수(워터마크)여야 합니다.', 400)
+    if since < oldest_available(db.session.connection(), ChangeLog.__table__) - 1:
+        return api_error('변경 기록이 정리되어 이 워터마크부터는 조회할 수 없습니다. 전체 내보내기로 다시 동기화하세요.', 410)
+    limit = api_page_size()
+    changes = ChangeLog.query.filter(ChangeLog.id > since).order_by(ChangeLog.id).limit(limit + 1).all()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    return jsonify(
+        changes=[
+            {
+                'watermark': change.id,
+                'entity': change.entity,
+                'id': change.entity_id,
+                'operation': change.operation,
+                'changed_at': change.changed_at.isoformat() if change.changed_at else None,
+            }
+            for change in changes
+        ],
+        next_watermark=changes[-1].id if changes else since,
+        has_more=has_more
+    )
+
+def resolve_batch_students(items):
+    """배치 항목의 student_id/student_number를 한 번의 쿼리로 학생 id에 매핑"""
+    ids = {item.get('student_id') for item in items if isinstance(item.get('student_id'), int)}
+    numbers = {str(item['student_number']) for item in items if item.get('student_number') not in (None, '')}
+    if not ids and not numbers:
+        return set(), {}
+    rows = db.session.query(Student.id, Student.student_number).filter(
+        or_(Student.id.in_(ids), Student.student_number.in_(numbers))
+    ).all()
+    return {row.id for row in rows}, {row.student_number: row.id for row in rows}
+
+def batch_student_id(item, known_ids, id_by_number):
+    student_id = item.get('student_id')
+    if student_id is not None:
+        if isinstance(student_id, bool) or not isinstance(student_id, int):
+            raise ValidationError('학생 id 형식이 올바르지 않습니다.', 'student_id')
+        if student_id not in known_ids:
+            raise ValidationError('존재하지 않는 학생입니다.', 'student_id')
+        return student_id
+    student_number = item.get('student_number')
+    if student_number in (None, ''):
+        raise ValidationError('student_id 또는 student_number를 입력해주세요.', 'student_id')
+    if str(student_number) not in id_by_number:
+        raise ValidationError('존재하지 않는 학번입니다.', 'student_number')
+    return id_by_number[str(student_number)]
+
+@app.route('/api/evaluations/batch', methods=['POST'])
+@api_login_required
+def api_evaluations_batch():
+    """평가 일괄 등록
+
+    요청: {"evaluations": [{"student_id" 또는 "student_number", "subject", "score", "evaluation_date", "notes"}, ...]}
+    모든 항목을 먼저 검증하고, 하나라도 잘못되면 아무것도 저장하지 않고 400과 항목별 오류를 반환한다.
+    모두 올바르면 한 트랜잭션으로 저장하고 학생 통계도 함께 갱신한다.
+    """
+    data = request.get_json(silent=True)
+    items = data.get('evaluations') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return api_error('evaluations 목록을 JSON으로 보내주세요.', 400)
+    if len(items) > app.config['API_BATCH_MAX']:
+        return api_error(f'한 번에 최대 {app.config["API_BATCH_MAX"]}건까지 등록할 수 있습니다.', 413)
+    if not all(isinstance(item, dict) for item in items):
+        return api_error('evaluations의 각 항목은 객체여야 합니다.', 400)
+
+    known_ids, id_by_number = resolve_batch_students(items)
+    rows, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            student_id = batch_student_id(item, known_ids, id_by_number)
+            values = parse_evaluation(item.get('subject'), item.get('score'), item.get('evaluation_date'), item.get('notes'))
+        except ValidationError as e:
+            errors.append({'index': index, 'field': e.field, 'message': e.message})
+            continue
+        rows.append((student_id, values))
+    if errors:
+        logger.warning('평가 일괄 등록 실패: %d/%d건 오류', len(errors), len(items))
+        return api_error('입력값을 확인해주세요.', 400, errors=errors)
+
+    evaluations = [Evaluation(student_id=student_id, **values) for student_id, values in rows]
+    db.session.add_all(evaluations)
+    # 평가를 먼저 flush 해서 쓰기 잠금을 잡은 뒤 통계를 읽는다 (잠금 밖에서 읽으면 동시 저장과 갱신이 엇갈린다)
+    db.session.flush()
+    student_ids = add_to_student_stats(rows)
+    created_ids = [evaluation.id for evaluation in evaluations]
+    username = current_user.username
+    db.session.commit()
+    logger.info('평가 일괄 등록: %d건, 학생 %d명 (%s)', len(created_ids), len(student_ids), username)
+    return jsonify(created=len(created_ids), ids=created_ids), 201
+
+@app.route('/metrics')
+@login_required
+def metrics():
+    """요청 성능 지표 (Prometheus 텍스트 형식, 관리자 전용)"""
+    if not current_user.is_admin:
+        abort(403)
+    return Response(request_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 # 에러 핸들러
 @app.errorhandler(404)
 def not_found_error(error):
-    logger.warning(f'404 에러: {request.url}')
+    logger.warning('404 에러: %s', request.url)
     return render_template('404.html'), 404
 
 @app.errorhandler(500)
 def internal_error(error):
-    logger.error(f'500 에러: {error}')
+    logger.error('500 에러: %s', error)
     db.session.rollback()
     return render_template('500.html'), 500
 
+@app.errorhandler(CSRFError)
+def csrf_error(error):
+    if request.path.startswith('/api/'):
+        return api_error('CSRF 토큰이 없거나 올바르지 않습니다.', 400)
+    return error
+
 @app.errorhandler(413)
 def too_large(error):
     logger.warning('파일 크기 초과')
@@ -533,34 +1721,96 @@ def create_default_admin():
         db.session.commit()
         logger.info('기본 관리자 계정이 생성되었습니다. (사용자명: admin, 비밀번호: admin123)')
 
+def init_template_cache(app):
+    """템플릿 바이트코드 캐시: 다음 실행부터 템플릿을 다시 컴파일하지 않는다"""
+    cache_dir = app.config.get('JINJA_CACHE_DIR')
+    if not cache_dir:
+        return
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError as e:
+        # 읽기 전용 USB 등: 캐시 없이 실행
+        logger.warning('템플릿 캐시 디렉토리를 만들 수 없습니다: %s', e)
+        return
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+def initialize_database():
+    """스키마 업그레이드, 검색 색인, 기본 관리자 계정, 학생 통계 확인 (앱 컨텍스트 안에서 호출)"""
+    if _version_file:
+        os.makedirs(os.path.dirname(os.path.abspath(_db_url.database)), exist_ok=True)
+    # 기존 management.db도 최신 스키마(인덱스 포함)로 업그레이드 (최신이면 리비전 비교만 한다)
+    upgrade_database(db)
+    ensure_search_index(db.session.connection(), Student.__table__)
+    db.session.commit()
+    create_default_admin()
+    # 재시작 전에 끝나지 않은 백그라운드 작업 정리 (메모리 대기열과 함께 사라졌다)
+    job_runner.recover_interrupted()
+
+    # 기존 데이터베이스: 학생 통계가 비어 있으면 한 번 재계산
+    if StudentStats.query.first() is None and Evaluation.query.first() is not None:
+        rebuilt = rebuild_student_stats()
+        logger.info('학생 통계 재계산 완료: %d명', rebuilt)
+    logger.info('데이터베이스 초기화 완료')
+
+def start_backup_scheduler():
+    """BACKUP_INTERVAL_HOURS마다 백그라운드 백업 (gunicorn은 fork 전 마스터 프로세스에서만 실행)"""
+    global backup_scheduler
+    interval = app.config['BACKUP_INTERVAL_HOURS'] * 3600
+    if backup_manager is None or interval <= 0 or app.config.get('TESTING'):
+        return
+    backup_scheduler = BackupScheduler(backup_manager, interval, start_delay=app.config['BACKUP_START_DELAY'])
+    backup_scheduler.start()
+
+_app_initialized = False
+_app_init_lock = threading.Lock()
+
+def create_app():
+    """앱 초기화 후 반환 (여러 번 호출해도 초기화는 한 번만 한다)
+
+    앱, db, 엔진과 분석/보관/백업/작업/서빙 객체는 모듈을 불러올 때 이미
+    만들어진다. 여기서는 로깅, 템플릿 캐시, 데이터베이스 초기화, 백업 스케줄러
+    시작처럼 파일이나 DB를 건드리는 일만 한 번 수행한다.
+    """
+    global _app_initialized
+    with _app_init_lock:
+        if not _app_initialized:
+            setup_logging()
+            init_template_cache(app)
+            with app.app_context():
+                initialize_database()
+            start_backup_scheduler()
+            _app_initialized = True
+    return app
+
 if __name__ == '__main__':
+    setup_logging()
     logger.info('학생 관리 시스템 시작')
     
     # 데이터베이스 경로 로깅 추가
-    logger.info(f'데이터베이스 경로: {app.config["SQLALCHEMY_DATABASE_URI"]}')
+    logger.info('데이터베이스 경로: %s', app.config['SQLALCHEMY_DATABASE_URI'])
     
     try:
-        with app.app_context():
-            db.create_all()
-            create_default_admin()
-            logger.info('데이터베이스 초기화 완료')
-            
-            # 데이터베이스에 학생이 몇 명 있는지 확인
-            student_count = Student.query.count()
-            logger.info(f'데이터베이스에 학생 {student_count}명이 있습니다')
-            
+        create_app()
     except Exception as e:
-        logger.error(f'데이터베이스 초기화 실패: {e}')
+        logger.error('데이터베이스 초기화 실패: %s', e)
         print(f'데이터베이스 초기화 실패: {e}')
         sys.exit(1)
     
     # 환경 변수에서 포트 설정 가져오기
     port = int(os.environ.get('FLASK_RUN_PORT', 5003))
     
+    def reset_db_connections():
+        # fork 이전에 열린 연결을 자식 프로세스가 공유하지 않도록 풀을 비운다
+        with app.app_context():
+            db.engine.dispose(close=False)
+        # 로그 기록 스레드는 fork 되지 않으므로 자식에서 다시 시작
+        if logging_pipeline is not None:
+            logging_pipeline.after_fork()
+    
     try:
-        logger.info(f'서버 시작: http://localhost:{port}')
-        app.run(debug=False, host='0.0.0.0', port=port)
+        logger.info('서버 시작: http://localhost:%d (%s)', port, app.config['SERVER'])
+        serve(app, host='0.0.0.0', port=port, on_fork=reset_db_connections)
     except Exception as e:
-        logger.error(f'서버 시작 실패: {e}')
+        logger.error('서버 시작 실패: %s', e)
         print(f'서버 시작 실패: {e}')
         sys.exit(1) 
\ No newline at end of file
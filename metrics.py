@@ -0,0 +1,173 @@
+"""요청 단위 성능 계측
+
+- 요청마다 처리 시간, SQL 실행 수, SQL 시간을 엔드포인트별로 집계한다.
+- 응답에 Server-Timing 헤더(app, db)를 붙인다.
+- 기준(SLOW_REQUEST_MS, SLOW_QUERY_MS)을 넘는 요청/쿼리를 경고 로그로 남긴다.
+- 집계는 Prometheus 텍스트 형식으로 내보낸다. (/metrics, 관리자 전용)
+
+스트리밍 응답(CSV 내보내기)은 본문 전송이 끝난 시점(call_on_close)까지를 처리 시간으로 기록한다.
+Server-Timing 헤더는 본문 전송 전에 보내므로 그때까지의 값이다.
+gunicorn처럼 여러 프로세스로 실행하면 집계는 프로세스마다 따로 유지된다.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (라벨 조합마다 하나)"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bucket, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield bucket, total
+
+
+def format_labels(labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{name}="{escape(value)}"' for name, value in labels)
+
+
+class RequestMetrics:
+    """Flask 요청 수명 주기와 SQLAlchemy 엔진 이벤트로 성능 지표 수집"""
+
+    def __init__(self, app=None, db=None):
+        self._lock = threading.Lock()
+        self.durations = {}
+        self.query_counts = {}
+        self.query_durations = {}
+        self.requests = {}
+        self.slow_requests = {}
+        self.slow_queries = 0
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        self.slow_request = app.config.get('SLOW_REQUEST_MS', 500) / 1000
+        self.slow_query = app.config.get('SLOW_QUERY_MS', 100) / 1000
+        self.server_timing = app.config.get('SERVER_TIMING', True)
+        app.extensions['request_metrics'] = self
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(db.engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    # 요청 수명 주기
+    def _before_request(self):
+        g.request_metrics = {'started': time.perf_counter(), 'queries': 0, 'sql_time': 0.0}
+
+    def _after_request(self, response):
+        state = g.get('request_metrics')
+        if state is None:
+            return response
+        if self.server_timing:
+            elapsed = time.perf_counter() - state['started']
+            response.headers['Server-Timing'] = (
+                f'app;dur={elapsed * 1000:.1f}, '
+                f'db;dur={state["sql_time"] * 1000:.1f};desc="{state["queries"]} queries"'
+            )
+        endpoint = request.url_rule.endpoint if request.url_rule else '<unmatched>'
+        method = request.method
+        path = request.full_path.rstrip('?')
+        status = response.status_code
+        if response.is_streamed:
+            # 본문을 다 보낸 뒤 기록
+            response.call_on_close(lambda: self._finish(state, endpoint, method, path, status))
+        else:
+            self._finish(state, endpoint, method, path, status)
+        return response
+
+    def _finish(self, state, endpoint, method, path, status):
+        elapsed = time.perf_counter() - state['started']
+        self.observe(endpoint, method, status, elapsed, state['queries'], state['sql_time'])
+        if elapsed >= self.slow_request:
+            logger.warning(
+                '느린 요청: %s %s (%s) %.0fms, SQL %d건 %.0fms',
+                method, path, endpoint, elapsed * 1000, state['queries'], state['sql_time'] * 1000,
+                extra={'endpoint': endpoint, 'duration_ms': round(elapsed * 1000, 1),
+                       'query_count': state['queries'], 'status': status}
+            )
+
+    # SQL 실행
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_metrics_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if has_request_context():
+            state = g.get('request_metrics')
+            if state is not None:
+                state['queries'] += 1
+                state['sql_time'] += elapsed
+        if elapsed >= self.slow_query:
+            with self._lock:
+                self.slow_queries += 1
+            logger.warning('느린 쿼리 %.0fms: %s', elapsed * 1000, ' '.join(statement.split())[:500],
+                           extra={'duration_ms': round(elapsed * 1000, 1)})
+
+    def observe(self, endpoint, method, status, elapsed, queries, sql_time):
+        key = (('endpoint', endpoint), ('method', method))
+        with self._lock:
+            self.durations.setdefault(key, Histogram(DURATION_BUCKETS)).observe(elapsed)
+            self.query_counts.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(queries)
+            self.query_durations.setdefault(key, Histogram(DURATION_BUCKETS)).observe(sql_time)
+            status_key = key + (('status', status),)
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            if elapsed >= self.slow_request:
+                self.slow_requests[key] = self.slow_requests.get(key, 0) + 1
+
+    def render(self):
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        lines = []
+
+        def histogram(name, help_text, series):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for labels, hist in sorted(series.items()):
+                for bucket, total in hist.cumulative():
+                    lines.append(f'{name}_bucket{{{format_labels(labels + (("le", bucket),))}}} {total}')
+                lines.append(f'{name}_sum{{{format_labels(labels)}}} {hist.sum:.6f}')
+                lines.append(f'{name}_count{{{format_labels(labels)}}} {hist.count}')
+
+        def counter(name, help_text, series):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for labels, value in sorted(series.items()):
+                lines.append(f'{name}{{{format_labels(labels)}}} {value}' if labels else f'{name} {value}')
+
+        with self._lock:
+            counter('http_requests_total', '처리한 요청 수', self.requests)
+            histogram('http_request_duration_seconds', '요청 처리 시간', self.durations)
+            histogram('http_request_sql_queries', '요청당 SQL 실행 수', self.query_counts)
+            histogram('http_request_sql_duration_seconds', '요청당 SQL 실행 시간', self.query_durations)
+            counter('http_slow_requests_total', 'SLOW_REQUEST_MS를 넘은 요청 수', self.slow_requests)
+            counter('sql_slow_queries_total', 'SLOW_QUERY_MS를 넘은 쿼리 수', {(): self.slow_queries})
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,61 @@
+"""초기 스키마 (user, student, evaluation)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+마이그레이션 도입 이전에 db.create_all()로 만들어진 데이터베이스는
+이 리비전으로 stamp 한 뒤 업그레이드한다. (schema.upgrade_database 참고)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=80), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('password_hash', sa.String(length=120), nullable=False),
+        sa.Column('is_admin', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_login', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('username')
+    )
+    op.create_table(
+        'student',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('student_number', sa.String(length=20), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_modified', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('student_number')
+    )
+    op.create_table(
+        'evaluation',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('subject', sa.String(length=100), nullable=False),
+        sa.Column('score', sa.Float(), nullable=True),
+        sa.Column('evaluation_date', sa.Date(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['student_id'], ['student.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('evaluation')
+    op.drop_table('student')
+    op.drop_table('user')
@@ -0,0 +1,56 @@
+"""학생 통계(student_stats), 백그라운드 작업(job) 테이블
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:01
+
+마이그레이션 도입 전 create_all()로 이미 만들어진 테이블은 건너뛴다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'student_stats' not in tables:
+        op.create_table(
+            'student_stats',
+            sa.Column('student_id', sa.Integer(), nullable=False),
+            sa.Column('evaluation_count', sa.Integer(), nullable=False),
+            sa.Column('score_sum', sa.Float(), nullable=False),
+            sa.Column('score_min', sa.Float(), nullable=True),
+            sa.Column('score_max', sa.Float(), nullable=True),
+            sa.Column('last_evaluation_date', sa.Date(), nullable=True),
+            sa.Column('subject_counts', sa.JSON(), nullable=False),
+            sa.ForeignKeyConstraint(['student_id'], ['student.id']),
+            sa.PrimaryKeyConstraint('student_id')
+        )
+    if 'job' not in tables:
+        op.create_table(
+            'job',
+            sa.Column('id', sa.String(length=32), nullable=False),
+            sa.Column('kind', sa.String(length=50), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('progress', sa.Integer(), nullable=True),
+            sa.Column('total', sa.Integer(), nullable=True),
+            sa.Column('message', sa.Text(), nullable=True),
+            sa.Column('result_path', sa.String(length=500), nullable=True),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('job')
+    op.drop_table('student_stats')
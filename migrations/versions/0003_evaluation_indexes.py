@@ -0,0 +1,39 @@
+"""평가 조회용 복합 인덱스
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:02
+
+- (student_id, evaluation_date): 학생별 평가 목록/통계 재계산/학생별 내보내기
+- (subject, evaluation_date): 과목별 조회
+- (evaluation_date): 기간 조회
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_evaluation_student_id_evaluation_date', ['student_id', 'evaluation_date']),
+    ('ix_evaluation_subject_evaluation_date', ['subject', 'evaluation_date']),
+    ('ix_evaluation_evaluation_date', ['evaluation_date']),
+]
+
+
+def upgrade():
+    existing = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('evaluation')}
+    for name, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, 'evaluation', columns, unique=False)
+    # 새 인덱스를 쿼리 플래너가 활용하도록 통계 갱신
+    op.execute('ANALYZE')
+
+
+def downgrade():
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='evaluation')
@@ -0,0 +1,41 @@
+"""평가 분석용 커버링 인덱스
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:03
+
+analytics.py의 집계 쿼리가 테이블을 읽거나 임시 정렬 없이 인덱스 순서대로 묶도록 한다.
+- (subject, evaluation_date, score): 과목/날짜/점수별 건수. (subject, evaluation_date)를 대체한다.
+- (student_id, subject, evaluation_date, score): 학생/과목별 건수와 합계
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_evaluation_subject_evaluation_date_score', ['subject', 'evaluation_date', 'score']),
+    ('ix_evaluation_student_id_subject', ['student_id', 'subject', 'evaluation_date', 'score']),
+]
+REPLACED = ('ix_evaluation_subject_evaluation_date', ['subject', 'evaluation_date'])
+
+
+def upgrade():
+    existing = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('evaluation')}
+    for name, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, 'evaluation', columns, unique=False)
+    if REPLACED[0] in existing:
+        op.drop_index(REPLACED[0], table_name='evaluation')
+    op.execute('ANALYZE')
+
+
+def downgrade():
+    op.create_index(REPLACED[0], 'evaluation', REPLACED[1], unique=False)
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='evaluation')
@@ -0,0 +1,69 @@
+"""변경 기록(change_log), 평가 수정 시각
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:04
+
+- evaluation.last_modified: 기존 평가는 마이그레이션 시각으로 채운다.
+- change_log: 학생/평가 추가·수정·삭제 기록 (id가 증분 내보내기 워터마크, AUTOINCREMENT로 재사용 없음)
+- 트리거: ORM을 거치지 않는 일괄 INSERT/CASCADE 삭제도 같은 트랜잭션에서 기록한다.
+  기존 행은 기록이 없으므로 전체 내보내기로 한 번 동기화한 뒤 응답의 워터마크부터 증분을 받는다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+# change_log.TRACKED_TABLES와 같게 유지 (마이그레이션은 작성 시점의 정의를 그대로 둔다)
+TRACKED_TABLES = {
+    'student': ('student_number', 'name'),
+    'evaluation': ('student_id', 'subject', 'score', 'evaluation_date', 'notes'),
+}
+
+
+def triggers():
+    for table, columns in TRACKED_TABLES.items():
+        for event_name, row, operation in (
+            ('INSERT', 'NEW', 'upsert'),
+            (f'UPDATE OF {", ".join(columns)}', 'NEW', 'upsert'),
+            ('DELETE', 'OLD', 'delete'),
+        ):
+            name = f'change_log_{table}_{event_name.split()[0].lower()}'
+            yield name, (
+                f'CREATE TRIGGER IF NOT EXISTS {name} AFTER {event_name} ON {table} BEGIN '
+                f'INSERT INTO change_log (entity, entity_id, operation, changed_at) '
+                f"VALUES ('{table}', {row}.id, '{operation}', CURRENT_TIMESTAMP); END"
+            )
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'last_modified' not in {column['name'] for column in inspector.get_columns('evaluation')}:
+        op.add_column('evaluation', sa.Column('last_modified', sa.DateTime(), nullable=True))
+        op.execute('UPDATE evaluation SET last_modified = CURRENT_TIMESTAMP WHERE last_modified IS NULL')
+    if 'change_log' not in inspector.get_table_names():
+        op.create_table(
+            'change_log',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('entity', sa.String(length=20), nullable=False),
+            sa.Column('entity_id', sa.Integer(), nullable=False),
+            sa.Column('operation', sa.String(length=10), nullable=False),
+            sa.Column('changed_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sqlite_autoincrement=True
+        )
+    for _, statement in triggers():
+        op.execute(statement)
+
+
+def downgrade():
+    for name, _ in triggers():
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+    op.drop_table('change_log')
+    with op.batch_alter_table('evaluation') as batch_op:
+        batch_op.drop_column('last_modified')
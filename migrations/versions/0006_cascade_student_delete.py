@@ -0,0 +1,65 @@
+"""학생 삭제 시 평가/통계 ON DELETE CASCADE
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:05
+
+- evaluation.student_id, student_stats.student_id 외래 키에 ON DELETE CASCADE를 건다.
+  학생을 DELETE 한 번으로 지우면 SQLite가 평가/통계를 같은 문장 안에서 지운다.
+  (storage.py가 모든 연결에 PRAGMA foreign_keys=ON을 적용)
+- SQLite는 외래 키를 바꿀 수 없으므로 batch 모드로 테이블을 다시 만든다.
+  기존 외래 키는 이름이 없어서 naming_convention으로 이름을 붙여 지운다.
+- 학생이 없는 평가/통계는 외래 키 검사에 걸리므로 먼저 지운다.
+- 테이블을 다시 만들면 evaluation의 변경 기록 트리거(0005)가 사라지므로 다시 만든다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+TABLES = ('evaluation', 'student_stats')
+
+# 0005와 같은 evaluation 변경 기록 트리거 (마이그레이션은 작성 시점의 정의를 그대로 둔다)
+EVALUATION_COLUMNS = ('student_id', 'subject', 'score', 'evaluation_date', 'notes')
+
+
+def evaluation_triggers():
+    for event_name, row, operation in (
+        ('INSERT', 'NEW', 'upsert'),
+        (f'UPDATE OF {", ".join(EVALUATION_COLUMNS)}', 'NEW', 'upsert'),
+        ('DELETE', 'OLD', 'delete'),
+    ):
+        yield (
+            f'CREATE TRIGGER IF NOT EXISTS change_log_evaluation_{event_name.split()[0].lower()} '
+            f'AFTER {event_name} ON evaluation BEGIN '
+            f'INSERT INTO change_log (entity, entity_id, operation, changed_at) '
+            f"VALUES ('evaluation', {row}.id, '{operation}', CURRENT_TIMESTAMP); END"
+        )
+
+
+def replace_student_foreign_key(table, ondelete):
+    name = NAMING_CONVENTION['fk'] % {'table_name': table, 'column_0_name': 'student_id', 'referred_table_name': 'student'}
+    with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION, recreate='always') as batch_op:
+        batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.create_foreign_key(name, 'student', ['student_id'], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    for table in TABLES:
+        op.execute(f'DELETE FROM {table} WHERE student_id NOT IN (SELECT id FROM student)')
+        replace_student_foreign_key(table, 'CASCADE')
+    for statement in evaluation_triggers():
+        op.execute(statement)
+
+
+def downgrade():
+    for table in TABLES:
+        replace_student_foreign_key(table, None)
+    for statement in evaluation_triggers():
+        op.execute(statement)
@@ -0,0 +1,192 @@
+"""읽기 화면 캐시와 조건부 GET (ETag / Last-Modified)
+
+- DataVersion: 학생/평가 데이터가 커밋될 때마다 바뀌는 버전.
+  SQLite 파일 DB면 옆에 둔 버전 파일(stat)로 공유하여 gunicorn 여러 프로세스에서도 같은 값을 본다.
+  인메모리 DB(테스트)는 프로세스 안의 카운터를 쓴다.
+- PageCache: (사용자, 세션 CSRF 토큰, 경로) → 렌더링된 응답 본문. 항목 수/전체 바이트로 제한하는 LRU.
+  화면마다 CSRF 토큰과 사용자 이름이 들어가므로 사용자/세션별로 캐시한다.
+  데이터 버전이 같고 If-None-Match가 맞으면 DB 조회와 템플릿 렌더링 없이 304를 반환한다.
+
+CSRF 토큰이 만료(WTF_CSRF_TIME_LIMIT)되기 전에 화면이 다시 만들어지도록
+버전에 시간 구간(만료 시간의 절반)을 함께 넣는다.
+"""
+import hashlib
+import itertools
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import g, make_response, request, session
+from flask_login import current_user
+from sqlalchemy import event
+
+
+class DataVersion:
+    """데이터 변경 버전 (path가 있으면 파일로 프로세스 간 공유)"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self._counter = itertools.count(1)
+        self._value = 0
+        self._changed_at = time.time()
+
+    def current(self):
+        """(버전 문자열, 마지막 변경 시각 epoch 초)"""
+        if self.path:
+            try:
+                st = os.stat(self.path)
+                return f'{st.st_ino:x}.{st.st_mtime_ns:x}', st.st_mtime
+            except FileNotFoundError:
+                self.bump()
+                return self.current()
+        return str(self._value), self._changed_at
+
+    def bump(self):
+        if self.path:
+            # 새 파일로 교체하여 inode/mtime이 항상 바뀌도록 한다
+            tmp_path = f'{self.path}.{uuid.uuid4().hex}.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(uuid.uuid4().hex)
+            os.replace(tmp_path, self.path)
+        else:
+            self._value = next(self._counter)
+            self._changed_at = time.time()
+
+
+def track_changes(session_target, tables, version):
+    """tables에 대한 쓰기가 커밋되면 version.bump()"""
+    tables = set(tables)
+
+    def mark(session):
+        session.info['data_changed'] = True
+
+    @event.listens_for(session_target, 'after_flush')
+    def _after_flush(session, flush_context):
+        for obj in itertools.chain(session.new, session.dirty, session.deleted):
+            if getattr(obj, '__tablename__', None) in tables:
+                mark(session)
+                return
+
+    @event.listens_for(session_target, 'do_orm_execute')
+    def _do_orm_execute(orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            table = getattr(orm_execute_state.statement, 'table', None)
+            if getattr(table, 'name', None) in tables:
+                mark(orm_execute_state.session)
+
+    @event.listens_for(session_target, 'after_commit')
+    def _after_commit(session):
+        if session.info.pop('data_changed', False):
+            version.bump()
+
+    @event.listens_for(session_target, 'after_soft_rollback')
+    def _after_rollback(session, previous_transaction):
+        session.info.pop('data_changed', None)
+
+
+class PageCache:
+    """사용자/세션별 렌더링 결과 LRU 캐시"""
+
+    def __init__(self, version, max_entries=512, max_bytes=32 * 1024 * 1024, csrf_time_limit=3600, enabled=True):
+        self.version = version
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.window = max((csrf_time_limit or 3600) // 2, 60)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self):
+        return (current_user.get_id(), session.get('csrf_token'), request.full_path)
+
+    def _etag(self, key, version):
+        return hashlib.sha1(repr((key, version)).encode('utf-8')).hexdigest()
+
+    def _get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['version'] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key, entry):
+        size = len(entry['body'])
+        if size > self.max_bytes // 4:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old['body'])
+            self._entries[key] = entry
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted['body'])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def cached(self, view):
+        """GET 화면 캐시 데코레이터 (login_required 안쪽에 둔다)
+
+        뷰가 g.last_modified를 설정하면 Last-Modified로 쓰고, 없으면 데이터 변경 시각을 쓴다.
+        """
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # 플래시 메시지가 있는 화면은 한 번만 보여야 하므로 캐시하지 않는다
+            if not self.enabled or request.method != 'GET' or '_flashes' in session:
+                return view(*args, **kwargs)
+
+            data_version, changed_at = self.version.current()
+            version = (data_version, int(time.time()) // self.window)
+            key = self._key()
+            entry = self._get(key, version)
+            if entry is None:
+                etag = self._etag(key, version)
+                if etag in request.if_none_match:
+                    # 본문이 캐시에서 밀려났어도 버전이 같으면 304
+                    return self._not_modified(etag)
+                self.misses += 1
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                # 첫 렌더링에서 CSRF 토큰이 세션에 생겼을 수 있으므로 키를 다시 계산
+                key = self._key()
+                last_modified = g.get('last_modified') or datetime.fromtimestamp(changed_at, timezone.utc)
+                entry = {
+                    'version': version,
+                    'etag': self._etag(key, version),
+                    'last_modified': last_modified,
+                    'body': response.get_data(),
+                    'mimetype': response.mimetype,
+                }
+                self._put(key, entry)
+            else:
+                self.hits += 1
+                response = make_response(entry['body'])
+                response.mimetype = entry['mimetype']
+
+            response.set_etag(entry['etag'])
+            response.last_modified = entry['last_modified']
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response.make_conditional(request)
+
+        return wrapper
+
+    def _not_modified(self, etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
@@ -0,0 +1,205 @@
+"""인증 경로 벤치마크
+
+auth.py 적용 전(매 요청 User 조회, 요청 스레드에서 해시 검증, 로그인마다 last_login 커밋)과
+적용 후(사용자 캐시, 해시 전용 스레드, last_login 모아 쓰기)를 같은 부하로 비교한다.
+
+- 로그인 집중: 여러 스레드가 동시에 로그인 → 로그인 처리량과 지연 시간
+- 로그인 후 화면: 여러 스레드가 로그인된 상태로 학생 목록을 반복 요청 → 처리량, 요청당 SQL 수
+- 로그인 중 화면: 절반은 로그인, 절반은 학생 목록 요청 → 화면 요청 지연 시간
+
+사용법:
+    python run_auth_benchmark.py --threads 8 --seconds 5
+    python run_auth_benchmark.py --json auth_benchmark.json
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+workdir = tempfile.mkdtemp(prefix='auth_bench_')
+os.environ['FLASK_ENV'] = 'development'
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'auth.db')}"
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+# 측정 중에는 느린 요청/쿼리 경고를 남기지 않는다
+os.environ.setdefault('SLOW_REQUEST_MS', '600000')
+os.environ.setdefault('SLOW_QUERY_MS', '600000')
+
+from sqlalchemy import event, insert
+
+import management_app
+from management_app import app, db, Student, User, upgrade_database
+from auth import PasswordHasher
+from run_storage_benchmark import percentile
+
+USERS = 40
+PASSWORD = 'benchpass'
+
+
+def seed():
+    db.session.execute(insert(Student.__table__), [
+        {'student_number': f'S{i:04d}', 'name': f'학생{i}'} for i in range(1, 201)
+    ])
+    password_hash = PasswordHasher(workers=0).generate(PASSWORD)
+    db.session.execute(insert(User.__table__), [
+        {'username': f'teacher{i}', 'email': f'teacher{i}@example.com', 'password_hash': password_hash, 'is_admin': False}
+        for i in range(USERS)
+    ])
+    db.session.commit()
+
+
+def configure(mode, hash_workers, last_login_interval):
+    """before: 기존 방식, after: auth.py 설정 적용"""
+    management_app.last_login_recorder.flush()
+    management_app.user_cache.invalidate()
+    if mode == 'before':
+        management_app.user_cache.ttl = 0
+        management_app.password_hasher = PasswordHasher(workers=0)
+        management_app.last_login_recorder.interval = 0
+    else:
+        management_app.user_cache.ttl = 300
+        management_app.password_hasher = PasswordHasher(workers=hash_workers)
+        management_app.last_login_recorder.interval = last_login_interval
+
+
+def run_threads(threads, target):
+    results = [None] * threads
+    workers = [threading.Thread(target=lambda i=i: results.__setitem__(i, target(i))) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def login(client, index):
+    return client.post('/login', data={'username': f'teacher{index % USERS}', 'password': PASSWORD})
+
+
+def login_burst(threads, logins_per_thread):
+    def worker(i):
+        latencies = []
+        for n in range(logins_per_thread):
+            client = app.test_client()
+            started = time.perf_counter()
+            response = login(client, i * logins_per_thread + n)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 302, response.status_code
+        return latencies
+
+    started = time.perf_counter()
+    latencies = [value for result in run_threads(threads, worker) for value in result]
+    elapsed = time.perf_counter() - started
+    return {
+        'logins': len(latencies),
+        'logins_per_sec': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+    }
+
+
+def authenticated_requests(threads, seconds, counter):
+    stop = threading.Event()
+
+    def worker(i):
+        client = app.test_client()
+        login(client, i)
+        count = 0
+        while not stop.is_set():
+            response = client.get('/')
+            assert response.status_code == 200, response.status_code
+            count += 1
+        return count
+
+    counter['queries'] = 0
+    timer = threading.Timer(seconds, stop.set)
+    timer.start()
+    counts = run_threads(threads, worker)
+    total = sum(counts)
+    return {
+        'requests': total,
+        'requests_per_sec': round(total / seconds, 1),
+        'queries_per_request': round(counter['queries'] / max(total, 1), 2),
+    }
+
+
+def pages_during_logins(threads, seconds):
+    """절반은 계속 로그인, 절반은 화면 요청 → 로그인 집중 중 화면 지연 시간"""
+    stop = threading.Event()
+    page_threads = max(threads // 2, 1)
+
+    def worker(i):
+        client = app.test_client()
+        if i >= page_threads:
+            while not stop.is_set():
+                login(app.test_client(), i)
+            return []
+        login(client, i)
+        latencies = []
+        while not stop.is_set():
+            started = time.perf_counter()
+            client.get('/')
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    timer = threading.Timer(seconds, stop.set)
+    timer.start()
+    latencies = [value for result in run_threads(page_threads * 2, worker) for value in result]
+    return {
+        'page_requests_per_sec': round(len(latencies) / seconds, 1),
+        'page_p95_ms': round(percentile(latencies, 95) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='인증 경로 벤치마크')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5, help='로그인 후 화면 요청 시간')
+    parser.add_argument('--logins', type=int, default=5, help='스레드당 로그인 횟수')
+    parser.add_argument('--hash-workers', type=int, default=app.config['AUTH_HASH_WORKERS'])
+    parser.add_argument('--last-login-interval', type=int, default=app.config['AUTH_LAST_LOGIN_INTERVAL'] or 30)
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    args = parser.parse_args()
+
+    app.config['WTF_CSRF_ENABLED'] = False
+    counter = {'queries': 0}
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        counter['queries'] += 1
+
+    results = {}
+    with app.app_context():
+        upgrade_database(db)
+        seed()
+        event.listen(db.engine, 'before_cursor_execute', count_query)
+        for mode in ('before', 'after'):
+            configure(mode, args.hash_workers, args.last_login_interval)
+            results[mode] = {
+                'login_burst': login_burst(args.threads, args.logins),
+                'authenticated': authenticated_requests(args.threads, args.seconds, counter),
+                'pages_during_logins': pages_during_logins(args.threads, args.seconds),
+            }
+        management_app.last_login_recorder.flush()
+        event.remove(db.engine, 'before_cursor_execute', count_query)
+        db.engine.dispose()
+
+    print(f"{'설정':<8} {'로그인/s':>9} {'로그인 p95(ms)':>15} {'화면 요청/s':>12} {'요청당 SQL':>11} {'로그인 중 화면 p95(ms)':>22}")
+    for mode, r in results.items():
+        print(f"{mode:<8} {r['login_burst']['logins_per_sec']:>9} {r['login_burst']['p95_ms']:>15} "
+              f"{r['authenticated']['requests_per_sec']:>12} {r['authenticated']['queries_per_request']:>11} "
+              f"{r['pages_during_logins']['page_p95_ms']:>22}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'params': vars(args), 'results': results}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
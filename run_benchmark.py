@@ -0,0 +1,332 @@
+"""라우트 벤치마크
+
+재현 가능한 합성 데이터(학생 수 단계별, 학생당 평가 수 지정)를 임시 SQLite 데이터베이스에
+넣고, Flask 테스트 클라이언트로 주요 경로를 반복 요청하여 다음을 기록한다.
+
+- 지연 시간 백분위 (p50/p95/p99, 평균, 최대)
+- 요청당 SQL 실행 수
+- 요청 한 번의 최대 메모리 사용량 (tracemalloc, 시간 측정과 별도로 한 번 더 요청)
+
+단계는 작은 것부터 차례로 학생을 추가해 키운다. (1,000명 → 10,000명 → 100,000명)
+결과는 JSON으로 저장하고, --compare로 이전 결과와 비교할 수 있다.
+화면 캐시(PAGE_CACHE_ENABLED)는 기본으로 끄고 잰다. (켜면 학생 목록 등은 캐시 적중만 측정된다)
+
+사용법:
+    python run_benchmark.py --scales 1000,10000,100000 --evaluations 5 --json bench.json
+    python run_benchmark.py --scales 1000 --routes index,search --iterations 50
+    python run_benchmark.py --json new.json --compare old.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+workdir = tempfile.mkdtemp(prefix='route_bench_')
+os.environ['FLASK_ENV'] = 'development'
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+# 임시 데이터베이스를 지운 뒤 종료 시점에 last_login을 기록하지 않도록 바로 기록
+os.environ['AUTH_LAST_LOGIN_INTERVAL'] = '0'
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+# 측정 중에는 느린 요청/쿼리 경고를 남기지 않는다
+os.environ.setdefault('SLOW_REQUEST_MS', '600000')
+os.environ.setdefault('SLOW_QUERY_MS', '600000')
+# 화면 캐시가 켜져 있으면 반복 요청이 캐시 적중만 재므로 경로 자체를 재도록 끈다 (이전 결과와 비교 가능)
+# 캐시 적중 비용을 재려면 PAGE_CACHE_ENABLED=1로 실행
+os.environ.setdefault('PAGE_CACHE_ENABLED', '0')
+
+from sqlalchemy import delete, event, insert, select, text
+
+from management_app import app, db, Student, Evaluation, User, rebuild_student_stats, upgrade_database
+from search_index import ensure_search_index, index_students, unindex_students
+from run_storage_benchmark import percentile
+
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN = '민서준지현우수연하윤도영예은재성진아원유호'
+SUBJECTS = ['국어', '수학', '영어', '과학', '사회', '체육']
+
+ROUTES = ['index', 'index_page', 'search', 'view_student', 'add_evaluation',
+          'edit_evaluation', 'import', 'export_student', 'export_all']
+# 전체 내보내기처럼 데이터 전체를 읽는 경로는 반복 횟수를 따로 둔다
+HEAVY_ROUTES = {'export_all'}
+
+
+def student_row(index):
+    """index번째 합성 학생 (같은 index는 항상 같은 값)"""
+    rnd = random.Random(index)
+    return {
+        'student_number': f'S{index:07d}',
+        'name': rnd.choice(SURNAMES) + rnd.choice(GIVEN) + rnd.choice(GIVEN),
+    }
+
+
+def evaluation_rows(index, student_id, count):
+    rnd = random.Random(-index)
+    return [
+        {
+            'student_id': student_id,
+            'subject': rnd.choice(SUBJECTS),
+            'score': rnd.randint(-5, 5),
+            'evaluation_date': date(2024, rnd.randint(1, 12), rnd.randint(1, 28)),
+            'notes': '합성 데이터' if rnd.random() < 0.3 else None,
+        }
+        for _ in range(count)
+    ]
+
+
+def grow_dataset(start, stop, evaluations_per_student, chunk_size=5000):
+    """start~stop-1번째 학생과 그 평가를 추가"""
+    student_table = Student.__table__
+    for chunk_start in range(start, stop, chunk_size):
+        indexes = range(chunk_start, min(chunk_start + chunk_size, stop))
+        db.session.execute(insert(student_table), [student_row(i) for i in indexes])
+        rows = db.session.execute(
+            select(student_table.c.id, student_table.c.student_number, student_table.c.name)
+            .where(student_table.c.student_number.between(student_row(indexes[0])['student_number'],
+                                                          student_row(indexes[-1])['student_number']))
+        ).all()
+        index_students(db.session.connection(), rows)
+        ids = {number: student_id for student_id, number, _ in rows}
+        evaluations = []
+        for i in indexes:
+            evaluations.extend(evaluation_rows(i, ids[student_row(i)['student_number']], evaluations_per_student))
+        if evaluations:
+            db.session.execute(insert(Evaluation.__table__), evaluations)
+        db.session.commit()
+    rebuild_student_stats()
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+
+
+def import_csv(batch, size):
+    lines = ['학번,이름'] + [f'B{batch:04d}{i:05d},벤치{i}' for i in range(size)]
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def remove_imported():
+    """import 경로가 추가한 학생 삭제 (측정 밖에서 실행)"""
+    student_table = Student.__table__
+    ids = list(db.session.scalars(select(student_table.c.id).where(student_table.c.student_number.like('B%'))))
+    if ids:
+        unindex_students(db.session.connection(), ids)
+        db.session.execute(delete(student_table).where(student_table.c.id.in_(ids)))
+        db.session.commit()
+
+
+class Route:
+    """경로별 요청 함수 생성 (대상 학생/평가는 시드 고정 난수로 매번 다르게 고른다)"""
+
+    def __init__(self, client, scale, rnd, import_size):
+        self.client = client
+        self.scale = scale
+        self.rnd = rnd
+        self.import_size = import_size
+        self.batch = 0
+
+    def student_id(self):
+        return self.rnd.randint(1, self.scale)
+
+    def evaluation_id(self):
+        return db.session.scalar(
+            select(Evaluation.id).where(Evaluation.student_id == self.student_id()).limit(1)
+        )
+
+    def request(self, name):
+        """(요청 함수, 요청 후 정리 함수)"""
+        client = self.client
+        if name == 'index':
+            return lambda: client.get('/'), None
+        if name == 'index_page':
+            cursor = student_row(self.rnd.randrange(self.scale))['student_number']
+            return lambda: client.get(f'/?after={cursor}'), None
+        if name == 'search':
+            name_query = student_row(self.rnd.randrange(self.scale))['name'][1:]
+            return lambda: client.get('/', query_string={'q': name_query}), None
+        if name == 'view_student':
+            student_id = self.student_id()
+            return lambda: client.get(f'/student/{student_id}'), None
+        if name == 'add_evaluation':
+            student_id = self.student_id()
+            return lambda: client.post(f'/student/{student_id}/evaluation/new', data={
+                'subject': self.rnd.choice(SUBJECTS), 'score': str(self.rnd.randint(-5, 5)),
+                'evaluation_date': '2024-12-31', 'notes': '벤치마크'
+            }), None
+        if name == 'edit_evaluation':
+            evaluation_id = self.evaluation_id()
+            return lambda: client.post(f'/evaluation/{evaluation_id}/edit', data={
+                'subject': self.rnd.choice(SUBJECTS), 'score': str(self.rnd.randint(-5, 5)),
+                'evaluation_date': '2024-06-15', 'notes': '벤치마크 수정'
+            }), None
+        if name == 'import':
+            self.batch += 1
+            payload = import_csv(self.batch, self.import_size)
+            return lambda: client.post('/students/import', data={
+                'file': (io.BytesIO(payload), 'students.csv')
+            }, content_type='multipart/form-data'), remove_imported
+        if name == 'export_student':
+            student_id = self.student_id()
+            return lambda: client.get(f'/student/{student_id}/evaluations/export'), None
+        if name == 'export_all':
+            return lambda: client.get('/evaluations/export'), None
+        raise ValueError(f'알 수 없는 경로: {name}')
+
+
+def run_route(route, name, iterations, counter):
+    latencies, queries, statuses = [], [], set()
+    # 템플릿 컴파일 등 첫 요청 비용은 제외
+    send, cleanup = route.request(name)
+    send().close()
+    if cleanup:
+        cleanup()
+
+    for _ in range(iterations):
+        send, cleanup = route.request(name)
+        counter['queries'] = 0
+        started = time.perf_counter()
+        response = send()
+        # 스트리밍 응답은 본문을 끝까지 읽어야 전체 비용이 측정된다
+        response.get_data()
+        response.close()
+        latencies.append(time.perf_counter() - started)
+        queries.append(counter['queries'])
+        statuses.add(response.status_code)
+        if cleanup:
+            cleanup()
+
+    # 최대 메모리는 tracemalloc 부하가 시간 측정에 섞이지 않도록 별도 요청으로 잰다
+    send, cleanup = route.request(name)
+    tracemalloc.start()
+    try:
+        response = send()
+        response.get_data()
+        response.close()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    if cleanup:
+        cleanup()
+
+    return {
+        'iterations': iterations,
+        'status': sorted(statuses),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2),
+        'max_ms': round(max(latencies) * 1000, 2),
+        'queries': round(statistics.mean(queries), 1),
+        'queries_max': max(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline_path):
+    """이전 결과 대비 p95/쿼리 수 변화 출력"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    print(f"\n비교 기준: {baseline_path}")
+    print(f"{'학생 수':>8} {'경로':<16} {'p95(ms)':>18} {'쿼리 수':>14} {'메모리(KB)':>22}")
+    for scale, routes in results.items():
+        for name, current in routes.items():
+            previous = baseline.get(scale, {}).get(name)
+            if not previous:
+                continue
+            ratio = current['p95_ms'] / previous['p95_ms'] if previous['p95_ms'] else 0
+            print(f"{scale:>8} {name:<16} {previous['p95_ms']:>8} → {current['p95_ms']:<7} "
+                  f"{previous['queries']:>5} → {current['queries']:<6} "
+                  f"{previous['peak_memory_kb']:>9} → {current['peak_memory_kb']:<9} x{ratio:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='라우트 벤치마크')
+    parser.add_argument('--scales', default='1000,10000,100000', help='학생 수 단계 (쉼표 구분)')
+    parser.add_argument('--evaluations', type=int, default=5, help='학생당 평가 수')
+    parser.add_argument('--iterations', type=int, default=20, help='경로별 반복 횟수')
+    parser.add_argument('--heavy-iterations', type=int, default=3, help='전체 내보내기 반복 횟수')
+    parser.add_argument('--import-size', type=int, default=500, help='가져오기 한 번의 CSV 행 수')
+    parser.add_argument('--routes', default=','.join(ROUTES), help='측정할 경로 (쉼표 구분)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 파일 경로')
+    args = parser.parse_args()
+
+    scales = sorted(int(s) for s in args.scales.split(','))
+    routes = [r.strip() for r in args.routes.split(',') if r.strip()]
+    unknown = set(routes) - set(ROUTES)
+    if unknown:
+        parser.error(f'알 수 없는 경로: {", ".join(sorted(unknown))}')
+
+    app.config['WTF_CSRF_ENABLED'] = False
+    # 가져오기는 요청 안에서 처리되도록 (백그라운드 작업 제외)
+    app.config['JOB_IMPORT_THRESHOLD'] = app.config['MAX_CONTENT_LENGTH']
+    counter = {'queries': 0}
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        counter['queries'] += 1
+
+    results = {}
+    with app.app_context():
+        upgrade_database(db)
+        ensure_search_index(db.session.connection(), Student.__table__)
+        user = User(username='bench', email='bench@example.com', is_admin=True)
+        user.set_password('bench')
+        db.session.add(user)
+        db.session.commit()
+
+        client = app.test_client()
+        client.post('/login', data={'username': 'bench', 'password': 'bench'})
+        event.listen(db.engine, 'before_cursor_execute', count_query)
+
+        current = 0
+        for scale in scales:
+            started = time.perf_counter()
+            grow_dataset(current, scale, args.evaluations)
+            current = scale
+            print(f'학생 {scale:,}명 데이터 준비: {time.perf_counter() - started:.1f}초', file=sys.stderr)
+
+            route = Route(client, scale, random.Random(args.seed), args.import_size)
+            results[str(scale)] = {}
+            for name in routes:
+                iterations = args.heavy_iterations if name in HEAVY_ROUTES else args.iterations
+                results[str(scale)][name] = run_route(route, name, iterations, counter)
+
+        event.remove(db.engine, 'before_cursor_execute', count_query)
+        db.engine.dispose()
+
+    print(f"{'학생 수':>8} {'경로':<16} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'쿼리':>6} {'메모리(KB)':>11}")
+    for scale, scale_results in results.items():
+        for name, r in scale_results.items():
+            print(f"{scale:>8} {name:<16} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9} "
+                  f"{r['queries']:>6} {r['peak_memory_kb']:>11}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'params': vars(args),
+                'environment': {
+                    'page_cache': app.config['PAGE_CACHE_ENABLED'],
+                    'python': platform.python_version(),
+                    'sqlite': sqlite3.sqlite_version,
+                    'platform': platform.platform(),
+                },
+                'results': results,
+            }, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,471 @@
+"""동시 접속 부하 테스트
+
+실제 서버(waitress 등 SERVER 설정)를 별도 프로세스로 띄우고, 여러 가상 교사가 각자 로그인한 뒤
+화면을 오가는 요청을 동시에 보내 몇 명까지 버티는지 잰다. 테스트 클라이언트가 아니라 HTTP로 요청하므로
+서버 스레드 수, 연결 처리, SQLite 쓰기 경합이 모두 측정에 들어간다.
+
+- 가상 사용자마다 교사 계정 하나로 로그인하고(CSRF 토큰 포함) 연결을 유지(keep-alive)한다.
+- 요청 구성(--mix)에 따라 학생 목록, 검색, 학생 정보, 평가 추가, 학생별 내보내기를 섞어 보낸다.
+- --rate를 주면 전체 초당 요청 수를 맞춰 보내고(열린 부하), 지연 시간은 보내려던 시각부터 잰다.
+  (서버가 밀리면 뒤 요청이 늦게 나가는 만큼도 지연 시간에 들어간다)
+  --rate가 없으면 각 사용자가 응답을 받고 --think ms(평균)만큼 쉬었다가 다음 요청을 보낸다.
+- --users에 여러 값을 주면 같은 서버에서 단계별로 늘려 가며 측정한다. (지연 시간이 무너지는 지점 확인)
+- 경로별 처리량, 오류율, p50/p95/p99/최대 지연 시간과 지연 시간 분포(히스토그램)를 보고한다.
+
+--url을 주면 이미 실행 중인 서버에 부하를 준다. (--username/--password 계정을 모든 가상 사용자가 같이 쓴다)
+주지 않으면 임시 데이터베이스에 합성 데이터(--students명, 학생당 --evaluations건)와 교사 계정을 만들고
+빈 포트에 서버를 띄웠다가 끝나면 지운다.
+
+사용법:
+    python run_load_test.py --users 5,10,20,40 --duration 30
+    python run_load_test.py --users 20 --rate 50 --duration 60 --json load.json
+    python run_load_test.py --mix index=40,search=20,view_student=30,add_evaluation=10
+    python run_load_test.py --url http://192.168.0.10:5003 --username admin --password ... --students 300
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from http.cookies import SimpleCookie
+from urllib.parse import quote, urlencode, urlsplit
+
+workdir = tempfile.mkdtemp(prefix='load_test_')
+os.environ['FLASK_ENV'] = 'development'
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'load.db')}"
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+# 측정 중에는 느린 요청/쿼리 경고를 남기지 않는다 (임시 서버도 이 환경 변수를 물려받는다)
+os.environ.setdefault('SLOW_REQUEST_MS', '600000')
+os.environ.setdefault('SLOW_QUERY_MS', '600000')
+
+from run_storage_benchmark import percentile
+
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN = '민서준지현우수연하윤도영예은재성진아원유호'
+SUBJECTS = ['국어', '수학', '영어', '과학', '사회', '체육']
+PASSWORD = 'loadtest'
+
+# 경로별 기본 비중 (교사가 쓰는 화면 비율을 흉내 낸다)
+DEFAULT_MIX = 'index=30,search=20,view_student=35,add_evaluation=10,export=5'
+ENDPOINTS = ('index', 'search', 'view_student', 'add_evaluation', 'export', 'export_all')
+# 정상 응답 코드 (평가 추가는 학생 정보로 이동, 로그인은 목록으로 이동)
+EXPECTED_STATUS = {'login': 302, 'add_evaluation': 302}
+# 지연 시간 분포 구간 상한 (ms)
+HISTOGRAM_BOUNDS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+CSRF_FIELD = re.compile(r'name="csrf_token"\s+value="([^"]+)"')
+
+
+def student_name(index):
+    rnd = random.Random(index)
+    return rnd.choice(SURNAMES) + rnd.choice(GIVEN) + rnd.choice(GIVEN)
+
+
+def seed(students, evaluations_per_student, accounts):
+    """임시 데이터베이스에 합성 학생/평가와 교사 계정 생성"""
+    from sqlalchemy import insert, select
+
+    from management_app import app, db, Student, Evaluation, User, rebuild_student_stats, upgrade_database
+    from auth import PasswordHasher
+    from search_index import ensure_search_index, index_students
+
+    rnd = random.Random(42)
+    with app.app_context():
+        upgrade_database(db)
+        ensure_search_index(db.session.connection(), Student.__table__)
+        student_table = Student.__table__
+        db.session.execute(insert(student_table), [
+            {'student_number': f'S{i:06d}', 'name': student_name(i)} for i in range(students)
+        ])
+        rows = db.session.execute(
+            select(student_table.c.id, student_table.c.student_number, student_table.c.name)
+        ).all()
+        index_students(db.session.connection(), rows)
+        evaluations = [
+            {
+                'student_id': student_id,
+                'subject': rnd.choice(SUBJECTS),
+                'score': rnd.randint(-5, 5),
+                'evaluation_date': date(2024, rnd.randint(1, 12), rnd.randint(1, 28)),
+                'notes': '합성 데이터' if rnd.random() < 0.3 else None,
+            }
+            for student_id, _, _ in rows for _ in range(evaluations_per_student)
+        ]
+        if evaluations:
+            db.session.execute(insert(Evaluation.__table__), evaluations)
+        # 해시는 한 번만 만들어 모든 계정에 쓴다 (계정마다 만들면 준비가 오래 걸린다)
+        password_hash = PasswordHasher(workers=0).generate(PASSWORD)
+        db.session.execute(insert(User.__table__), [
+            {'username': f'teacher{i}', 'email': f'teacher{i}@example.com',
+             'password_hash': password_hash, 'is_admin': False}
+            for i in range(accounts)
+        ])
+        db.session.commit()
+        rebuild_student_stats()
+        db.engine.dispose()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, server, threads, env_name):
+    """management_app.py를 별도 프로세스로 실행하고 로그인 화면이 뜰 때까지 기다림"""
+    env = dict(
+        os.environ,
+        FLASK_ENV=env_name,
+        FLASK_RUN_PORT=str(port),
+        SERVER=server,
+        SERVER_THREADS=str(threads),
+        LOG_FILE=os.path.join(workdir, 'management.log'),
+        JINJA_CACHE_DIR=os.path.join(workdir, 'jinja_cache'),
+        BACKUP_INTERVAL_HOURS='0',
+    )
+    output = open(os.path.join(workdir, 'server.out'), 'wb')
+    process = subprocess.Popen(
+        [sys.executable, 'management_app.py'], env=env, stdout=output, stderr=subprocess.STDOUT,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            output.close()
+            with open(os.path.join(workdir, 'server.out'), encoding='utf-8', errors='replace') as f:
+                raise SystemExit(f'서버 시작 실패 (종료 코드 {process.returncode}):\n{f.read()[-2000:]}')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', '/login')
+            if connection.getresponse().status == 200:
+                connection.close()
+                return process, output
+        except OSError:
+            pass
+        time.sleep(0.2)
+    stop_server(process, output)
+    raise SystemExit('서버가 60초 안에 응답하지 않습니다.')
+
+
+def stop_server(process, output):
+    """SIGTERM으로 정상 종료 (진행 중인 요청을 마치게 한다), 안 되면 강제 종료"""
+    process.terminate()
+    try:
+        process.wait(timeout=20)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    output.close()
+
+
+class Session:
+    """가상 사용자 한 명의 HTTP 연결과 쿠키 (연결은 keep-alive로 재사용)"""
+
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.https = parts.scheme == 'https'
+        self.timeout = timeout
+        self.cookies = {}
+        self.csrf_token = None
+        self.connection = None
+
+    def _connect(self):
+        connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        self.connection = connection_class(self.host, self.port, timeout=self.timeout)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def request(self, method, path, form=None):
+        """(상태 코드, 본문) - 본문은 끝까지 읽어야 다음 요청에 연결을 다시 쓸 수 있다"""
+        headers = {'Accept-Encoding': 'gzip'}
+        body = None
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        if form is not None:
+            body = urlencode(form)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        # 서버가 유휴 연결을 닫았으면 한 번만 다시 연결해 보낸다
+        for attempt in (0, 1):
+            if self.connection is None:
+                self._connect()
+            try:
+                self.connection.request(method, path, body=body, headers=headers)
+                response = self.connection.getresponse()
+                data = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.close()
+                if attempt:
+                    raise
+        for header in response.headers.get_all('Set-Cookie') or ():
+            for name, morsel in SimpleCookie(header).items():
+                self.cookies[name] = morsel.value
+        if response.will_close:
+            self.close()
+        return response.status, data
+
+    def login(self, username, password):
+        status, body = self.request('GET', '/login')
+        match = CSRF_FIELD.search(body.decode('utf-8', errors='replace'))
+        # CSRF를 끈 서버는 토큰 없이 로그인한다
+        self.csrf_token = match.group(1) if match else None
+        form = {'username': username, 'password': password}
+        if self.csrf_token:
+            form['csrf_token'] = self.csrf_token
+        return self.request('POST', '/login', form)
+
+
+class Pacer:
+    """--rate가 있으면 전체 초당 요청 수에 맞춘 다음 전송 시각을 나눠 준다"""
+
+    def __init__(self, rate, started):
+        self.interval = 1 / rate if rate else None
+        self.next = started
+        self._lock = threading.Lock()
+
+    def slot(self):
+        if self.interval is None:
+            return None
+        with self._lock:
+            scheduled = self.next
+            self.next += self.interval
+        return scheduled
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f'알 수 없는 경로: {name}')
+        mix[name] = float(weight or 1)
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError('비중이 0보다 큰 경로가 하나는 있어야 합니다.')
+    return mix
+
+
+def endpoint_request(name, rnd, students):
+    """경로 이름 → (method, path, form 여부)"""
+    student_id = rnd.randint(1, students)
+    if name == 'index':
+        return 'GET', '/', None
+    if name == 'search':
+        return 'GET', '/?q=' + quote(student_name(rnd.randrange(students))[1:]), None
+    if name == 'view_student':
+        return 'GET', f'/student/{student_id}', None
+    if name == 'add_evaluation':
+        return 'POST', f'/student/{student_id}/evaluation/new', {
+            'subject': rnd.choice(SUBJECTS), 'score': str(rnd.randint(-5, 5)),
+            'evaluation_date': date.today().isoformat(), 'notes': '부하 테스트',
+        }
+    if name == 'export':
+        return 'GET', f'/student/{student_id}/evaluations/export', None
+    if name == 'export_all':
+        return 'GET', '/evaluations/export', None
+    raise ValueError(name)
+
+
+def run_step(args, users, mix, accounts):
+    """users명이 duration초 동안 요청 (반환: 경로별 (시작 시각, 지연 시간, 성공 여부) 목록, 측정 시간)"""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    started = time.perf_counter() + 0.1
+    measure_from = started + args.ramp_up + args.warmup
+    stop_at = measure_from + args.duration
+    pacer = Pacer(args.rate, started + args.ramp_up)
+    samples = [None] * users
+
+    def worker(index):
+        rnd = random.Random(args.seed * 1000 + index)
+        session = Session(args.url, args.timeout)
+        records = []
+        # 사용자를 ramp-up 동안 고르게 나눠 접속시킨다
+        time.sleep(max(started + args.ramp_up * index / users - time.perf_counter(), 0))
+        username, password = accounts(index)
+        sent = time.perf_counter()
+        try:
+            status, _ = session.login(username, password)
+            records.append(('login', sent, time.perf_counter() - sent, status == EXPECTED_STATUS['login']))
+        except OSError:
+            records.append(('login', sent, time.perf_counter() - sent, False))
+        while True:
+            scheduled = pacer.slot()
+            if scheduled is not None:
+                time.sleep(max(scheduled - time.perf_counter(), 0))
+            if time.perf_counter() >= stop_at:
+                break
+            name = rnd.choices(names, weights)[0]
+            method, path, form = endpoint_request(name, rnd, args.students)
+            if form is not None and session.csrf_token:
+                form['csrf_token'] = session.csrf_token
+            sent = time.perf_counter()
+            # 열린 부하에서는 보내려던 시각부터 잰다 (밀려서 늦게 보낸 시간도 지연 시간)
+            origin = scheduled if scheduled is not None else sent
+            try:
+                status, _ = session.request(method, path, form)
+                ok = status == EXPECTED_STATUS.get(name, 200)
+            except OSError:
+                session.close()
+                ok = False
+            records.append((name, origin, time.perf_counter() - origin, ok))
+            if scheduled is None and args.think:
+                time.sleep(rnd.expovariate(1000 / args.think))
+        session.close()
+        samples[index] = records
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    by_endpoint = {}
+    for records in samples:
+        for name, origin, latency, ok in records:
+            # 로그인은 준비 단계에서 일어나므로 워밍업과 상관없이 모두 센다
+            if name == 'login' or measure_from <= origin < stop_at:
+                by_endpoint.setdefault(name, []).append((latency, ok))
+    return by_endpoint
+
+
+def histogram(latencies):
+    """HISTOGRAM_BOUNDS 구간별 개수 (마지막은 상한 초과)"""
+    counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+    for latency in latencies:
+        ms = latency * 1000
+        counts[next((i for i, bound in enumerate(HISTOGRAM_BOUNDS) if ms <= bound), len(HISTOGRAM_BOUNDS))] += 1
+    return counts
+
+
+def summarize(records, duration):
+    latencies = [latency for latency, _ in records]
+    errors = sum(1 for _, ok in records if not ok)
+    return {
+        'requests': len(records),
+        'requests_per_sec': round(len(records) / duration, 1),
+        'error_rate': round(errors / len(records), 4) if records else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+        'max_ms': round(max(latencies, default=0) * 1000, 1),
+        'histogram': histogram(latencies),
+    }
+
+
+def step_result(by_endpoint, duration):
+    requests = [record for name, records in by_endpoint.items() if name != 'login' for record in records]
+    result = {name: summarize(records, duration) for name, records in sorted(by_endpoint.items())}
+    result['total'] = summarize(requests, duration)
+    return result
+
+
+def print_histogram(counts, width=40):
+    labels = [f'≤{bound}ms' for bound in HISTOGRAM_BOUNDS] + [f'>{HISTOGRAM_BOUNDS[-1]}ms']
+    peak = max(counts) or 1
+    for label, count in zip(labels, counts):
+        if count:
+            print(f"  {label:>9} {'#' * max(1, round(count / peak * width)):<{width}} {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='동시 접속 부하 테스트')
+    parser.add_argument('--users', default='10', help='동시 사용자 수 (쉼표로 여러 단계)')
+    parser.add_argument('--duration', type=float, default=20, help='단계별 측정 시간(초)')
+    parser.add_argument('--ramp-up', type=float, default=2, help='사용자 접속을 나눠 시작하는 시간(초)')
+    parser.add_argument('--warmup', type=float, default=2, help='접속 후 측정에서 빼는 시간(초)')
+    parser.add_argument('--rate', type=float, help='전체 초당 요청 수 (없으면 사용자별로 응답 후 쉬었다가 요청)')
+    parser.add_argument('--think', type=float, default=200, help='--rate가 없을 때 요청 사이 평균 대기(ms)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'경로별 비중 ({", ".join(ENDPOINTS)})')
+    parser.add_argument('--timeout', type=float, default=30, help='요청 제한 시간(초)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--url', help='이미 실행 중인 서버 주소 (없으면 임시 서버 실행)')
+    parser.add_argument('--username', help='--url 서버의 로그인 계정')
+    parser.add_argument('--password', help='--url 서버의 비밀번호')
+    parser.add_argument('--students', type=int, default=2000, help='합성 학생 수 (--url이면 학생 ID 범위)')
+    parser.add_argument('--evaluations', type=int, default=10, help='학생당 합성 평가 수')
+    parser.add_argument('--server', default=os.environ.get('SERVER', 'waitress'), help='임시 서버 종류 (SERVER)')
+    parser.add_argument('--server-threads', type=int, default=int(os.environ.get('SERVER_THREADS', 16)))
+    parser.add_argument('--env', default='production', help='임시 서버의 FLASK_ENV')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    args = parser.parse_args()
+
+    try:
+        levels = [int(value) for value in args.users.split(',')]
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.url and not (args.username and args.password):
+        parser.error('--url을 쓰면 --username과 --password가 필요합니다.')
+
+    server = None
+    if args.url:
+        def accounts(index):
+            return args.username, args.password
+    else:
+        started = time.perf_counter()
+        seed(args.students, args.evaluations, max(levels))
+        print(f'학생 {args.students:,}명, 평가 {args.students * args.evaluations:,}건 준비: '
+              f'{time.perf_counter() - started:.1f}초', file=sys.stderr)
+        port = free_port()
+        server = start_server(port, args.server, args.server_threads, args.env)
+        args.url = f'http://127.0.0.1:{port}'
+
+        def accounts(index):
+            return f'teacher{index}', PASSWORD
+
+    results = {}
+    try:
+        for users in levels:
+            print(f'동시 사용자 {users}명 측정 중... ({args.duration:g}초)', file=sys.stderr)
+            results[str(users)] = step_result(run_step(args, users, mix, accounts), args.duration)
+    finally:
+        if server is not None:
+            stop_server(*server)
+
+    for users, result in results.items():
+        print(f"\n동시 사용자 {users}명" + (f" (목표 {args.rate:g}건/s)" if args.rate else ''))
+        print(f"{'경로':<16} {'요청':>7} {'요청/s':>8} {'오류율':>7} {'p50(ms)':>9} {'p95(ms)':>9} "
+              f"{'p99(ms)':>9} {'최대(ms)':>9}")
+        for name, r in result.items():
+            print(f"{name:<16} {r['requests']:>7} {r['requests_per_sec']:>8} {r['error_rate']:>7.1%} "
+                  f"{r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9} {r['max_ms']:>9}")
+        print('지연 시간 분포 (로그인 제외 전체):')
+        print_histogram(result['total']['histogram'])
+
+    if args.json:
+        params = vars(args)
+        params.pop('password', None)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'params': params,
+                'environment': {
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'cpus': os.cpu_count(),
+                },
+                'histogram_bounds_ms': HISTOGRAM_BOUNDS,
+                'results': results,
+            }, f, ensure_ascii=False, indent=2)
+    return 1 if any(r['total']['error_rate'] for r in results.values()) else 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
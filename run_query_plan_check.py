@@ -0,0 +1,161 @@
+"""쿼리 실행 계획 점검
+
+마이그레이션(migrations/)으로 만든 임시 SQLite 데이터베이스에 예시 데이터를 넣고
+주요 화면/내보내기 경로를 실제로 요청하면서 실행된 SQL을 모두 모은 뒤,
+각 SQL의 EXPLAIN QUERY PLAN에 인덱스 없는 전체 테이블 읽기(SCAN)가 있으면 실패한다.
+
+전체 학생 집계처럼 모든 행을 읽는 것이 의도된 경우는 ALLOWED_SCANS에 등록한다.
+
+사용법:
+    python run_query_plan_check.py
+    python run_query_plan_check.py --verbose   # 모든 쿼리의 실행 계획 출력
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+from datetime import date
+
+workdir = tempfile.mkdtemp(prefix='query_plan_check_')
+os.environ['FLASK_ENV'] = 'development'
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'plan.db')}"
+# 임시 데이터베이스를 지운 뒤 종료 시점에 last_login을 기록하지 않도록 바로 기록
+os.environ['AUTH_LAST_LOGIN_INTERVAL'] = '0'
+
+from flask import has_request_context, request
+from sqlalchemy import event, insert, text
+
+from management_app import app, db, Student, Evaluation, User, rebuild_student_stats, upgrade_database, ensure_search_index
+from schema import explain_query_plan, full_scans
+
+# 엔드포인트별로 전체 읽기를 허용하는 테이블
+ALLOWED_SCANS = {
+    # 대시보드 합계(전체 학생 수/평가 수)는 학생 전체를 집계한다
+    'index': {'student', 'student_stats'},
+}
+
+STUDENTS = 300
+EVALUATIONS_PER_STUDENT = 10
+
+
+def seed():
+    rnd = random.Random(42)
+    db.session.execute(insert(Student.__table__), [
+        {'student_number': f'S{i:05d}', 'name': f'학생{i}'} for i in range(1, STUDENTS + 1)
+    ])
+    db.session.execute(insert(Evaluation.__table__), [
+        {
+            'student_id': sid,
+            'subject': rnd.choice(['국어', '수학', '영어', '과학']),
+            'score': rnd.randint(-5, 5),
+            'evaluation_date': date(2024, rnd.randint(1, 12), rnd.randint(1, 28)),
+        }
+        for sid in range(1, STUDENTS + 1) for _ in range(EVALUATIONS_PER_STUDENT)
+    ])
+    user = User(username='plancheck', email='plancheck@example.com', is_admin=True)
+    user.set_password('plancheck')
+    db.session.add(user)
+    db.session.commit()
+    rebuild_student_stats()
+    ensure_search_index(db.session.connection(), Student.__table__)
+    # 마이그레이션(0003)이 기존 데이터베이스에 실행하는 것처럼 통계를 갱신
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+
+
+def exercise(client):
+    """점검 대상 경로 요청"""
+    client.post('/login', data={'username': 'plancheck', 'password': 'plancheck'})
+    client.get('/')
+    client.get('/?after=S00100')
+    client.get('/?before=S00200')
+    client.get('/?q=ㅎㅅ')
+    client.get('/?q=S0001')
+    client.get('/student/150')
+    client.get('/student/150?subject=수학')
+    client.get('/student/150?start=2024-03-01&end=2024-06-30')
+    client.get('/student/150?after=2024-06-30_1500')
+    client.get('/student/150?subject=수학&before=2024-03-01_1')
+    client.get('/student/150/evaluations/export').close()
+    client.get('/evaluations/export').close()
+    client.get('/evaluations/export?since=0').close()
+    client.post('/student/150/evaluation/new', data={
+        'subject': '수학', 'score': '5', 'evaluation_date': '2024-12-31', 'notes': ''
+    })
+    evaluation = Evaluation.query.filter_by(student_id=150).first()
+    client.post(f'/evaluation/{evaluation.id}/edit', data={
+        'subject': '국어', 'score': '-5', 'evaluation_date': '2024-12-30', 'notes': ''
+    })
+    client.post(f'/evaluation/{evaluation.id}/delete')
+    client.get('/analytics')
+    client.get('/api/analytics?start=2024-03-01&end=2024-06-30')
+    client.get('/api/students?limit=100')
+    client.get('/api/students?after=S00100&limit=100')
+    client.get('/api/evaluations?limit=100')
+    client.get('/api/evaluations?after=1000&limit=100')
+    client.get('/api/evaluations?student_id=150')
+    client.get('/api/changes?since=0&limit=100')
+    client.post('/api/evaluations/batch', json={'evaluations': [
+        {'student_id': sid, 'subject': '과학', 'score': 1, 'evaluation_date': '2024-12-31'} for sid in range(160, 190)
+    ] + [{'student_number': 'S00200', 'subject': '과학', 'score': 2, 'evaluation_date': '2024-12-31'}]})
+    client.post('/student/151/delete')
+    client.post('/students/bulk-delete', data={'prefix': 'S0029'})
+    client.post('/students/bulk-delete', data={'student_id': ['152', '153']})
+    client.post('/students/bulk-delete', data={'confirm': '1', 'targets': '290 291 292'})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='쿼리 실행 계획 점검')
+    parser.add_argument('--verbose', action='store_true', help='모든 쿼리의 실행 계획 출력')
+    args = parser.parse_args()
+
+    app.config['WTF_CSRF_ENABLED'] = False
+    statements = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if executemany or not has_request_context():
+            return
+        if not statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE', 'WITH')):
+            return
+        statements.setdefault((request.endpoint, statement), parameters)
+
+    with app.app_context():
+        upgrade_database(db)
+        seed()
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            exercise(app.test_client())
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+        tables = set(db.metadata.tables)
+        failures = []
+        with db.engine.connect() as connection:
+            for (endpoint, statement), parameters in statements.items():
+                plan = explain_query_plan(connection, statement, parameters)
+                scanned = set(full_scans(plan, tables)) - ALLOWED_SCANS.get(endpoint, set())
+                if scanned or args.verbose:
+                    print(f'[{endpoint}] {" ".join(statement.split())}')
+                    for detail in plan:
+                        print(f'    {detail}')
+                if scanned:
+                    failures.append(f'[{endpoint}] 전체 테이블 읽기: {", ".join(sorted(scanned))}')
+        db.engine.dispose()
+
+    print(f'점검한 쿼리: {len(statements)}개')
+    if failures:
+        print('쿼리 실행 계획 점검 실패:')
+        for failure in failures:
+            print(' -', failure)
+        return 1
+    print('쿼리 실행 계획 점검 통과: 전체 테이블 읽기 없음')
+    return 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -1,10 +1,22 @@
+import gzip
+import io
+import json
+import logging
+import shutil
+import sqlite3
 import sys
-from datetime import datetime, UTC
+import tempfile
+from datetime import date, datetime, timedelta, UTC
 
 import os
 os.environ['FLASK_ENV'] = 'testing'
 
-from management_app import app, db, Student, Evaluation, User
+from sqlalchemy import update
+
+from management_app import (app, db, Student, Evaluation, User, StudentStats, ChangeLog, Job, rebuild_student_stats,
+                            archive_store, job_runner, last_login_recorder, user_cache)
+from logging_config import JsonFormatter, LoggingPipeline, parse_logger_levels
+from backup import BackupManager, BackupError
 
 
 def assert_in(text, haystack, label, failures):
@@ -41,6 +53,11 @@ def main():
         if r.status_code != 200:
             failures.append(f"[login] status {r.status_code}")
         assert_in('testuser님, 환영합니다!', r.get_data(as_text=True), 'login', failures)
+        # last_login은 Core UPDATE로 기록하므로 기록 후 사용자 캐시에서 직접 지워야 한다
+        user_cache.load(db.session, User, test_user.id)
+        last_login_recorder.record(test_user.id, datetime(2030, 1, 1))
+        if user_cache.get(test_user.id) is not None:
+            failures.append('[last_login_cache] last_login 기록 후 사용자 캐시가 남아 있음')
 
         # 2) 인덱스 페이지 (로그인 후)
         r = client.get('/')
@@ -74,16 +91,26 @@ def main():
             failures.append(f"[search_number] status {r.status_code}")
         assert_in('S001', r.get_data(as_text=True), 'search_number', failures)
 
+        # 5-1) 검색: 초성 / 자모 부분 입력
+        r = client.get('/?q=ㅎㄱㄷ')
+        assert_in('홍길동', r.get_data(as_text=True), 'search_chosung', failures)
+        r = client.get('/?q=홍기')
+        assert_in('홍길동', r.get_data(as_text=True), 'search_jamo', failures)
+        r = client.get('/?q=길동')
+        assert_in('홍길동', r.get_data(as_text=True), 'search_infix', failures)
+
         # 6) CSV 전체 평가 다운로드 (학생 추가 직후에도 빈 CSV여야 함)
         r = client.get('/evaluations/export')
         if r.status_code != 200 or 'text/csv' not in r.headers.get('Content-Type', ''):
             failures.append('[export_all] CSV 응답 오류')
+        r.close()
         
         # 7) 학생 평가 다운로드 (평가 추가 후)
         if s1:
             r = client.get(f'/student/{s1.id}/evaluations/export')
             if r.status_code != 200 or 'text/csv' not in r.headers.get('Content-Type', ''):
                 failures.append('[export_student] CSV 응답 오류')
+            r.close()
 
         # 8) 학생 추가 중복 오류
         r = client.post('/student/new', data={
@@ -113,6 +140,25 @@ def main():
         }, follow_redirects=True)
         assert_in('평가가 성공적으로 추가되었습니다.', r.get_data(as_text=True), 'add_evaluation', failures)
 
+        # 10-1) 학생 통계 증분 갱신
+        stats = db.session.get(StudentStats, s1.id)
+        if not stats or stats.evaluation_count != 1 or stats.score_max != 3 or stats.subject_counts != {'수학': 1}:
+            failures.append('[student_stats] 평가 추가 후 통계 불일치')
+        rebuild_student_stats()
+        stats = db.session.get(StudentStats, s1.id)
+        if not stats or stats.evaluation_count != 1 or stats.score_sum != 3:
+            failures.append('[student_stats] 재계산 결과 불일치')
+
+        # 10-2) CSV 내보내기 내용 (스트리밍, gzip)
+        r = client.get('/evaluations/export')
+        csv_text = r.get_data().decode('utf-8-sig')
+        assert_in('S001,홍길동,수학,3', csv_text, 'export_all_rows', failures)
+        r = client.get(f'/student/{s1.id}/evaluations/export', headers={'Accept-Encoding': 'gzip'})
+        if r.headers.get('Content-Encoding') != 'gzip':
+            failures.append('[export_gzip] gzip 응답 아님')
+        else:
+            assert_in('S001,홍길동,수학,3', gzip.decompress(r.get_data()).decode('utf-8-sig'), 'export_gzip', failures)
+
         # 11) 점수 범위 오류
         r = client.post(f'/student/{s1.id}/evaluation/new', data={
             'subject': '국어',
@@ -129,6 +175,10 @@ def main():
         else:
             r = client.post(f'/evaluation/{ev.id}/delete', follow_redirects=True)
             assert_in('평가가 성공적으로 삭제되었습니다.', r.get_data(as_text=True), 'delete_evaluation', failures)
+            db.session.expire_all()
+            stats = db.session.get(StudentStats, s1.id)
+            if not stats or stats.evaluation_count != 0 or stats.score_max is not None or stats.subject_counts:
+                failures.append('[student_stats] 평가 삭제 후 통계 불일치')
 
         # 13) 학생 수정 성공
         r = client.post(f'/student/{s1.id}/edit', data={
@@ -152,6 +202,361 @@ def main():
             }, follow_redirects=True)
             assert_in('이미 존재하는 학번입니다.', r.get_data(as_text=True), 'edit_duplicate', failures)
 
+        # 14-0) 학생 CSV 일괄 등록 (헤더, 파일 내 중복, 기존 학번, 빈 행)
+        csv_bytes = '학번,이름\nS003,이영희\nS003,이영희\nS002,김철수\nS004\nS005,박민수\n'.encode('utf-8-sig')
+        r = client.post('/students/import', data={
+            'file': (io.BytesIO(csv_bytes), 'students.csv')
+        }, content_type='multipart/form-data', follow_redirects=True)
+        assert_in('CSV 처리 완료: 총 5건, 추가 2건, 건너뜀 3건', r.get_data(as_text=True), 'import_students', failures)
+        r = client.get('/?q=ㅂㅁㅅ')
+        assert_in('박민수', r.get_data(as_text=True), 'import_search_index', failures)
+        for imported in Student.query.filter(Student.student_number.in_(['S003', 'S005'])):
+            db.session.delete(imported)
+        db.session.commit()
+
+        # 14-0-1) 대용량 가져오기/전체 내보내기 백그라운드 작업
+        app.config['JOB_IMPORT_THRESHOLD'] = 0
+        csv_bytes = 'student_number,name\nS006,최민지\n'.encode('utf-8')
+        r = client.post('/students/import', data={
+            'file': (io.BytesIO(csv_bytes), 'students.csv')
+        }, content_type='multipart/form-data', follow_redirects=True)
+        assert_in('CSV 처리 완료: 총 1건, 추가 1건, 건너뜀 0건', r.get_data(as_text=True), 'import_job', failures)
+        app.config['JOB_IMPORT_THRESHOLD'] = 256 * 1024
+        db.session.delete(Student.query.filter_by(student_number='S006').first())
+        db.session.commit()
+
+        r = client.post('/evaluations/export/job', follow_redirects=False)
+        job_id = r.headers.get('Location', '').rstrip('/').split('/')[-1]
+        r = client.get(f'/jobs/{job_id}/status')
+        if r.status_code != 200 or r.get_json().get('status') != 'done':
+            failures.append(f'[export_job] 작업 상태 오류: {r.get_data(as_text=True)}')
+        else:
+            r = client.get(r.get_json()['download_url'])
+            assert_in('student_number,name,subject', r.get_data().decode('utf-8-sig'), 'export_job_download', failures)
+            r.close()
+
+        # 14-0-2) 평가 CSV 가져오기: 내보내기 형식, 학번 → id, 잘못된 행은 오류 보고서로
+        import_student = Student(student_number='R0001', name='가져오기')
+        db.session.add(import_student)
+        db.session.commit()
+        csv_bytes = ('student_number,name,subject,score,evaluation_date,notes\n'
+                     'R0001,가져오기,국어,1.0,2025-03-02,발표\n'
+                     'R0001,가져오기,수학,-2,2025-03-03,\n'
+                     'R0001,가져오기,수학,9,2025-03-04,\n'
+                     'X9999,없는학생,국어,1,2025-03-04,\n').encode('utf-8-sig')
+        r = client.post('/evaluations/import', data={
+            'file': (io.BytesIO(csv_bytes), 'evaluations.csv')
+        }, content_type='multipart/form-data', follow_redirects=True)
+        assert_in('평가 CSV 가져오기 완료: 총 4건, 추가 2건, 오류 2건', r.get_data(as_text=True), 'import_evaluations', failures)
+        job_id = r.request.path.rstrip('/').split('/')[-1]
+        r = client.get(f'/jobs/{job_id}/download')
+        report = r.get_data().decode('utf-8-sig')
+        r.close()
+        if 'R0001,가져오기,수학,9,2025-03-04,,4,점수는' not in report or '존재하지 않는 학번입니다: X9999' not in report:
+            failures.append(f'[import_evaluations_report] {report}')
+        db.session.expire_all()
+        stats = db.session.get(StudentStats, import_student.id)
+        if not stats or stats.evaluation_count != 2 or stats.score_sum != -1 or stats.subject_counts != {'국어': 1, '수학': 1}:
+            failures.append('[import_evaluations_stats] 학생 통계가 갱신되지 않음')
+        db.session.delete(import_student)
+        db.session.commit()
+
+        # 14-0-3) 재시작 전에 대기/실행 중이던 작업은 실패로 바꾸고 남은 업로드 파일을 지운다
+        stale = [Job(id=f'stale{status}', kind='import_students', status=status, user_id=test_user.id)
+                 for status in ('queued', 'running')]
+        db.session.add_all(stale)
+        db.session.commit()
+        orphan = job_runner.upload_path()
+        open(orphan, 'wb').close()
+        if job_runner.recover_interrupted() != 2 or os.path.exists(orphan):
+            failures.append('[job_recover] 중단된 작업/업로드 파일이 정리되지 않음')
+        r = client.get('/jobs/stalequeued/status')
+        if r.get_json().get('status') != 'failed' or '다시 시작' not in (r.get_json().get('message') or ''):
+            failures.append(f'[job_recover_status] {r.get_data(as_text=True)}')
+        for job in stale:
+            db.session.delete(job)
+        db.session.commit()
+
+        # 14-1) 학생 목록 키셋 페이지네이션
+        app.config['STUDENTS_PER_PAGE'] = 1
+        r = client.get('/')
+        body = r.get_data(as_text=True)
+        assert_in('after=S001', body, 'index_page_next', failures)
+        r = client.get('/?after=S001')
+        body = r.get_data(as_text=True)
+        assert_in('S002', body, 'index_page_2', failures)
+        assert_in('before=S002', body, 'index_page_prev', failures)
+        app.config['STUDENTS_PER_PAGE'] = 50
+
+        # 14-1-1) 화면 캐시: 변경이 없으면 304, 평가가 추가되면 다시 렌더링
+        r = client.get(f'/student/{s1.id}')
+        etag = r.headers.get('ETag', '').strip('"')
+        if not etag or not r.headers.get('Last-Modified'):
+            failures.append('[page_cache] ETag/Last-Modified 헤더 누락')
+        r = client.get(f'/student/{s1.id}', headers={'If-None-Match': f'"{etag}"'})
+        if r.status_code != 304:
+            failures.append(f"[page_cache_304] status {r.status_code}")
+        client.post(f'/student/{s1.id}/evaluation/new', data={
+            'subject': '영어', 'score': '1', 'evaluation_date': today, 'notes': ''
+        }, follow_redirects=True)
+        r = client.get(f'/student/{s1.id}', headers={'If-None-Match': f'"{etag}"'})
+        if r.status_code != 200:
+            failures.append(f"[page_cache_invalidate] status {r.status_code}")
+        assert_in('영어', r.get_data(as_text=True), 'page_cache_invalidate', failures)
+
+        # 14-1-2) JSON API: 평가 일괄 등록(전부 검증 후 한 트랜잭션), 커서 페이지네이션 조회
+        before_count = Evaluation.query.filter_by(student_id=s1.id).count()
+        r = client.post('/api/evaluations/batch', json={'evaluations': [
+            {'student_id': s1.id, 'subject': '과학', 'score': 2, 'evaluation_date': today},
+            {'student_number': 'S001', 'subject': '과학', 'score': 9, 'evaluation_date': today},
+        ]})
+        if r.status_code != 400 or r.get_json()['errors'][0]['index'] != 1:
+            failures.append(f'[api_batch_invalid] {r.status_code} {r.get_data(as_text=True)}')
+        r = client.post('/api/evaluations/batch', json={'evaluations': [
+            {'student_id': s1.id, 'subject': '과학', 'score': 2, 'evaluation_date': today},
+            {'student_number': 'S001', 'subject': '과학', 'score': -1, 'evaluation_date': today, 'notes': '일괄'},
+        ]})
+        if r.status_code != 201 or r.get_json()['created'] != 2:
+            failures.append(f'[api_batch] {r.status_code} {r.get_data(as_text=True)}')
+        if Evaluation.query.filter_by(student_id=s1.id).count() != before_count + 2:
+            failures.append('[api_batch] 평가 저장 수 불일치')
+        db.session.expire_all()
+        if s1.stats.subject_counts.get('과학') != 2:
+            failures.append(f'[api_batch_stats] {s1.stats.subject_counts}')
+        r = client.get(f'/api/evaluations?student_id={s1.id}&limit=1')
+        data = r.get_json()
+        if len(data['evaluations']) != 1 or not data['next_cursor']:
+            failures.append(f'[api_evaluations] {data}')
+        else:
+            r = client.get(f'/api/evaluations?student_id={s1.id}&limit=100&after={data["next_cursor"]}')
+            if len(r.get_json()['evaluations']) != before_count + 1:
+                failures.append(f'[api_evaluations_page_2] {r.get_json()}')
+        r = client.get('/api/students?limit=1')
+        data = r.get_json()
+        if data['students'][0]['student_number'] != 'S001' or data['next_cursor'] != 'S001':
+            failures.append(f'[api_students] {data}')
+        app.config['WTF_CSRF_ENABLED'] = True
+        r = client.post('/api/evaluations/batch', json={'evaluations': []})
+        if r.status_code != 400 or 'CSRF' not in r.get_json().get('error', ''):
+            failures.append(f'[api_csrf] {r.status_code}')
+        app.config['WTF_CSRF_ENABLED'] = False
+
+        # 14-1-3) 평가 분석: 과목별 분포/평균, 순위, 쓰기 후 캐시 무효화
+        r = client.get('/analytics')
+        assert_in('과목별 분석', r.get_data(as_text=True), 'analytics', failures)
+        r = client.get('/api/analytics')
+        report = r.get_json()
+        science = [item for item in report['subjects'] if item['subject'] == '과학']
+        if not science or science[0]['count'] != 2 or science[0]['average'] != 0.5 or science[0]['median'] != 0.5:
+            failures.append(f'[analytics_subjects] {report["subjects"]}')
+        if report['overview']['evaluations'] != Evaluation.query.count():
+            failures.append(f'[analytics_overview] {report["overview"]}')
+        client.post('/api/evaluations/batch', json={'evaluations': [
+            {'student_id': s1.id, 'subject': '과학', 'score': 5, 'evaluation_date': today},
+        ]})
+        report = client.get('/api/analytics').get_json()
+        ranking = report['rankings']['top']
+        if not ranking or ranking[0]['student_number'] != 'S001' or ranking[0]['rank'] != 1:
+            failures.append(f'[analytics_rankings] {report["rankings"]}')
+        r = client.get('/api/analytics?start=2000-01-01&end=2000-12-31')
+        if r.get_json()['overview']['evaluations'] != 0:
+            failures.append('[request_date_range] 기간 밖 평가가 집계됨')
+        r = client.get('/api/analytics?start=2024-13-01')
+        if r.status_code != 400:
+            failures.append(f'[analytics_invalid_date] status {r.status_code}')
+
+        # 14-1-4) 증분 내보내기: 전체 내보내기의 워터마크 이후 추가/수정/삭제된 평가만
+        r = client.get('/evaluations/export')
+        watermark = r.headers.get('X-Watermark')
+        r.close()
+        if not watermark:
+            failures.append('[export_watermark] X-Watermark 헤더 없음')
+        else:
+            client.post(f'/student/{s1.id}/evaluation/new', data={
+                'subject': '음악', 'score': '2', 'evaluation_date': today, 'notes': '증분'
+            })
+            added = Evaluation.query.filter_by(student_id=s1.id, subject='음악').first()
+            removed = Evaluation.query.filter_by(student_id=s1.id, subject='과학').first()
+            client.post(f'/evaluation/{removed.id}/delete')
+            r = client.get(f'/evaluations/export?since={watermark}')
+            delta = r.get_data().decode('utf-8-sig')
+            assert_in(f'upsert,{added.id},S001,', delta, 'export_delta_upsert', failures)
+            assert_in(f'delete,{removed.id},', delta, 'export_delta_delete', failures)
+            next_watermark = r.headers.get('X-Watermark')
+            if not next_watermark or int(next_watermark) <= int(watermark):
+                failures.append(f'[export_delta_watermark] {watermark} -> {next_watermark}')
+            else:
+                r = client.get(f'/evaluations/export?since={next_watermark}')
+                if r.get_data().decode('utf-8-sig').strip().count('\n') != 0:
+                    failures.append('[export_delta_empty] 변경이 없는데 행이 내보내짐')
+                changes = client.get(f'/api/changes?since={watermark}').get_json()
+                if [c['operation'] for c in changes['changes']] != ['upsert', 'delete'] or \
+                        changes['next_watermark'] != int(next_watermark):
+                    failures.append(f'[api_changes] {changes}')
+        r = client.get('/evaluations/export?since=abc')
+        if r.status_code != 400:
+            failures.append(f'[export_delta_invalid] status {r.status_code}')
+
+        # 14-1-5) 정적 파일: 내용 해시 주소는 장기 캐시, gzip 변형, 조건부 요청 304
+        page = client.get('/').get_data(as_text=True)
+        start = page.find('/static/css/app.css?v=')
+        if start < 0:
+            failures.append('[static_url] 공통 CSS 해시 주소 없음')
+        else:
+            asset = page[start:page.index('"', start)]
+            r = client.get(asset)
+            if r.status_code != 200 or 'immutable' not in r.headers.get('Cache-Control', ''):
+                failures.append(f"[static_cache] {r.status_code} {r.headers.get('Cache-Control')}")
+            plain = r.get_data()
+            r = client.get(asset, headers={'Accept-Encoding': 'gzip'})
+            if r.headers.get('Content-Encoding') != 'gzip' or gzip.decompress(r.get_data()) != plain:
+                failures.append('[static_gzip] gzip 변형 오류')
+            r = client.get(asset, headers={'Accept-Encoding': 'gzip', 'If-None-Match': r.headers.get('ETag', '')})
+            if r.status_code != 304:
+                failures.append(f'[static_304] status {r.status_code}')
+        if client.get('/static/../config.py').status_code != 404:
+            failures.append('[static_path] static 밖의 파일 접근')
+
+        # 14-1-6) 학년도 보관: 지난 학년도를 보관 파일로 옮기고 ATTACH 조회/CSV 내보내기 후 되돌리기
+        archive_dir = tempfile.mkdtemp(prefix='smoke_archive_')
+        archive_store.directory = archive_dir
+        old = Student(student_number='19990001', name='졸업생', created_at=datetime(2001, 3, 2))
+        db.session.add(old)
+        db.session.flush()
+        db.session.add(Evaluation(student_id=old.id, subject='국어', score=2, evaluation_date=date(2001, 5, 1)))
+        # 보관 파일에 복사한 뒤 운영 DB에서 지우기 전에 수정된 평가는 학생과 함께 남아야 한다
+        edited = Student(student_number='19990002', name='수정학생', created_at=datetime(2001, 3, 2))
+        db.session.add(edited)
+        db.session.flush()
+        edited_evaluation = Evaluation(student_id=edited.id, subject='수학', score=1, evaluation_date=date(2001, 6, 1))
+        db.session.add(edited_evaluation)
+        db.session.commit()
+        edited_id = edited_evaluation.id
+        write_info = archive_store._write_info
+
+        def edit_after_copy(connection, year):
+            write_info(connection, year)
+            connection.execute(update(Evaluation.__table__).where(Evaluation.__table__.c.id == edited_id)
+                               .values(score=5, last_modified=datetime.utcnow() + timedelta(seconds=1)))
+
+        # 평가가 없는 학생은 보관할 때 옮기거나 지우지 않는다
+        db.session.add(Student(student_number='19990003', name='평가없음', created_at=datetime(2001, 3, 2)))
+        db.session.commit()
+        archive_store._write_info = edit_after_copy
+        watermark = db.session.query(db.func.max(ChangeLog.id)).scalar()
+        try:
+            moved = archive_store.archive_year(2001, move_students=True)
+        finally:
+            del archive_store._write_info
+        db.session.expire_all()
+        # 보관 파일로 옮긴 평가/학생은 증분 내보내기에 삭제로 나타나지 않는다 (수정은 그대로 기록)
+        archived_changes = {(c.entity, c.operation) for c in ChangeLog.query.filter(ChangeLog.id > watermark)}
+        if archived_changes != {('evaluation', 'upsert')}:
+            failures.append(f'[archive_change_log] {archived_changes}')
+        if moved != {'evaluations': 1, 'students': 1} or Student.query.filter_by(student_number='19990001').count():
+            failures.append(f'[archive_year] {moved}')
+        kept = db.session.get(Evaluation, edited_id)
+        if kept is None or kept.score != 5 or Student.query.filter_by(student_number='19990002').count() != 1:
+            failures.append('[archive_edited] 복사 후 수정된 평가/학생이 삭제됨')
+        if Student.query.filter_by(student_number='19990003').count() != 1:
+            failures.append('[archive_no_evaluations] 평가가 없는 학생이 삭제됨')
+        assert_in('2001학년도', client.get('/archives').get_data(as_text=True), 'archives', failures)
+        assert_in('졸업생', client.get('/archives/2001?q=졸업').get_data(as_text=True), 'archive_students', failures)
+        r = client.get('/archives/2001/students/19990001')
+        assert_in('2001년 05월 01일', r.get_data(as_text=True), 'archive_student', failures)
+        r = client.get('/evaluations/export?year=2001')
+        assert_in('19990001,졸업생,국어,2.0,2001-05-01', r.get_data(as_text=True), 'archive_export', failures)
+        if client.get('/evaluations/export?year=2000').status_code != 404:
+            failures.append('[archive_missing] 없는 학년도 404 아님')
+        watermark = db.session.query(db.func.max(ChangeLog.id)).scalar()
+        restored = archive_store.restore_year(2001)
+        if ChangeLog.query.filter(ChangeLog.id > watermark).count():
+            failures.append('[restore_change_log] 원래 id로 되돌린 행이 변경으로 기록됨')
+        if restored != {'evaluations': 1, 'students': 1} or Student.query.filter_by(student_number='19990001').count() != 1:
+            failures.append(f'[restore_year] {restored}')
+        kept = db.session.get(Evaluation, edited_id)
+        if kept.score != 5:
+            failures.append('[restore_edited] 되돌리기가 수정된 평가를 덮어씀')
+        # 학생 삭제 시 CASCADE로 지워지는 평가가 세션에 남지 않도록
+        db.session.expunge(kept)
+        db.session.delete(Student.query.filter_by(student_number='19990001').one())
+        db.session.delete(Student.query.filter_by(student_number='19990002').one())
+        db.session.delete(Student.query.filter_by(student_number='19990003').one())
+        db.session.commit()
+        # 기본(학생 옮기기 없음): 그 학년도 평가만 있는 재학생도 명단에 남는다
+        current = Student(student_number='20020001', name='재학생', created_at=datetime(2002, 3, 2))
+        db.session.add(current)
+        db.session.flush()
+        db.session.add(Evaluation(student_id=current.id, subject='국어', score=1, evaluation_date=date(2002, 4, 1)))
+        db.session.commit()
+        moved = archive_store.archive_year(2002)
+        db.session.expire_all()
+        if moved != {'evaluations': 1, 'students': 0} or Student.query.filter_by(student_number='20020001').count() != 1:
+            failures.append(f'[archive_keep_students] {moved}')
+        db.session.delete(Student.query.filter_by(student_number='20020001').one())
+        db.session.commit()
+        shutil.rmtree(archive_dir, ignore_errors=True)
+
+        # 14-1-7) 학생 평가 기록: 평가일 역순 키셋 페이지, 과목/기간 필터, 과목별 집계
+        history_student = Student(student_number='H0001', name='기록학생')
+        db.session.add(history_student)
+        db.session.commit()
+        client.post('/api/evaluations/batch', json={'evaluations': [
+            {'student_id': history_student.id, 'subject': '국어' if day % 2 else '수학', 'score': 1 if day % 2 else -1,
+             'evaluation_date': f'2024-05-{day:02d}'} for day in range(1, 8)
+        ]})
+        app.config['EVALUATIONS_PER_PAGE'] = 3
+        body = client.get(f'/student/{history_student.id}').get_data(as_text=True)
+        if '2024년 05월 07일' not in body or '2024년 05월 04일' in body.split('과목별 통계')[0]:
+            failures.append('[history_page_1] 최근 3건만 보여야 함')
+        assert_in('after=2024-05-05_', body, 'history_next', failures)
+        assert_in('평균 1.0', body, 'history_subject_summary', failures)
+        assert_in('평균 -1.0', body, 'history_subject_summary', failures)
+        r = client.get(f'/student/{history_student.id}?subject=국어&start=2024-05-02&end=2024-05-06')
+        body = r.get_data(as_text=True).split('과목별 통계')[0]
+        if '2024년 05월 05일' not in body or '2024년 05월 03일' not in body or '2024년 05월 06일' in body:
+            failures.append('[history_filter] 과목/기간 필터 오류')
+        r = client.get(f'/student/{history_student.id}?start=2024-13-01')
+        assert_in('날짜 형식이 올바르지 않습니다.', r.get_data(as_text=True), 'history_bad_date', failures)
+        app.config['EVALUATIONS_PER_PAGE'] = 20
+
+        # 14-1-8) 학생 일괄 삭제: 학번 접두사 → 확인 화면 → ON DELETE CASCADE로 평가/통계까지 삭제
+        db.session.add(Student(student_number='H0002', name='기록학생2'))
+        db.session.commit()
+        history_ids = [history_student.id, Student.query.filter_by(student_number='H0002').one().id]
+        watermark = db.session.query(db.func.max(ChangeLog.id)).scalar()
+        r = client.post('/students/bulk-delete', data={'prefix': 'H000'})
+        assert_in('학생 <strong>2명</strong>과 평가 <strong>7건</strong>', r.get_data(as_text=True), 'bulk_delete_preview', failures)
+        r = client.post('/students/bulk-delete', data={'confirm': '1', 'targets': ' '.join(map(str, history_ids))},
+                        follow_redirects=True)
+        assert_in('학생 2명과 평가 7건을 삭제했습니다.', r.get_data(as_text=True), 'bulk_delete', failures)
+        db.session.expire_all()
+        if Evaluation.query.filter(Evaluation.student_id.in_(history_ids)).count() or \
+                StudentStats.query.filter(StudentStats.student_id.in_(history_ids)).count():
+            failures.append('[bulk_delete_cascade] 평가/통계가 남아 있음')
+        # CASCADE로 지워진 평가도 트리거가 변경 기록에 남긴다 (평가 7건 + 학생 2명)
+        deleted = ChangeLog.query.filter(ChangeLog.id > watermark, ChangeLog.operation == 'delete').count()
+        if deleted != 9:
+            failures.append(f'[bulk_delete_change_log] 삭제 기록 {deleted}건')
+        # 확인 화면을 두 번 제출하면 이미 지운 학생만 남는다
+        r = client.post('/students/bulk-delete', data={'confirm': '1', 'targets': ' '.join(map(str, history_ids))},
+                        follow_redirects=True)
+        assert_in('삭제할 학생이 없습니다.', r.get_data(as_text=True), 'bulk_delete_twice', failures)
+
+        # 14-2) 성능 계측: Server-Timing 헤더, /metrics (관리자 전용)
+        r = client.get('/')
+        assert_in('db;dur=', r.headers.get('Server-Timing', ''), 'server_timing', failures)
+        r = client.get('/metrics')
+        if r.status_code != 403:
+            failures.append(f"[metrics_forbidden] status {r.status_code}")
+        test_user.is_admin = True
+        db.session.commit()
+        r = client.get('/metrics')
+        assert_in('http_request_duration_seconds_bucket{endpoint="index",method="GET",le="+Inf"}',
+                  r.get_data(as_text=True), 'metrics', failures)
+        test_user.is_admin = False
+        db.session.commit()
+
         # 15) 학생 삭제
         r = client.post(f'/student/{s1.id}/delete', follow_redirects=True)
         assert_in('학생이 성공적으로 삭제되었습니다.', r.get_data(as_text=True), 'delete_student', failures)
@@ -166,6 +571,67 @@ def main():
         r = client.get('/', follow_redirects=False)
         if r.status_code != 302:  # 리다이렉트
             failures.append(f"[unauthorized_access] status {r.status_code}")
+        r = client.get('/api/students')
+        if r.status_code != 401:
+            failures.append(f"[api_unauthorized] status {r.status_code}")
+
+    # 18) 로깅: 대기열을 거쳐 기록 스레드가 JSON 한 줄로 기록, 로거별 레벨 파싱
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter())
+    smoke_logger = logging.getLogger('smoke.logging')
+    smoke_logger.propagate = False
+    pipeline = LoggingPipeline([handler], queue_size=10, logger=smoke_logger)
+    pipeline.start()
+    smoke_logger.warning('느린 요청: %s %.0fms', '/students', 612.4, extra={'duration_ms': 612.4})
+    pipeline.stop()
+    try:
+        entry = json.loads(stream.getvalue().splitlines()[0])
+        if entry['message'] != '느린 요청: /students 612ms' or entry['duration_ms'] != 612.4:
+            failures.append(f'[logging_json] {entry}')
+    except (IndexError, ValueError) as e:
+        failures.append(f'[logging_json] {e}')
+    # 대기열에 넣을 때 합친 메시지/예외는 복사본에만 적용 (같은 레코드를 받는 다른 핸들러용 원본 유지)
+    try:
+        raise ValueError('smoke')
+    except ValueError:
+        record = smoke_logger.makeRecord('smoke.logging', logging.ERROR, __file__, 0, '실패: %s', ('x',), sys.exc_info())
+    prepared = pipeline.handler.prepare(record)
+    if record.args != ('x',) or record.exc_info is None or prepared.args or 'ValueError' not in prepared.exc_text:
+        failures.append('[logging_prepare] 원래 로그 레코드가 바뀜')
+    if parse_logger_levels('sqlalchemy.engine=info, werkzeug=WARNING,bad') != {
+            'sqlalchemy.engine': 'INFO', 'werkzeug': 'WARNING'}:
+        failures.append('[logging_levels] LOG_LEVELS 파싱 오류')
+
+    # 19) 온라인 백업: 단계별 복사 + 무결성 검사, 보관 개수 정리, 검사 후 되돌리기
+    backup_dir = tempfile.mkdtemp(prefix='smoke_backup_')
+    db_path = os.path.join(backup_dir, 'live.db')
+    live = sqlite3.connect(db_path)
+    live.execute('PRAGMA journal_mode=WAL')
+    live.execute('CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)')
+    live.executemany('INSERT INTO t (v) VALUES (?)', [('x' * 100,)] * 500)
+    live.commit()
+    manager = BackupManager(db_path, os.path.join(backup_dir, 'backups'), keep=2, pages=4, sleep=0)
+    first = manager.backup()
+    manager.backup()
+    manager.backup()
+    if len(manager.backups()) != 2 or os.path.exists(first):
+        failures.append(f'[backup_rotate] {manager.backups()}')
+    live.execute('DELETE FROM t')
+    live.commit()
+    restored, before = manager.restore('latest')
+    if live.execute('SELECT COUNT(*) FROM t').fetchone()[0] != 500 or not os.path.exists(before):
+        failures.append('[backup_restore] 되돌린 데이터가 다름')
+    broken = os.path.join(backup_dir, 'broken.db')
+    with open(broken, 'wb') as f:
+        f.write(b'not a database' * 100)
+    try:
+        manager.restore(broken)
+        failures.append('[backup_verify] 손상된 백업을 거부하지 않음')
+    except BackupError:
+        pass
+    live.close()
+    shutil.rmtree(backup_dir, ignore_errors=True)
 
     print_result(failures)
     return 0 if not failures else 1
@@ -0,0 +1,111 @@
+"""시작 시간 벤치마크
+
+매번 새 Python 프로세스에서 management_app을 불러와 다음 구간을 잰다.
+- 불러오기: import management_app (Flask/SQLAlchemy, 모델/라우트 정의)
+- 초기화: create_app() (로깅, 스키마 확인/업그레이드, 기본 계정, 템플릿 캐시)
+- 첫 요청: 로그인 화면 GET /login (템플릿 컴파일 또는 바이트코드 캐시 읽기)
+- 전체: 프로세스 시작부터 첫 응답까지 (인터프리터 시작 포함)
+
+상황별로 비교한다.
+- 처음 실행: 데이터베이스와 템플릿 캐시가 없는 상태 (마이그레이션 전체 실행)
+- 다시 실행: 최신 데이터베이스 + 템플릿 캐시 (USB에서 매일 실행하는 경우)
+- 다시 실행(캐시 없음): 최신 데이터베이스, 템플릿 바이트코드 캐시 사용 안 함
+
+사용법:
+    python run_startup_benchmark.py --runs 5
+    python run_startup_benchmark.py --json startup_benchmark.json
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PHASES = ('import', 'init', 'first_request', 'total')
+
+
+def child():
+    """새 프로세스에서 한 번 측정하고 결과를 JSON으로 출력"""
+    started = time.perf_counter()
+    import management_app
+    imported = time.perf_counter()
+    app = management_app.create_app()
+    initialized = time.perf_counter()
+    response = app.test_client().get('/login')
+    responded = time.perf_counter()
+    if response.status_code != 200:
+        raise SystemExit(f'첫 요청 실패: {response.status_code}')
+    print(json.dumps({
+        'import': imported - started,
+        'init': initialized - imported,
+        'first_request': responded - initialized,
+    }))
+
+
+def measure(workdir, jinja_cache):
+    env = dict(
+        os.environ,
+        FLASK_ENV='production',
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'data', 'management.db')}",
+        JINJA_CACHE_DIR=os.path.join(workdir, 'jinja_cache') if jinja_cache else '',
+        LOG_LEVEL='WARNING',
+        BACKUP_INTERVAL_HOURS='0',
+        LOG_FILE=os.path.join(workdir, 'management.log'),
+    )
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child'],
+        env=env, capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['total'] = time.perf_counter() - started
+    return result
+
+
+def summarize(samples):
+    return {phase: round(statistics.median(s[phase] for s in samples) * 1000, 1) for phase in PHASES}
+
+
+def benchmark(runs):
+    scenarios = {'cold': [], 'warm': [], 'warm_no_cache': []}
+    for _ in range(runs):
+        workdir = tempfile.mkdtemp(prefix='startup_bench_')
+        try:
+            scenarios['cold'].append(measure(workdir, jinja_cache=True))
+            scenarios['warm'].append(measure(workdir, jinja_cache=True))
+            scenarios['warm_no_cache'].append(measure(workdir, jinja_cache=False))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return {name: summarize(samples) for name, samples in scenarios.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='시작 시간 벤치마크')
+    parser.add_argument('--runs', type=int, default=5, help='상황별 반복 횟수 (중앙값 보고)')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return 0
+
+    results = benchmark(args.runs)
+    labels = {'cold': '처음 실행', 'warm': '다시 실행', 'warm_no_cache': '다시 실행(캐시 없음)'}
+    print(f"{'상황':<14} {'불러오기':>9} {'초기화':>9} {'첫 요청':>9} {'전체(ms)':>9}")
+    for name, result in results.items():
+        print(f"{labels[name]:<14} {result['import']:>9} {result['init']:>9} "
+              f"{result['first_request']:>9} {result['total']:>9}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'params': {'runs': args.runs}, 'results': results}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""SQLite 저장소 설정 벤치마크
+
+기본 설정(롤백 저널, PRAGMA 없음)과 storage.py 설정(WAL + PRAGMA + 쓰기 직렬화)을
+같은 데이터/같은 부하로 비교한다. 읽기 스레드는 학생 목록 페이지 쿼리를,
+쓰기 스레드는 평가 추가(평가 INSERT + 학생 통계 UPDATE) 트랜잭션을 반복한다.
+
+사용법:
+    python run_storage_benchmark.py --readers 8 --writers 4 --seconds 10
+    python run_storage_benchmark.py --json storage_benchmark.json
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+os.environ.setdefault('FLASK_ENV', 'testing')
+
+from sqlalchemy import create_engine, func, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from management_app import db, Student, Evaluation, StudentStats
+from storage import configure_engine, WriteSerializer, DEFAULT_PRAGMAS
+
+
+def seed(engine, students, evaluations_per_student):
+    """재현 가능한 데이터 생성"""
+    rnd = random.Random(42)
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Student.__table__), [
+            {'student_number': f'S{i:06d}', 'name': f'학생{i}'} for i in range(students)
+        ])
+        conn.execute(insert(Evaluation.__table__), [
+            {
+                'student_id': sid,
+                'subject': rnd.choice(['국어', '수학', '영어', '과학']),
+                'score': rnd.randint(-5, 5),
+                'evaluation_date': date(2024, rnd.randint(1, 12), rnd.randint(1, 28)),
+            }
+            for sid in range(1, students + 1) for _ in range(evaluations_per_student)
+        ])
+        conn.execute(insert(StudentStats.__table__), [
+            {'student_id': sid, 'evaluation_count': evaluations_per_student, 'score_sum': 0, 'subject_counts': {}}
+            for sid in range(1, students + 1)
+        ])
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def run_load(engine, serializer, students, readers, writers, seconds):
+    stop = threading.Event()
+    lock = threading.Lock()
+    results = {'read': [], 'write': [], 'read_errors': 0, 'write_errors': 0}
+
+    def reader(seed_value):
+        rnd = random.Random(seed_value)
+        latencies, errors = [], 0
+        while not stop.is_set():
+            cursor = f'S{rnd.randrange(students):06d}'
+            started = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.execute(
+                        select(Student.id, Student.student_number, func.coalesce(StudentStats.evaluation_count, 0))
+                        .outerjoin(StudentStats, StudentStats.student_id == Student.id)
+                        .where(Student.student_number > cursor)
+                        .order_by(Student.student_number).limit(50)
+                    ).all()
+                latencies.append(time.perf_counter() - started)
+            except OperationalError:
+                errors += 1
+        with lock:
+            results['read'].extend(latencies)
+            results['read_errors'] += errors
+
+    def writer(seed_value):
+        rnd = random.Random(seed_value)
+        latencies, errors = [], 0
+        while not stop.is_set():
+            student_id = rnd.randint(1, students)
+            started = time.perf_counter()
+            try:
+                with Session(engine) as session:
+                    session.execute(insert(Evaluation.__table__).values(
+                        student_id=student_id, subject='수학', score=1, evaluation_date=date.today()
+                    ))
+                    session.execute(
+                        update(StudentStats.__table__)
+                        .where(StudentStats.student_id == student_id)
+                        .values(evaluation_count=StudentStats.evaluation_count + 1)
+                    )
+                    session.commit()
+                latencies.append(time.perf_counter() - started)
+            except (OperationalError, TimeoutError):
+                errors += 1
+        with lock:
+            results['write'].extend(latencies)
+            results['write_errors'] += errors
+
+    if serializer is not None:
+        serializer.install(Session)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(1000 + i,)) for i in range(writers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    def summary(kind):
+        values = results[kind]
+        return {
+            'ops': len(values),
+            'ops_per_sec': round(len(values) / seconds, 1),
+            'errors': results[f'{kind}_errors'],
+            'p50_ms': round(percentile(values, 50) * 1000, 2),
+            'p95_ms': round(percentile(values, 95) * 1000, 2),
+            'mean_ms': round(statistics.mean(values) * 1000, 2) if values else 0.0,
+        }
+
+    return {'read': summary('read'), 'write': summary('write')}
+
+
+def benchmark(mode, args):
+    workdir = tempfile.mkdtemp(prefix='storage_bench_')
+    path = os.path.join(workdir, 'bench.db')
+    serializer = None
+    try:
+        if mode == 'default':
+            engine = create_engine(f'sqlite:///{path}', connect_args={'timeout': 5})
+        else:
+            engine = create_engine(
+                f'sqlite:///{path}',
+                pool_size=args.readers + args.writers,
+                max_overflow=10,
+                connect_args={'timeout': 30}
+            )
+            configure_engine(engine, DEFAULT_PRAGMAS)
+            serializer = WriteSerializer(timeout=30)
+        seed(engine, args.students, args.evaluations)
+        result = run_load(engine, serializer, args.students, args.readers, args.writers, args.seconds)
+        engine.dispose()
+        return result
+    finally:
+        if serializer is not None:
+            serializer.uninstall(Session)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite 저장소 설정 벤치마크')
+    parser.add_argument('--students', type=int, default=2000)
+    parser.add_argument('--evaluations', type=int, default=10, help='학생당 평가 수')
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    args = parser.parse_args()
+
+    results = {}
+    for mode in ('default', 'tuned'):
+        results[mode] = benchmark(mode, args)
+
+    print(f"{'설정':<8} {'종류':<6} {'처리량/s':>10} {'오류':>6} {'p50(ms)':>9} {'p95(ms)':>9}")
+    for mode, result in results.items():
+        for kind in ('read', 'write'):
+            r = result[kind]
+            print(f"{mode:<8} {kind:<6} {r['ops_per_sec']:>10} {r['errors']:>6} {r['p50_ms']:>9} {r['p95_ms']:>9}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'params': vars(args), 'results': results}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""데이터베이스 스키마 관리 (Flask-Migrate/Alembic)
+
+- 스키마 변경은 migrations/versions의 리비전으로 관리한다.
+- 마이그레이션 도입 전에 db.create_all()로 만들어진 management.db는 초기 리비전(0001)으로
+  표시(stamp)한 뒤 나머지 리비전을 적용해 그 자리에서 업그레이드한다.
+- 학생 검색 색인(FTS5 가상 테이블)은 학생 테이블로 다시 만들 수 있는 파생 데이터이므로
+  마이그레이션 대상에서 제외한다.
+- Flask-Migrate/Alembic은 불러오는 데만 수백 ms가 걸리므로 실제로 업그레이드가 필요하거나
+  flask db 명령을 실행할 때만 불러온다. 데이터베이스의 리비전이 migrations/versions의
+  최신 리비전과 같으면 파일에서 리비전 번호만 읽어 비교하고 끝낸다.
+- EXPLAIN QUERY PLAN 결과에서 인덱스 없이 테이블 전체를 읽는 단계(SCAN)를 찾는다.
+  (run_query_plan_check.py)
+"""
+import glob
+import logging
+import os
+import re
+from functools import lru_cache
+
+import click
+from flask import current_app
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+BASELINE_REVISION = '0001'
+UNMANAGED_TABLE_PREFIXES = ('student_search', 'sqlite_')
+
+# 'SCAN evaluation' 처럼 USING INDEX 없이 테이블 전체를 읽는 단계
+# (별칭이면 SQLAlchemy가 붙인 'evaluation_1' 형태로 표시된다)
+FULL_SCAN = re.compile(r'^SCAN (\w+?)(?:_\d+)?$')
+
+# 리비전 파일의 revision = '0002', down_revision = '0001' (또는 None, 튜플) 줄
+REVISION_LINE = re.compile(r'^(down_revision|revision)\s*=\s*(.+)$', re.MULTILINE)
+REVISION_ID = re.compile(r"['\"]([^'\"]+)['\"]")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """autogenerate 시 검색 색인/SQLite 내부 테이블 제외"""
+    return not (type_ == 'table' and name.startswith(UNMANAGED_TABLE_PREFIXES))
+
+
+class MigrationCommands(click.Group):
+    """flask db 명령: 하위 명령을 찾을 때 Flask-Migrate를 불러와 그 명령을 그대로 사용"""
+
+    def __init__(self, app, **kwargs):
+        super().__init__(**kwargs)
+        self.app = app
+
+    def list_commands(self, ctx):
+        return load_migrations(self.app).list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return load_migrations(self.app).get_command(ctx, name)
+
+
+def init_migrations(app, db, directory):
+    """마이그레이션 설정 등록 (Flask-Migrate는 처음 필요할 때 초기화)"""
+    app.extensions['schema_migrations'] = (db, directory)
+    app.cli.add_command(MigrationCommands(app, name='db', help='데이터베이스 마이그레이션 (Flask-Migrate)'))
+
+
+def load_migrations(app):
+    """Flask-Migrate 초기화 후 flask db 명령 그룹 반환"""
+    if 'migrate' not in app.extensions:
+        from flask_migrate import Migrate
+        db, directory = app.extensions['schema_migrations']
+        Migrate(app, db, directory=directory, render_as_batch=True, include_object=include_object)
+    from flask_migrate.cli import db as db_commands
+    return db_commands
+
+
+@lru_cache(maxsize=None)
+def head_revisions(directory):
+    """migrations/versions 파일에서 읽은 최신(head) 리비전 집합"""
+    revisions, parents = set(), set()
+    for path in glob.glob(os.path.join(directory, 'versions', '*.py')):
+        with open(path, encoding='utf-8') as f:
+            for name, value in REVISION_LINE.findall(f.read()):
+                ids = REVISION_ID.findall(value)
+                (revisions if name == 'revision' else parents).update(ids)
+    return frozenset(revisions - parents)
+
+
+def database_revisions(connection):
+    return {row[0] for row in connection.execute(text('SELECT version_num FROM alembic_version'))}
+
+
+def upgrade_database(db):
+    """스키마를 최신 리비전으로 업그레이드 (앱 컨텍스트 안에서 호출)"""
+    app = current_app._get_current_object()
+    directory = app.extensions['schema_migrations'][1]
+    with db.engine.connect() as connection:
+        tables = set(inspect(connection).get_table_names())
+        if 'alembic_version' in tables and database_revisions(connection) == head_revisions(directory):
+            return
+
+    load_migrations(app)
+    from flask_migrate import stamp, upgrade
+    if 'alembic_version' not in tables and 'student' in tables:
+        logger.info('마이그레이션 이전 데이터베이스입니다. 초기 리비전으로 표시한 뒤 업그레이드합니다')
+        stamp(revision=BASELINE_REVISION)
+    upgrade()
+
+
+def explain_query_plan(connection, statement, parameters=()):
+    """SQLite EXPLAIN QUERY PLAN 결과의 detail 목록"""
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+    return [row[-1] for row in rows]
+
+
+def full_scans(plan, tables):
+    """plan에서 인덱스 없이 전체를 읽는 테이블 이름 목록"""
+    scanned = []
+    for detail in plan:
+        match = FULL_SCAN.match(detail)
+        if match and match.group(1) in tables:
+            scanned.append(match.group(1))
+    return scanned
@@ -0,0 +1,194 @@
+"""학생 검색 색인 (SQLite FTS5)
+
+학번과 이름을 한글 자모/초성 토큰으로 분해해 FTS5 가상 테이블에 저장한다.
+모든 토큰은 접미사(suffix) 단위로 색인하므로 부분 문자열 검색도 접두사 검색으로 처리된다.
+예) 홍길동 -> ㅎㅗㅇㄱㅣㄹㄷㅗㅇ, ㄱㅣㄹㄷㅗㅇ, ㄷㅗㅇ, ㅎㄱㄷ, ㄱㄷ, ㄷ
+"""
+import logging
+
+from sqlalchemy import event, text, Integer
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = 'student_search'
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSUNG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSUNG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ',
+            'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+
+# 겹자음/겹모음은 입력 도중 상태(닭 -> 달, 과 -> 고)와도 접두사로 맞도록 풀어서 저장
+COMPOUND_JAMO = {
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ',
+    'ㄽ': 'ㄹㅅ', 'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+}
+
+# FTS5 사용 가능 여부 (엔진 URL별 캐시)
+_available = {}
+
+
+def decompose_jamo(value):
+    """한글 음절을 자모 시퀀스로 분해 (홍 -> ㅎㅗㅇ)"""
+    result = []
+    for char in value.lower():
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            result.append(CHOSUNG[offset // 588])
+            result.append(COMPOUND_JAMO.get(JUNGSUNG[(offset % 588) // 28], JUNGSUNG[(offset % 588) // 28]))
+            final = JONGSUNG[offset % 28]
+            result.append(COMPOUND_JAMO.get(final, final))
+        else:
+            result.append(COMPOUND_JAMO.get(char, char))
+    return ''.join(result)
+
+
+def extract_chosung(value):
+    """한글 음절의 초성만 추출 (홍길동 -> ㅎㄱㄷ)"""
+    result = []
+    for char in value.lower():
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            result.append(CHOSUNG[(code - HANGUL_BASE) // 588])
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def student_tokens(student_number, name):
+    """학생 한 명의 색인 토큰 문자열"""
+    tokens = set()
+    number = (student_number or '').lower()
+    tokens.update(number[i:] for i in range(len(number)))
+    for word in (name or '').split():
+        for i in range(len(word)):
+            suffix = word[i:]
+            tokens.add(decompose_jamo(suffix))
+            tokens.add(extract_chosung(suffix))
+    return ' '.join(sorted(tokens))
+
+
+def build_match_query(query):
+    """검색어를 FTS5 MATCH 식으로 변환 (공백으로 구분된 단어는 AND)"""
+    terms = []
+    for word in query.split():
+        jamo = decompose_jamo(word)
+        if jamo:
+            terms.append('"' + jamo.replace('"', '""') + '"*')
+    return ' AND '.join(terms)
+
+
+def create_search_table(connection):
+    """검색 색인 가상 테이블 생성 (FTS5 미지원 SQLite면 False)"""
+    try:
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "tokens, tokenize='unicode61 remove_diacritics 0', prefix='2 3')"
+        ))
+    except OperationalError as e:
+        logger.warning('FTS5 검색 색인을 사용할 수 없습니다. LIKE 검색으로 대체합니다: %s', e)
+        _available[str(connection.engine.url)] = False
+        return False
+    _available[str(connection.engine.url)] = True
+    return True
+
+
+def search_available(connection):
+    """검색 색인 테이블이 존재하는지 확인"""
+    key = str(connection.engine.url)
+    if key not in _available:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {'name': SEARCH_TABLE}
+        ).first()
+        _available[key] = exists is not None
+    return _available[key]
+
+
+def index_student(connection, student_id, student_number, name):
+    """학생 한 명의 색인 갱신"""
+    connection.execute(text(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = :id'), {'id': student_id})
+    connection.execute(
+        text(f'INSERT INTO {SEARCH_TABLE}(rowid, tokens) VALUES (:id, :tokens)'),
+        {'id': student_id, 'tokens': student_tokens(student_number, name)}
+    )
+
+
+def index_students(connection, rows):
+    """여러 학생 색인 일괄 추가 (rows: (id, student_number, name) 목록)"""
+    rows = list(rows)
+    if not rows or not search_available(connection):
+        return
+    connection.execute(
+        text(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = :id'),
+        [{'id': student_id} for student_id, _, _ in rows]
+    )
+    connection.execute(
+        text(f'INSERT INTO {SEARCH_TABLE}(rowid, tokens) VALUES (:id, :tokens)'),
+        [{'id': student_id, 'tokens': student_tokens(number, name)} for student_id, number, name in rows]
+    )
+
+
+def unindex_students(connection, student_ids):
+    """학생 색인 삭제"""
+    params = [{'id': student_id} for student_id in student_ids]
+    # 빈 목록으로 executemany를 하면 바인드 값이 없어 오류가 난다
+    if not params or not search_available(connection):
+        return
+    connection.execute(text(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = :id'), params)
+
+
+def rebuild_search_index(connection, student_table):
+    """학생 테이블 전체로 검색 색인 재구성"""
+    if not create_search_table(connection):
+        return 0
+    connection.execute(text(f'DELETE FROM {SEARCH_TABLE}'))
+    rows = connection.execute(student_table.select().with_only_columns(
+        student_table.c.id, student_table.c.student_number, student_table.c.name
+    )).all()
+    index_students(connection, rows)
+    return len(rows)
+
+
+def ensure_search_index(connection, student_table):
+    """검색 색인 테이블을 만들고, 비어 있으면 학생 테이블로 한 번 채운다"""
+    if create_search_table(connection):
+        empty = connection.execute(text(f'SELECT 1 FROM {SEARCH_TABLE} LIMIT 1')).first() is None
+        if empty and connection.execute(student_table.select().limit(1)).first() is not None:
+            count = rebuild_search_index(connection, student_table)
+            logger.info('학생 검색 색인 생성 완료: %d명', count)
+
+
+def match_student_ids(query):
+    """검색어와 일치하는 학생 id 서브쿼리 (Student.id.in_()에 사용)"""
+    return text(f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match') \
+        .bindparams(match=build_match_query(query)) \
+        .columns(rowid=Integer)
+
+
+def register_search_index(db, student_model):
+    """Student 변경 시 같은 트랜잭션에서 색인을 갱신하도록 이벤트 등록"""
+    student_table = student_model.__table__
+
+    @event.listens_for(db.metadata, 'after_create')
+    def _create(target, connection, **kw):
+        ensure_search_index(connection, student_table)
+
+    @event.listens_for(db.metadata, 'before_drop')
+    def _drop(target, connection, **kw):
+        connection.execute(text(f'DROP TABLE IF EXISTS {SEARCH_TABLE}'))
+        _available.pop(str(connection.engine.url), None)
+
+    @event.listens_for(student_model, 'after_insert')
+    @event.listens_for(student_model, 'after_update')
+    def _index(mapper, connection, target):
+        if search_available(connection):
+            index_student(connection, target.id, target.student_number, target.name)
+
+    @event.listens_for(student_model, 'after_delete')
+    def _unindex(mapper, connection, target):
+        unindex_students(connection, [target.id])
@@ -0,0 +1,109 @@
+"""운영용 WSGI 서버 실행
+
+SERVER 설정으로 서버를 선택한다.
+
+- waitress (기본): 순수 Python 스레드 서버. Windows/macOS 포터블 빌드에서도 동작한다.
+  SIGTERM/SIGINT 시 진행 중인 요청을 마치고 종료하고, SIGHUP 시 프로세스를 다시 실행한다.
+- gunicorn: 여러 프로세스(SERVER_WORKERS) x 스레드(SERVER_THREADS). macOS/Linux 전용.
+  앱을 미리 불러온 뒤(preload) fork 하며, SIGHUP으로 무중단 재시작, SIGTERM으로 정상 종료한다.
+- development: Flask 개발 서버 (app.run)
+"""
+import logging
+import os
+import signal
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def serve(app, host='0.0.0.0', port=5003, on_fork=None):
+    """설정된 WSGI 서버로 앱 실행 (종료될 때까지 반환하지 않음)"""
+    server = app.config.get('SERVER', 'waitress')
+    threads = app.config.get('SERVER_THREADS', 16)
+    workers = app.config.get('SERVER_WORKERS', 2)
+
+    if server == 'gunicorn':
+        if sys.platform == 'win32':
+            logger.warning('gunicorn은 Windows에서 사용할 수 없습니다. waitress로 실행합니다.')
+        else:
+            try:
+                return serve_gunicorn(app, host, port, workers, threads,
+                                      app.config.get('SERVER_GRACEFUL_TIMEOUT', 10), on_fork)
+            except ImportError:
+                logger.warning('gunicorn이 설치되어 있지 않습니다. waitress로 실행합니다.')
+        server = 'waitress'
+
+    if server == 'waitress':
+        try:
+            return serve_waitress(app, host, port, threads, app.config.get('SERVER_GRACEFUL_TIMEOUT', 10))
+        except ImportError:
+            logger.warning('waitress가 설치되어 있지 않습니다. Flask 개발 서버로 실행합니다.')
+
+    logger.info('Flask 개발 서버 시작: http://localhost:%d', port)
+    app.run(debug=False, host=host, port=port, threaded=True)
+
+
+def serve_waitress(app, host, port, threads, graceful_timeout=10):
+    from waitress import create_server, wasyncore
+
+    server = create_server(app, host=host, port=port, threads=threads)
+    state = {'stop': False, 'restart': False}
+
+    def shutdown(signum, frame):
+        logger.info('서버 종료 요청 수신: 진행 중인 요청을 마친 뒤 종료합니다')
+        state['stop'] = True
+
+    def reload(signum, frame):
+        logger.info('서버 재시작 요청 수신')
+        state['stop'] = True
+        state['restart'] = True
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, reload)
+
+    logger.info('waitress 서버 시작: http://localhost:%d (스레드 %d개)', port, threads)
+    loop_options = {'timeout': 0.5, 'map': server._map, 'count': 1, 'use_poll': server.adj.asyncore_use_poll}
+    while not state['stop']:
+        server.asyncore.loop(**loop_options)
+
+    # 새 연결은 받지 않고, 처리 중인 요청이 끝날 때까지(최대 graceful_timeout초) 기다린다
+    wasyncore.dispatcher.close(server)
+    deadline = time.monotonic() + graceful_timeout
+    while server.active_channels and time.monotonic() < deadline:
+        for channel in list(server.active_channels.values()):
+            if not channel.requests and not channel.total_outbufs_len and getattr(channel, 'request', None) is None:
+                channel.will_close = True
+        server.asyncore.loop(**loop_options)
+    server.task_dispatcher.shutdown()
+    server.trigger.close()
+
+    if state['restart']:
+        # 같은 인자로 프로세스를 다시 실행 (포터블 빌드는 sys.executable이 실행 파일)
+        args = sys.argv if getattr(sys, 'frozen', False) else [sys.executable] + sys.argv
+        os.execv(args[0], args)
+    logger.info('서버가 종료되었습니다')
+
+
+def serve_gunicorn(app, host, port, workers, threads, graceful_timeout=10, on_fork=None):
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', 'gthread' if threads > 1 else 'sync')
+            self.cfg.set('preload_app', True)
+            self.cfg.set('graceful_timeout', graceful_timeout)
+            self.cfg.set('timeout', 120)
+            if on_fork is not None:
+                self.cfg.set('post_fork', lambda server, worker: on_fork())
+
+        def load(self):
+            return app
+
+    logger.info('gunicorn 서버 시작: http://localhost:%d (프로세스 %d개 x 스레드 %d개)', port, workers, threads)
+    Application().run()
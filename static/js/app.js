@@ -0,0 +1,46 @@
+// 공통 스크립트 (templates/base.html): 다크모드, 플래시 메시지 자동 숨김, 스무스 스크롤
+// 다크모드 토글
+function toggleTheme() {
+    const body = document.body;
+    const currentTheme = body.getAttribute('data-bs-theme');
+    const newTheme = currentTheme === 'dark' ? 'light' : 'dark';
+
+    body.setAttribute('data-bs-theme', newTheme);
+    localStorage.setItem('theme', newTheme);
+
+    // 아이콘 변경
+    const icon = document.querySelector('.btn-outline-light i');
+    const button = document.querySelector('.btn-outline-light');
+    icon.className = newTheme === 'dark' ? 'bi bi-sun-fill' : 'bi bi-moon-stars-fill';
+    button.title = newTheme === 'dark' ? '라이트 모드로 변경' : '다크 모드로 변경';
+}
+
+// 페이지 로드 시 테마 복원
+document.addEventListener('DOMContentLoaded', function() {
+    const savedTheme = localStorage.getItem('theme') || 'light';
+    document.body.setAttribute('data-bs-theme', savedTheme);
+
+    const icon = document.querySelector('.btn-outline-light i');
+    const button = document.querySelector('.btn-outline-light');
+    icon.className = savedTheme === 'dark' ? 'bi bi-sun-fill' : 'bi bi-moon-stars-fill';
+    button.title = savedTheme === 'dark' ? '라이트 모드로 변경' : '다크 모드로 변경';
+});
+
+// 플래시 메시지 자동 숨김
+setTimeout(function() {
+    const alerts = document.querySelectorAll('.alert');
+    alerts.forEach(function(alert) {
+        const bsAlert = new bootstrap.Alert(alert);
+        bsAlert.close();
+    });
+}, 5000);
+
+// 스무스 스크롤
+document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+    anchor.addEventListener('click', function (e) {
+        e.preventDefault();
+        document.querySelector(this.getAttribute('href')).scrollIntoView({
+            behavior: 'smooth'
+        });
+    });
+});
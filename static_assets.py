@@ -0,0 +1,154 @@
+"""정적 파일 제공 (공통 CSS/JS, 내장 Bootstrap)
+
+- asset_url(filename): 파일 내용 해시를 ?v=로 붙인 주소를 만든다. 내용이 바뀌면 주소도 바뀌므로
+  v가 현재 해시와 같은 요청에는 1년짜리 Cache-Control(immutable)을 붙여 다시 받지 않게 한다.
+  (vendor/ 아래는 디렉토리 이름에 버전이 있어 항상 오래 캐시한다)
+- 브라우저가 gzip을 받으면 미리 압축한 <파일>.gz를 보낸다. (flask compress-static)
+  .gz가 없거나 원본보다 오래되었으면 처음 요청 때 한 번 압축해 메모리에 둔다.
+- Bootstrap/Bootstrap Icons는 static/vendor에 내장한다. (flask fetch-static-vendor)
+  파일이 없으면 CDN 주소로 대신한다.
+"""
+import gzip
+import hashlib
+import io
+import logging
+import mimetypes
+import os
+import threading
+
+from flask import abort, request, send_file, url_for
+from werkzeug.security import safe_join
+
+logger = logging.getLogger(__name__)
+
+CACHE_FOREVER = 'public, max-age=31536000, immutable'
+# 해시 없는 주소는 매번 ETag로 확인 (바뀌지 않았으면 304)
+CACHE_REVALIDATE = 'no-cache'
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.map', '.txt')
+VENDOR_DIR = 'vendor/'
+
+# static/ 기준 경로 → 원본 CDN 주소 (fetch-static-vendor로 내려받고, 없으면 이 주소를 쓴다)
+VENDOR_ASSETS = {
+    'vendor/bootstrap-5.3.0/css/bootstrap.min.css':
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'vendor/bootstrap-5.3.0/js/bootstrap.bundle.min.js':
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'vendor/bootstrap-icons-1.10.0/bootstrap-icons.css':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.0/font/bootstrap-icons.css',
+    # bootstrap-icons.css가 ./fonts/ 상대 경로로 참조
+    'vendor/bootstrap-icons-1.10.0/fonts/bootstrap-icons.woff2':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.0/font/fonts/bootstrap-icons.woff2',
+    'vendor/bootstrap-icons-1.10.0/fonts/bootstrap-icons.woff':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.0/font/fonts/bootstrap-icons.woff',
+}
+
+
+class StaticAssets:
+    """해시 주소, 장기 캐시, gzip 변형을 지원하는 static 라우트"""
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._files = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.folder = app.static_folder
+        # Flask 기본 static 라우트(/static/<path:filename>)의 처리 함수를 교체
+        app.view_functions['static'] = self.send
+        app.add_template_global(self.url, 'asset_url')
+        app.extensions['static_assets'] = self
+
+    def _info(self, path):
+        """(해시, 수정 시각, 메모리 gzip) — 파일이 바뀌면 다시 계산"""
+        st = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._files.get(path)
+            if cached and cached['key'] == key:
+                return cached
+        with open(path, 'rb') as f:
+            data = f.read()
+        info = {'key': key, 'hash': hashlib.sha1(data).hexdigest()[:12], 'mtime': st.st_mtime, 'gzip': None}
+        with self._lock:
+            self._files[path] = info
+        return info
+
+    def _gzip(self, path, info):
+        if info['gzip'] is None:
+            with open(path, 'rb') as f:
+                info['gzip'] = gzip.compress(f.read(), 9, mtime=0)
+        return info['gzip']
+
+    def url(self, filename):
+        """템플릿용 정적 파일 주소 (내용 해시 포함)"""
+        path = safe_join(self.folder, filename)
+        if path and os.path.isfile(path):
+            return url_for('static', filename=filename, v=self._info(path)['hash'])
+        if filename in VENDOR_ASSETS:
+            return VENDOR_ASSETS[filename]
+        return url_for('static', filename=filename)
+
+    def send(self, filename):
+        path = safe_join(self.folder, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        info = self._info(path)
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        compressible = filename.endswith(COMPRESSIBLE)
+
+        if compressible and 'gzip' in request.headers.get('Accept-Encoding', ''):
+            gz_path = path + '.gz'
+            if os.path.isfile(gz_path) and os.stat(gz_path).st_mtime >= info['mtime']:
+                body = gz_path
+            else:
+                body = io.BytesIO(self._gzip(path, info))
+            response = send_file(body, mimetype=mimetype, etag=f"{info['hash']}-gz",
+                                 last_modified=info['mtime'], conditional=True)
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = send_file(path, mimetype=mimetype, etag=info['hash'],
+                                 last_modified=info['mtime'], conditional=True)
+        if compressible:
+            response.vary.add('Accept-Encoding')
+
+        versioned = filename.startswith(VENDOR_DIR) or request.args.get('v') == info['hash']
+        response.headers['Cache-Control'] = CACHE_FOREVER if versioned else CACHE_REVALIDATE
+        return response
+
+
+def compress_static(folder):
+    """압축할 만한 정적 파일마다 <파일>.gz 생성 (반환: 만든 파일 수)"""
+    count = 0
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                data = gzip.compress(f.read(), 9, mtime=0)
+            with open(path + '.gz', 'wb') as f:
+                f.write(data)
+            count += 1
+    return count
+
+
+def fetch_vendor_assets(folder, force=False):
+    """VENDOR_ASSETS를 static/vendor에 내려받기 (반환: 내려받은 파일 수)"""
+    import urllib.request
+
+    count = 0
+    for filename, source in VENDOR_ASSETS.items():
+        path = os.path.join(folder, filename)
+        if os.path.exists(path) and not force:
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with urllib.request.urlopen(source, timeout=30) as response:
+            data = response.read()
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        logger.info('내려받음: %s (%d bytes)', filename, len(data))
+        count += 1
+    return count
@@ -0,0 +1,99 @@
+"""SQLite 저장소 설정
+
+- 모든 연결에 PRAGMA(WAL, synchronous, busy_timeout, cache_size, mmap_size, foreign_keys)를 적용한다.
+- 쓰기 트랜잭션은 프로세스 안에서 하나씩만 실행되도록 직렬화한다.
+  (첫 INSERT/UPDATE/DELETE 또는 flush 시점에 잠금을 잡고 트랜잭션이 끝나면 해제)
+  동시에 여러 교사가 평가를 저장해도 SQLite의 'database is locked' 경합 대신
+  애플리케이션 안에서 순서대로 대기하게 된다.
+"""
+import logging
+import threading
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'mmap_size': 256 * 1024 * 1024,
+    'foreign_keys': 'ON',
+}
+
+
+def is_memory_database(url):
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def configure_engine(engine, pragmas=None):
+    """엔진의 모든 새 연결에 PRAGMA 적용"""
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+    if is_memory_database(engine.url):
+        # 인메모리 DB에는 WAL/mmap이 의미가 없다
+        pragmas.pop('journal_mode', None)
+        pragmas.pop('mmap_size', None)
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+    logger.debug('SQLite PRAGMA 설정: %s', pragmas)
+
+
+class WriteSerializer:
+    """세션 쓰기 트랜잭션 직렬화
+
+    세션마다 첫 쓰기 시점에 프로세스 공용 잠금을 잡고, 최상위 트랜잭션이
+    커밋/롤백으로 끝날 때 해제한다.
+    """
+
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+    def install(self, session_target):
+        event.listen(session_target, 'before_flush', self._before_flush)
+        event.listen(session_target, 'do_orm_execute', self._do_orm_execute)
+        event.listen(session_target, 'after_transaction_end', self._after_transaction_end)
+
+    def uninstall(self, session_target):
+        event.remove(session_target, 'before_flush', self._before_flush)
+        event.remove(session_target, 'do_orm_execute', self._do_orm_execute)
+        event.remove(session_target, 'after_transaction_end', self._after_transaction_end)
+
+    def acquire(self, session):
+        if session.info.get('write_lock'):
+            return
+        if not self._lock.acquire(timeout=self.timeout):
+            raise TimeoutError('쓰기 잠금 대기 시간을 초과했습니다.')
+        session.info['write_lock'] = True
+
+    def _before_flush(self, session, flush_context, instances):
+        self.acquire(session)
+
+    def _do_orm_execute(self, orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            self.acquire(orm_execute_state.session)
+
+    def _after_transaction_end(self, session, transaction):
+        if transaction.parent is None and session.info.pop('write_lock', False):
+            self._lock.release()
+
+
+def init_storage(app, db):
+    """Flask 앱의 엔진/세션에 저장소 설정 적용"""
+    with app.app_context():
+        configure_engine(db.engine, app.config.get('SQLITE_PRAGMAS'))
+    if app.config.get('SQLITE_SERIALIZE_WRITES', True):
+        serializer = WriteSerializer(timeout=app.config.get('WRITE_LOCK_TIMEOUT', 30))
+        serializer.install(db.session)
+        app.extensions['write_serializer'] = serializer
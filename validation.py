@@ -0,0 +1,90 @@
+"""평가 입력값 검증
+
+화면(add_evaluation, edit_evaluation)과 JSON API가 같은 규칙을 쓴다.
+- 과목, 평가일은 필수
+- 점수는 -5 ~ +5 정수 (비어 있으면 0점)
+- 평가일은 YYYY-MM-DD
+"""
+from datetime import datetime
+from functools import lru_cache
+
+SCORE_MIN = -5
+SCORE_MAX = 5
+SUBJECT_MAX_LENGTH = 100
+
+
+class ValidationError(ValueError):
+    """입력값 오류 (message는 사용자에게 그대로 보여준다)"""
+
+    def __init__(self, message, field=None):
+        super().__init__(message)
+        self.message = message
+        self.field = field
+
+
+def parse_score(score):
+    """점수 변환 (폼 문자열 또는 JSON 숫자)"""
+    if score is None or score == '':
+        # 점수가 선택되지 않은 경우 0점으로 처리
+        return 0
+    if isinstance(score, bool):
+        raise ValidationError('점수 형식이 올바르지 않습니다.', 'score')
+    if isinstance(score, float):
+        if not score.is_integer():
+            raise ValidationError('점수 형식이 올바르지 않습니다.', 'score')
+        return int(score)
+    try:
+        return int(score)
+    except (TypeError, ValueError):
+        pass
+    # CSV 내보내기는 점수를 '1.0' 형태로 쓴다
+    try:
+        value = float(score)
+    except (TypeError, ValueError):
+        raise ValidationError('점수 형식이 올바르지 않습니다.', 'score')
+    if not value.is_integer():
+        raise ValidationError('점수 형식이 올바르지 않습니다.', 'score')
+    return int(value)
+
+
+def parse_date(value):
+    try:
+        return _parse_date(value)
+    except (TypeError, ValueError):
+        raise ValidationError('날짜 형식이 올바르지 않습니다.', 'evaluation_date')
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(value):
+    # CSV 가져오기처럼 같은 날짜가 반복되면 strptime을 다시 하지 않는다 (해시할 수 없는 값은 TypeError)
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def parse_evaluation(subject, score, evaluation_date, notes=None):
+    """평가 입력값 검증
+
+    반환값: {'subject', 'score', 'evaluation_date', 'notes'} (Evaluation 생성/수정에 그대로 사용)
+    """
+    if isinstance(subject, str):
+        subject = subject.strip()
+    if not subject or not isinstance(subject, str) or not evaluation_date:
+        raise ValidationError('과목과 평가일을 입력해주세요.', 'subject' if not subject else 'evaluation_date')
+    if len(subject) > SUBJECT_MAX_LENGTH:
+        raise ValidationError(f'과목은 {SUBJECT_MAX_LENGTH}자 이하여야 합니다.', 'subject')
+
+    score = parse_score(score)
+    evaluation_date = parse_date(evaluation_date)
+
+    # 점수 범위 검증 (-5 ~ +5)
+    if score < SCORE_MIN or score > SCORE_MAX:
+        raise ValidationError(f'점수는 {SCORE_MIN}에서 {SCORE_MAX} 사이여야 합니다.', 'score')
+
+    if notes is not None and not isinstance(notes, str):
+        raise ValidationError('메모 형식이 올바르지 않습니다.', 'notes')
+
+    return {
+        'subject': subject,
+        'score': score,
+        'evaluation_date': evaluation_date,
+        'notes': notes,
+    }